@@ -0,0 +1,76 @@
+"""Benchmark of the cold start of model_tracker_framework and the mtf command
+line interface. Each measurement runs in a fresh interpreter and the startup
+time of a bare interpreter is subtracted. The benchmark fails (exit code 1) if
+the median import time exceeds --target-ms or if importing the package loads
+pandas or numpy.
+
+Usage:
+    python benchmarks/bench_import_time.py --repeat 10 --target-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ["pandas", "numpy"]
+
+
+def time_command(cmd:list, repeat:int, env:dict) -> float:
+    """Returns the median wall clock time of cmd in milliseconds
+    """
+    times = []
+    for _ in range(repeat):
+        strt = time.perf_counter()
+        subprocess.run(cmd, check=True, env=env, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - strt) * 1000)
+    return statistics.median(times)
+
+
+def loaded_heavy_modules(env:dict) -> list:
+    code = ("import sys, model_tracker_framework; "
+            "print(' '.join(m for m in {} if m in sys.modules))".format(
+                HEAVY_MODULES))
+    out = subprocess.run([sys.executable, "-c", code], check=True, env=env,
+                         stdout=subprocess.PIPE).stdout.decode().split()
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=150)
+    parser.add_argument("--cli-rows", type=int, default=1000)
+    args = parser.parse_args()
+    env = {**os.environ, "MTF_CONSOLE_LOG": "0"}
+
+    baseline = time_command([sys.executable, "-c", "pass"], args.repeat, env)
+    import_ms = time_command(
+        [sys.executable, "-c", "import model_tracker_framework"],
+        args.repeat, env) - baseline
+
+    work_dir = tempfile.mkdtemp()
+    tracker_path = os.path.join(work_dir, "tracker.jsonl")
+    with open(tracker_path, "w") as f:
+        for i in range(args.cli_rows):
+            f.write(json.dumps({"model_name": "model_{}".format(i),
+                                "test_accuracy": i / args.cli_rows}) + "\n")
+    cli_ms = time_command(
+        [sys.executable, "-m", "model_tracker_framework.MTFCli", "list",
+         tracker_path, "--sort", "test_accuracy", "--desc", "--limit", "5"],
+        args.repeat, env) - baseline
+    os.remove(tracker_path)
+    os.rmdir(work_dir)
+
+    heavy = loaded_heavy_modules(env)
+    print("interpreter startup      {:>8.1f}ms".format(baseline))
+    print("import                   {:>8.1f}ms (target {:.0f}ms)".format(
+        import_ms, args.target_ms))
+    print("mtf list ({} rows)     {:>8.1f}ms".format(args.cli_rows, cli_ms))
+    print("heavy modules on import  {}".format(", ".join(heavy) or "none"))
+    if import_ms > args.target_ms or len(heavy) > 0:
+        print("FAILED")
+        sys.exit(1)
@@ -0,0 +1,53 @@
+"""Micro-benchmark of the per-step cost of ModelExperimentBase.log_metric,
+including the flushes to the metric files, and of reading the files back.
+
+Usage:
+    python benchmarks/bench_log_metric.py --n-steps 1000000 --n-metrics 4
+"""
+import argparse
+import logging
+import tempfile
+import time
+
+from model_tracker_framework import MetricLogger, ModelExperimentBase
+
+
+class _Experiment(ModelExperimentBase):
+
+    def __init__(self, n_steps:int, n_metrics:int):
+        super().__init__(model_name="bench_log_metric",
+                         debug_skips_preprop_steps=False)
+        self.n_steps = n_steps
+        self.metric_nms = ["metric_{}".format(i) for i in range(n_metrics)]
+
+    def train_model(self):
+        for step in range(self.n_steps):
+            for nm in self.metric_nms:
+                self.log_metric(nm, step * 0.5, step)
+
+
+def bench(n_steps:int, n_metrics:int, sv_dir:str):
+    experiment = _Experiment(n_steps, n_metrics)
+    experiment.model_sv_loc = sv_dir
+    experiment.metric_logger = MetricLogger(tracker_summary=True)
+    strt = time.perf_counter()
+    experiment._start_metric_logger()
+    experiment.train_model()
+    experiment._flush_metric_logger()
+    log_time = time.perf_counter() - strt
+    strt = time.perf_counter()
+    metrics = MetricLogger.read_metrics(sv_dir)
+    read_time = time.perf_counter() - strt
+    assert all(len(values) == n_steps for _, values in metrics.values())
+    print("{} metrics x {} steps | log_metric {:.3f}us per call | read {:.3f}s".format(
+        n_metrics, n_steps, log_time / (n_steps * n_metrics) * 1e6, read_time))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-steps", type=int, default=1_000_000)
+    parser.add_argument("--n-metrics", type=int, default=4)
+    args = parser.parse_args()
+    logging.getLogger("mtf_logger").setLevel(logging.ERROR)
+    with tempfile.TemporaryDirectory() as sv_dir:
+        bench(args.n_steps, args.n_metrics, sv_dir)
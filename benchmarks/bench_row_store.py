@@ -0,0 +1,84 @@
+"""Benchmark comparing the memory used by ModelTracker.rows when stored as a
+list of dictionaries (row_store="list") and as a CompactRowStore
+(row_store="compact"), alongside the time to load the rows, convert the
+tracker to a dataframe and look up rows.
+
+Memory is measured with tracemalloc as the memory retained by the tracker after
+loading, which for the list store includes a dictionary and a float object per
+metric for every row.
+
+Usage:
+    python benchmarks/bench_row_store.py --rows 100000 1000000 --metrics 20
+"""
+import argparse
+import gc
+import logging
+import random
+import time
+import tracemalloc
+
+from model_tracker_framework import ModelTracker
+
+
+def make_rows(n_rows:int, n_metrics:int):
+    rows = []
+    for i in range(n_rows):
+        row = {"model_name": "model_{}".format(i),
+               "experiment_description": "synthetic experiment",
+               "epochs": random.randrange(100)}
+        for j in range(n_metrics):
+            row["metric_{}".format(j)] = random.random()
+        rows.append(row)
+    return rows
+
+
+def bench_store(row_store:str, n_rows:int, n_metrics:int, n_lookups:int):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    rows = make_rows(n_rows, n_metrics)
+    strt = time.perf_counter()
+    tracker = ModelTracker(row_store=row_store)
+    tracker.update_tracker_w_dicts(rows)
+    load_s = time.perf_counter() - strt
+    # The input rows are only retained by the list store
+    del rows
+    gc.collect()
+    retained_mb = (tracemalloc.get_traced_memory()[0] - base) / 1024**2
+    tracemalloc.stop()
+
+    strt = time.perf_counter()
+    tracker.tracker_to_pandas_df()
+    df_s = time.perf_counter() - strt
+
+    targets = ["model_{}".format(random.randrange(n_rows))
+               for _ in range(n_lookups)]
+    strt = time.perf_counter()
+    for target in targets:
+        tracker.rows[tracker.get_cur_row_index(target)].get("metric_0")
+    lookup_us = (time.perf_counter() - strt) / n_lookups * 1e6
+    return {"retained_mb": retained_mb, "load_s": load_s, "df_s": df_s,
+            "lookup_us": lookup_us}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--metrics", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+    logging.getLogger("mtf_logger").setLevel(logging.ERROR)
+    random.seed(0)
+    print("{:>10} {:>8} {:>12} {:>9} {:>9} {:>11}".format(
+        "rows", "store", "retained MB", "load s", "df s", "lookup us"))
+    for n_rows in args.rows:
+        res = {}
+        for row_store in ["list", "compact"]:
+            res[row_store] = bench_store(row_store, n_rows, args.metrics,
+                                         args.lookups)
+            print("{:>10} {:>8} {:>12.1f} {:>9.3f} {:>9.3f} {:>11.2f}".format(
+                n_rows, row_store, res[row_store]["retained_mb"],
+                res[row_store]["load_s"], res[row_store]["df_s"],
+                res[row_store]["lookup_us"]))
+        print("{:>10} memory saving x{:.2f}".format(
+            n_rows, res["list"]["retained_mb"] / res["compact"]["retained_mb"]))
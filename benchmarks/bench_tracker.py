@@ -0,0 +1,240 @@
+"""Benchmark suite for ModelTracker storage and run_experiment overhead.
+
+Synthetic trackers of each requested size are generated and the main tracker
+operations are timed: update_tracker_w_dict, import/export for every storage
+backend, tracker_to_pandas_df and the framework overhead of a no-op
+run_experiment. Each measurement records the best wall clock time over
+--repeat runs, the throughput in rows per second and the tracemalloc peak.
+Results are written as json such that runs on different commits can be
+compared with --compare.
+
+Storage backends are taken from TrackerType.valid_types and driven through
+ModelTracker.import_existing_tracker/write_tracker, therefore a backend added
+to that dispatch is benchmarked without changes here. Backends which need
+extra arguments or dependencies can be added to BACKEND_OVERRIDES.
+
+Usage:
+    python benchmarks/bench_tracker.py --rows 1000 10000 --cols 10 50 --output bench.json
+    python benchmarks/bench_tracker.py --compare base.json bench.json
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from model_tracker_framework import ModelExperimentBase, ModelTracker, TrackerType
+
+# Maps backend names to {"ext": file extension, "write": fn(tracker, path),
+# "read": fn(tracker, path)} where the default TrackerType dispatch does not
+# fit i.e. a backend needing extra arguments
+BACKEND_OVERRIDES = {}
+BACKEND_EXTENSIONS = {"sqlite": "db"}
+# Optional dependencies required by backends. Backends with missing
+# dependencies are skipped by default
+BACKEND_DEPENDENCIES = {"parquet": "pyarrow"}
+# Tracker types which are not file backends i.e. "server", whose path is the
+# address of a TrackerServer writing to one of the file backends
+NON_FILE_BACKENDS = ["server"]
+
+
+def available_backends() -> list:
+    return [name for name in TrackerType.valid_types
+            if name not in NON_FILE_BACKENDS and (
+                name not in BACKEND_DEPENDENCIES
+                or importlib.util.find_spec(BACKEND_DEPENDENCIES[name]) is not None)]
+
+
+def make_rows(n_rows:int, n_cols:int):
+    rows = []
+    for i in range(n_rows):
+        row = {"model_name": "model_{}".format(i),
+               "experiment_description": "synthetic experiment {}".format(i)}
+        for j in range(n_cols - 2):
+            row["metric_{}".format(j)] = random.random()
+        rows.append(row)
+    return rows
+
+
+def make_tracker(n_rows:int, n_cols:int) -> ModelTracker:
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(n_rows, n_cols))
+    return tracker
+
+
+def measure(fn, repeat:int, setup=None) -> dict:
+    """Returns the best wall clock time of fn over repeat runs and the
+    tracemalloc peak of the final run. setup is called before each run,
+    outside of the measurement, and its result passed to fn.
+    """
+    best = float("inf")
+    for i in range(repeat):
+        arg = setup() if setup is not None else None
+        gc.collect()
+        last = i == repeat - 1
+        if last:
+            tracemalloc.start()
+        strt = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - strt)
+        if last:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return {"seconds": best, "peak_mem_mb": peak / 1024**2}
+
+
+def backend_fns(name:str):
+    if name in BACKEND_OVERRIDES:
+        return BACKEND_OVERRIDES[name]
+    tracker_type = TrackerType(name)
+    return {"ext": BACKEND_EXTENSIONS.get(name, name),
+            "write": lambda tracker, path: tracker.write_tracker(path, tracker_type),
+            "read": lambda tracker, path: tracker.import_existing_tracker(
+                path, tracker_type)}
+
+
+class NoOpExperiment(ModelExperimentBase):
+
+    def __init__(self, model_name:str):
+        super().__init__(model_name, debug_skips_preprop_steps=False)
+
+    def preprocessing_steps(self):
+        pass
+
+    def train_model(self):
+        pass
+
+    def evaluate_model(self):
+        self.results["metric_0"] = 0.0
+
+
+def bench_size(n_rows:int, n_cols:int, backends:list, repeat:int,
+               work_dir:str) -> list:
+    results = []
+
+    def record(operation, backend, stats):
+        stats.update({"operation": operation, "backend": backend,
+                      "rows": n_rows, "cols": n_cols,
+                      "rows_per_s": n_rows / stats["seconds"]
+                      if stats["seconds"] > 0 else None})
+        results.append(stats)
+        print("{:>24} {:>8} rows={:<8} cols={:<4} {:>10.4f}s {:>12.0f} rows/s {:>9.2f}MB".format(
+            operation, backend or "", n_rows, n_cols, stats["seconds"],
+            stats["rows_per_s"] or 0, stats["peak_mem_mb"]))
+
+    rows = make_rows(n_rows, n_cols)
+
+    def upsert_all(tracker):
+        for row in rows:
+            tracker.update_tracker_w_dict(dict(row))
+    record("update_tracker_w_dict", None,
+           measure(upsert_all, repeat, setup=ModelTracker))
+
+    tracker = make_tracker(n_rows, n_cols)
+    record("tracker_to_pandas_df", None,
+           measure(lambda _: tracker.tracker_to_pandas_df(), repeat))
+
+    for backend in backends:
+        fns = backend_fns(backend)
+        path = os.path.join(work_dir, "tracker_{}.{}".format(backend, fns["ext"]))
+
+        def clean_write():
+            if os.path.exists(path):
+                os.remove(path)
+        record("write", backend, measure(
+            lambda _: fns["write"](tracker, path), repeat, setup=clean_write))
+        record("import", backend, measure(
+            lambda reader: fns["read"](reader, path), repeat,
+            setup=ModelTracker))
+
+        # Framework overhead of recording one experiment against a tracker of
+        # n_rows rows i.e. import, existence check, row update and write
+        run_dir = os.path.join(work_dir, "runs_{}".format(backend))
+
+        def setup_run():
+            # Start each repeat from a tracker of n_rows rows
+            clean_write()
+            fns["write"](tracker, path)
+            shutil.rmtree(run_dir, ignore_errors=True)
+            os.makedirs(run_dir)
+            return NoOpExperiment("model_noop")
+
+        stats = measure(lambda exp: exp.run_experiment(
+            existing_tracker_path=path, exp_description="no-op",
+            parent_sv_dir=run_dir, tracker_type=TrackerType(backend),
+            force_columns=True), repeat, setup=setup_run)
+        stats["rows_per_s"] = None
+        stats.update({"operation": "run_experiment_noop", "backend": backend,
+                      "rows": n_rows, "cols": n_cols})
+        results.append(stats)
+        print("{:>24} {:>8} rows={:<8} cols={:<4} {:>10.4f}s".format(
+            "run_experiment_noop", backend, n_rows, n_cols, stats["seconds"]))
+    return results
+
+
+def get_metadata() -> dict:
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (subprocess.CalledProcessError, OSError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(),
+            "platform": platform.platform(), "timestamp": time.time()}
+
+
+def compare(base_path:str, new_path:str):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    key = lambda rs: (rs["operation"], rs["backend"], rs["rows"], rs["cols"])
+    base_results = {key(rs): rs for rs in base["results"]}
+    print("{} -> {}".format(base["metadata"]["commit"], new["metadata"]["commit"]))
+    for rs in new["results"]:
+        old = base_results.get(key(rs))
+        if old is None:
+            continue
+        print("{:>24} {:>8} rows={:<8} cols={:<4} time x{:<7.2f} peak mem x{:.2f}".format(
+            rs["operation"], rs["backend"] or "", rs["rows"], rs["cols"],
+            rs["seconds"] / old["seconds"],
+            rs["peak_mem_mb"] / old["peak_mem_mb"] if old["peak_mem_mb"] else float("nan")))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--cols", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--backends", nargs="+",
+                        default=available_backends(),
+                        choices=available_backends())
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        logging.getLogger("mtf_logger").setLevel(logging.ERROR)
+        random.seed(0)
+        work_dir = tempfile.mkdtemp()
+        try:
+            results = []
+            for n_rows in args.rows:
+                for n_cols in args.cols:
+                    results += bench_size(n_rows, n_cols, args.backends,
+                                          args.repeat, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        with open(args.output, "w") as f:
+            json.dump({"metadata": get_metadata(), "results": results}, f,
+                      indent=2)
+        print("Results written to {}".format(args.output))
@@ -0,0 +1,87 @@
+"""Micro-benchmark comparing the previous linear u_id scan used by
+ModelTracker.get_cur_row_index/update_tracker_w_dict against the hash index
+now maintained by ModelTracker.
+
+Usage:
+    python benchmarks/bench_u_id_index.py --sizes 10000 100000 1000000
+"""
+import argparse
+import gc
+import logging
+import random
+import time
+
+from model_tracker_framework import ModelTracker
+
+
+def _make_rows(n_rows:int):
+    return [{"model_name": "model_{}".format(i), "test_accuracy": random.random(),
+             "train_accuracy": random.random()} for i in range(n_rows)]
+
+
+def _linear_upsert(rows:list, row_dict:dict):
+    # Replicates the pre-index implementation of update_tracker_w_dict
+    for idx, rw in enumerate(rows):
+        if rw["model_name"] == row_dict["model_name"]:
+            old_row = rows.pop(idx)
+            old_row.update(row_dict)
+            rows.append(old_row)
+            return
+    rows.append(row_dict)
+
+
+def _linear_exists(rows:list, u_id:str):
+    # Replicates the pre-index implementation of check_model_exists
+    return u_id in [rw["model_name"] for rw in rows]
+
+
+def bench_size(n_rows:int, n_ops:int):
+    rows = _make_rows(n_rows)
+    targets = ["model_{}".format(random.randrange(n_rows)) for _ in range(n_ops)]
+    updates = [{"model_name": t, "test_accuracy": 1.0} for t in targets]
+
+    linear_rows = [dict(rw) for rw in rows]
+    strt = time.perf_counter()
+    for upd in updates:
+        _linear_upsert(linear_rows, upd)
+    linear_upsert = (time.perf_counter() - strt) / n_ops
+    strt = time.perf_counter()
+    for t in targets:
+        _linear_exists(linear_rows, t)
+    linear_exists = (time.perf_counter() - strt) / n_ops
+
+    tracker = ModelTracker()
+    tracker.rows.extend(rows)
+    tracker.column_names = ["model_name", "test_accuracy", "train_accuracy"]
+    # Index is built lazily on first access, time it separately
+    strt = time.perf_counter()
+    tracker.check_model_exists(targets[0])
+    index_build = time.perf_counter() - strt
+    strt = time.perf_counter()
+    for upd in updates:
+        tracker.update_tracker_w_dict(upd)
+    index_upsert = (time.perf_counter() - strt) / n_ops
+    strt = time.perf_counter()
+    for t in targets:
+        tracker.check_model_exists(t)
+    index_exists = (time.perf_counter() - strt) / n_ops
+
+    print("{:>9} rows | upsert: linear {:>10.2f}us indexed {:>7.2f}us | "
+          "exists: linear {:>10.2f}us indexed {:>7.2f}us | index build {:.3f}s".format(
+              n_rows, linear_upsert*1e6, index_upsert*1e6, linear_exists*1e6,
+              index_exists*1e6, index_build))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--n-ops", type=int, default=50)
+    args = parser.parse_args()
+    # Silence the overwrite warnings raised by update_tracker_w_dict
+    logging.getLogger("mtf_logger").setLevel(logging.ERROR)
+    # Keep collector pauses over large row lists out of the per-op timings
+    gc.disable()
+    random.seed(0)
+    for n_rows in args.sizes:
+        bench_size(n_rows, args.n_ops)
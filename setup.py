@@ -23,5 +23,7 @@ setuptools.setup(
     ],
     package_dir={"": "src"},
     python_requires=">=3.7",
-    install_requires=["pandas"]
+    install_requires=["pandas"],
+    extras_require={"parquet": ["pyarrow"]},
+    entry_points={"console_scripts": ["mtf=model_tracker_framework.MTFCli:main"]}
 )
\ No newline at end of file
@@ -0,0 +1,133 @@
+import logging
+import os
+import weakref
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Tuple
+
+from .ModelTracker import ModelTracker
+from .MTFSupporting import LazyModule, TrackerType
+
+asyncio = LazyModule("asyncio")
+
+logger = logging.getLogger("mtf_logger")
+
+# Shared writers of each running event loop, keyed on the tracker location
+# and u_id
+_shared_writers:"weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class AsyncTrackerWriter:
+
+    def __init__(self, existing_tracker_path:str,
+                 tracker_type:TrackerType = TrackerType("json"),
+                 concurrency_safe:bool=False, updt_kwargs:dict = {},
+                 executor:Executor=None, u_id:str="model_name"):
+        """Writes tracker rows from coroutines running in an asyncio event
+        loop. Rows are queued by self.write and written by a background task
+        in an executor. Rows queued whilst a write is in progress are written
+        together by the next write, such that many experiments completing at
+        once cause a single re-write of the tracker. Json, csv and parquet
+        trackers are imported on the first write and held in memory
+        thereafter, therefore the writer should be the only writer of the
+        tracker unless concurrency_safe is True. Json lines trackers are
+        appended to and sqlite trackers upserted without importing.
+
+        Args:
+            existing_tracker_path (str): Location of the tracker
+            tracker_type (TrackerType, optional): Storage format of the
+            tracker. Defaults to TrackerType("json").
+            concurrency_safe (bool, optional): If True, rows are written via
+            ModelTracker.concurrent_update_existing_tracker such that other
+            processes can write to the same tracker. Defaults to False.
+            updt_kwargs (dict, optional): kwargs relating to the import method
+            for tracker_type. Defaults to {}.
+            executor (Executor, optional): Executor in which writes run. If
+            None, the default executor of the event loop is used. Defaults to
+            None.
+            u_id (str, optional): Column uniquely identifying each row of the
+            tracker. Defaults to "model_name".
+        """
+        self.existing_tracker_path = existing_tracker_path
+        self.tracker_type = tracker_type
+        self.concurrency_safe = concurrency_safe
+        self.updt_kwargs = updt_kwargs
+        self.executor = executor
+        self.tracker = ModelTracker(u_id=u_id)
+        self._loaded = False
+        self._pending:List[Tuple[Dict[str,Any],"asyncio.Future"]] = []
+        self._flush_task:"asyncio.Task" = None
+
+    @classmethod
+    def get_shared(cls, existing_tracker_path:str,
+                   tracker_type:TrackerType = TrackerType("json"),
+                   **kwargs) -> "AsyncTrackerWriter":
+        """Returns the writer of existing_tracker_path shared by every
+        coroutine of the running event loop, creating it if required. kwargs
+        are passed to the constructor when the writer is created. Writers are
+        shared per u_id, such that rows are never written with the u_id of
+        another experiment.
+        """
+        loop = asyncio.get_event_loop()
+        loop_writers = _shared_writers.setdefault(loop, {})
+        key = (os.path.abspath(existing_tracker_path), tracker_type.tracker_type,
+               kwargs.get("u_id", "model_name"))
+        if key not in loop_writers:
+            loop_writers[key] = cls(existing_tracker_path, tracker_type,
+                                    **kwargs)
+        return loop_writers[key]
+
+    def _write_rows(self, rows:List[Dict[str,Any]]):
+        if self.concurrency_safe:
+            self.tracker.concurrent_update_existing_tracker(
+                self.existing_tracker_path, self.tracker_type, rows=rows,
+                **self.updt_kwargs)
+            return
+        # Only formats which are re-written in full need the existing rows
+        if (not self._loaded and
+                self.tracker_type.tracker_type not in ["jsonl", "sqlite", "server"] and
+                self.tracker.check_tracker_exists(self.existing_tracker_path)):
+            self.tracker.import_existing_tracker(
+                self.existing_tracker_path, self.tracker_type,
+                **self.updt_kwargs)
+        self._loaded = True
+        # Rows have been checked against the tracker by the experiments
+        self.tracker.replace_rows(rows, force_columns=True)
+        self.tracker.write_tracker(self.existing_tracker_path,
+                                   self.tracker_type, new_rows=rows)
+
+    async def _flush_pending(self):
+        loop = asyncio.get_event_loop()
+        while len(self._pending) > 0:
+            batch, self._pending = self._pending, []
+            logger.info("Writing {} experiments to tracker".format(len(batch)))
+            try:
+                await loop.run_in_executor(
+                    self.executor, self._write_rows,
+                    [row for row, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def write(self, row:Dict[str,Any]):
+        """Queues row to be written and waits until it has been written
+
+        Args:
+            row (Dict[str,Any]): The row to write
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_pending())
+        await future
+
+    async def flush(self):
+        """Waits until every queued row has been written
+        """
+        if self._flush_task is not None:
+            await self._flush_task
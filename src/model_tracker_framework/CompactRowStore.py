@@ -0,0 +1,291 @@
+import sys
+from array import array
+from collections.abc import Mapping, MutableMapping, MutableSequence
+from typing import Any, Dict, Iterator, List
+
+from .MTFSupporting import LazyModule
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+# Marks a column which is absent from a row, as opposed to holding None
+_MISSING = object()
+_INT64_MIN = -2**63
+_INT64_MAX = 2**63 - 1
+
+
+def _typecode_for(val:Any) -> str:
+    """Returns the array typecode able to hold val exactly or None if val
+    requires object storage. Subclasses of float and int (i.e. bools and numpy
+    scalars) use object storage such that their type is preserved.
+    """
+    val_type = type(val)
+    if val_type is float:
+        return "d"
+    if val_type is int and _INT64_MIN <= val <= _INT64_MAX:
+        return "q"
+    return None
+
+
+class _Column:
+
+    __slots__ = ("typecode", "values", "present")
+
+    def __init__(self, typecode:str, n_rows:int):
+        """Storage of a single column. Numeric columns are held in a typed
+        array ("d" for floats, "q" for ints) and all other columns in a list.
+        present records whether each row holds a value for the column.
+        """
+        self.typecode = typecode
+        if typecode is None:
+            self.values = [None]*n_rows
+        else:
+            self.values = array(typecode, bytes(8*n_rows))
+        self.present = bytearray(n_rows)
+
+    def _placeholder(self) -> Any:
+        return None if self.typecode is None else 0
+
+    def _to_object(self):
+        self.values = self.values.tolist()
+        for idx, is_present in enumerate(self.present):
+            if not is_present:
+                self.values[idx] = None
+        self.typecode = None
+
+    def _prepare(self, val:Any):
+        if self.typecode is not None and _typecode_for(val) != self.typecode:
+            self._to_object()
+
+    def get(self, idx:int) -> Any:
+        if not self.present[idx]:
+            return _MISSING
+        return self.values[idx]
+
+    def set(self, idx:int, val:Any):
+        self._prepare(val)
+        self.values[idx] = val
+        self.present[idx] = 1
+
+    def unset(self, idx:int):
+        self.present[idx] = 0
+        self.values[idx] = self._placeholder()
+
+    def append(self, val:Any=_MISSING):
+        if val is _MISSING:
+            self.values.append(self._placeholder())
+            self.present.append(0)
+        else:
+            self._prepare(val)
+            self.values.append(val)
+            self.present.append(1)
+
+    def insert(self, idx:int):
+        self.values.insert(idx, self._placeholder())
+        self.present.insert(idx, 0)
+
+    def delete(self, idx):
+        del self.values[idx]
+        del self.present[idx]
+
+    def nbytes(self) -> int:
+        if self.typecode is None:
+            # The list and the values it references, counting shared objects
+            # (i.e. interned strings) for each reference
+            size = sys.getsizeof(self.values) + sum(
+                sys.getsizeof(val) for val in self.values if val is not None)
+        else:
+            size = self.values.buffer_info()[1] * self.values.itemsize
+        return size + len(self.present)
+
+
+class RowView(MutableMapping):
+
+    __slots__ = ("_store", "_idx")
+
+    def __init__(self, store:"CompactRowStore", idx:int):
+        """Dict-like view of a row of a CompactRowStore. Reads and writes go
+        directly to the store. Views refer to a row by position, therefore a
+        view should not be held across deletes or inserts before its row.
+        """
+        self._store = store
+        self._idx = idx
+
+    def __getitem__(self, key:str) -> Any:
+        col = self._store._columns.get(key)
+        if col is None:
+            raise KeyError(key)
+        val = col.get(self._idx)
+        if val is _MISSING:
+            raise KeyError(key)
+        return val
+
+    def get(self, key:str, default:Any=None) -> Any:
+        col = self._store._columns.get(key)
+        if col is None:
+            return default
+        val = col.get(self._idx)
+        return default if val is _MISSING else val
+
+    def __setitem__(self, key:str, val:Any):
+        self._store._set_value(self._idx, key, val)
+
+    def __delitem__(self, key:str):
+        col = self._store._columns.get(key)
+        if col is None or not col.present[self._idx]:
+            raise KeyError(key)
+        col.unset(self._idx)
+
+    def __iter__(self) -> Iterator[str]:
+        idx = self._idx
+        for name, col in self._store._columns.items():
+            if col.present[idx]:
+                yield name
+
+    def __len__(self) -> int:
+        idx = self._idx
+        return sum(1 for col in self._store._columns.values()
+                   if col.present[idx])
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class CompactRowStore(MutableSequence):
+
+    def __init__(self, rows:List[Mapping]=None):
+        """Alternative to the list of dictionaries used for ModelTracker.rows.
+        A single schema is shared by every row and values are stored by
+        column: floats and ints in typed arrays, and all other values in lists.
+        A column falls back to a list if it receives a value of another type.
+        Rows are read and written through RowView objects which behave as
+        dictionaries, such that the ModelTracker API is unchanged. Select via
+        ModelTracker(row_store="compact").
+
+        Args:
+            rows (List[Mapping], optional): Rows to add. Defaults to None.
+        """
+        self._columns:Dict[str,_Column] = {}
+        self._n = 0
+        if rows is not None:
+            self.extend(rows)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _norm_idx(self, idx:int) -> int:
+        if idx < 0:
+            idx += self._n
+        if idx < 0 or idx >= self._n:
+            raise IndexError("row index out of range")
+        return idx
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [RowView(self, i) for i in range(*idx.indices(self._n))]
+        return RowView(self, self._norm_idx(idx))
+
+    def __iter__(self) -> Iterator[RowView]:
+        for idx in range(self._n):
+            yield RowView(self, idx)
+
+    def _set_value(self, idx:int, key:str, val:Any):
+        col = self._columns.get(key)
+        if col is None:
+            col = _Column(_typecode_for(val), self._n)
+            self._columns[key] = col
+        col.set(idx, val)
+
+    def _set_row(self, idx:int, row:Mapping):
+        for name, col in self._columns.items():
+            if name not in row:
+                col.unset(idx)
+        for key, val in row.items():
+            self._set_value(idx, key, val)
+
+    def __setitem__(self, idx, row):
+        if isinstance(idx, slice):
+            # Materialise first as the rows may be views of this store
+            rows = [dict(rw) for rw in self]
+            rows[idx] = [dict(rw) for rw in row]
+            self.clear()
+            self.extend(rows)
+            return
+        row = dict(row) if isinstance(row, RowView) else row
+        self._set_row(self._norm_idx(idx), row)
+
+    def __delitem__(self, idx):
+        if not isinstance(idx, slice):
+            idx = self._norm_idx(idx)
+        n_deleted = len(range(*idx.indices(self._n))) if isinstance(
+            idx, slice) else 1
+        for col in self._columns.values():
+            col.delete(idx)
+        self._n -= n_deleted
+
+    def insert(self, idx:int, row:Mapping):
+        if idx < 0:
+            idx = max(0, idx + self._n)
+        if idx >= self._n:
+            self.append(row)
+            return
+        row = dict(row) if isinstance(row, RowView) else row
+        for col in self._columns.values():
+            col.insert(idx)
+        self._n += 1
+        self._set_row(idx, row)
+
+    def append(self, row:Mapping):
+        row = dict(row) if isinstance(row, RowView) else row
+        for name, col in self._columns.items():
+            col.append(row.get(name, _MISSING))
+        for key, val in row.items():
+            if key not in self._columns:
+                col = _Column(_typecode_for(val), self._n)
+                col.append(val)
+                self._columns[key] = col
+        self._n += 1
+
+    def clear(self):
+        self._columns = {}
+        self._n = 0
+
+    def column_values(self, column:str) -> List[Any]:
+        """Returns the values of column for every row, with None for rows
+        missing the column
+        """
+        col = self._columns.get(column)
+        if col is None:
+            return [None]*self._n
+        if col.typecode is None:
+            return list(col.values)
+        return [val if is_present else None
+                for val, is_present in zip(col.values, col.present)]
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the stored values
+        """
+        return sum(col.nbytes() for col in self._columns.values())
+
+    def to_pandas_df(self) -> "pd.DataFrame":
+        """Converts the store to a dataframe column by column, without
+        creating a dictionary per row. Missing values are NaN, as when a
+        dataframe is built from a list of dictionaries.
+        """
+        data = {}
+        for name, col in self._columns.items():
+            present = np.frombuffer(bytes(col.present), dtype=np.uint8).astype(bool)
+            all_present = bool(present.all()) if self._n > 0 else True
+            if col.typecode is None:
+                vals = col.values if all_present else [
+                    val if is_present else np.nan
+                    for val, is_present in zip(col.values, col.present)]
+                data[name] = pd.Series(vals, dtype=object).infer_objects()
+                continue
+            arr = np.frombuffer(col.values, dtype=np.float64 if
+                                col.typecode == "d" else np.int64).copy()
+            if not all_present:
+                arr = arr.astype(np.float64)
+                arr[~present] = np.nan
+            data[name] = arr
+        return pd.DataFrame(data, index=pd.RangeIndex(self._n))
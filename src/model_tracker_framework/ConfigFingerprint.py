@@ -0,0 +1,46 @@
+import hashlib
+import inspect
+import logging
+import pickle
+from typing import Any
+
+logger = logging.getLogger("mtf_logger")
+
+# Tracker column holding the fingerprint of the configuration of a run
+FINGERPRINT_COLUMN = "config_fingerprint"
+
+
+def config_fingerprint(experiment:Any, train_kwargs:dict) -> str:
+    """Returns a fingerprint of the configuration of an experiment, such that
+    runs with the same fingerprint are expected to produce the same results.
+    The fingerprint hashes the source code of each class of experiment
+    inheriting from ModelExperimentBase (i.e. the experiment class and any
+    "ProjectModelExperiment" classes), train_kwargs and the values returned by
+    the fingerprint_inputs method of experiment. The model_name is not part of
+    the fingerprint.
+
+    Args:
+        experiment (ModelExperimentBase): The experiment to fingerprint
+        train_kwargs (dict): kwargs relating to the train_model method of
+        experiment
+
+    Returns:
+        str: The fingerprint or None if the source of a class cannot be
+        retrieved or the kwargs or inputs cannot be pickled
+    """
+    # Imported here as ModelExperimentBase imports this module
+    from .ModelExperimentBase import ModelExperimentBase
+    hsh = hashlib.sha256()
+    try:
+        for cls in type(experiment).__mro__:
+            if cls is ModelExperimentBase:
+                break
+            hsh.update(inspect.getsource(cls).encode())
+        hsh.update(pickle.dumps(
+            (sorted(train_kwargs.items()),
+             sorted(experiment.fingerprint_inputs().items())),
+            protocol=4))
+    except (OSError, TypeError, pickle.PicklingError, AttributeError) as e:
+        logger.warning("Could not fingerprint experiment configuration: {}".format(e))
+        return None
+    return hsh.hexdigest()
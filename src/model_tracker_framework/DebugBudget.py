@@ -0,0 +1,189 @@
+import inspect
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from .PreprocessingCache import PreprocessingCache
+
+logger = logging.getLogger("mtf_logger")
+
+
+def _n_rows(val:Any) -> int:
+    shape = getattr(val, "shape", None)
+    if shape is not None and len(shape) > 0:
+        return shape[0]
+    return len(val)
+
+
+def _take_rows(val:Any, idxs:List[int]) -> Any:
+    """Returns the rows of val at idxs for numpy arrays, pandas objects and
+    sequences
+    """
+    if hasattr(val, "iloc"):
+        return val.iloc[idxs]
+    if hasattr(val, "shape"):
+        return val[idxs]
+    return type(val)(val[idx] for idx in idxs) if isinstance(val, (list, tuple)) \
+        else [val[idx] for idx in idxs]
+
+
+def stratified_sample_indices(labels:Any, n_rows:int, seed:int=0,
+                              max_classes:int=100) -> List[int]:
+    """Returns the sorted positions of a sample of n_rows rows, stratified on
+    labels such that each class keeps its proportion (and at least one row
+    where n_rows allows). Labels with more than max_classes distinct values
+    i.e. continuous targets are sampled uniformly.
+
+    Args:
+        labels (Any): Label of each row
+        n_rows (int): Number of rows to sample
+        seed (int, optional): Seed of the sample. Defaults to 0.
+        max_classes (int, optional): Maximum number of distinct labels for
+        stratification. Defaults to 100.
+
+    Returns:
+        List[int]: Positions of the sampled rows in ascending order
+    """
+    rng = random.Random(seed)
+    labels = list(labels.tolist() if hasattr(labels, "tolist") else labels)
+    if n_rows >= len(labels):
+        return list(range(len(labels)))
+    by_class:Dict[Any,List[int]] = {}
+    for idx, label in enumerate(labels):
+        by_class.setdefault(label, []).append(idx)
+        if len(by_class) > max_classes:
+            return sorted(rng.sample(range(len(labels)), n_rows))
+    # Largest remainder allocation of n_rows across the classes
+    quotas = {label: n_rows * len(idxs) / len(labels)
+              for label, idxs in by_class.items()}
+    alloc = {label: max(1, int(quota)) if n_rows >= len(by_class) else int(quota)
+             for label, quota in quotas.items()}
+    remaining = n_rows - sum(alloc.values())
+    # The minimum of one row per class can exceed n_rows, the excess is taken
+    # from the largest allocations such that the rare classes are kept
+    while remaining < 0:
+        label = max(alloc, key=lambda lb: alloc[lb])
+        alloc[label] -= 1
+        remaining += 1
+    for label in sorted(quotas, key=lambda lb: quotas[lb] - int(quotas[lb]),
+                        reverse=True):
+        if remaining <= 0:
+            break
+        if alloc[label] < len(by_class[label]):
+            alloc[label] += 1
+            remaining -= 1
+    sample = []
+    for label, idxs in by_class.items():
+        sample += rng.sample(idxs, min(alloc[label], len(idxs)))
+    return sorted(sample)
+
+
+class DebugBudget:
+
+    def __init__(self, max_rows:int=1000, max_epochs:int=1,
+                 time_limit_s:float=60, seed:int=0,
+                 subsample_groups:Dict[str,List[str]]=None,
+                 kwarg_overrides:dict = {}, cache_dir:str=None):
+        """Limits the work done by an experiment run in debug mode. Assign to
+        the debug_budget attribute of a ModelExperimentBase. When running in
+        debug mode:
+        1. After the preprocessing, the attributes in subsample_groups are cut
+        down to a stratified sample of max_rows rows. The sample is stored in
+        a PreprocessingCache, such that later debug runs with the same
+        preprocessing load the sample rather than rerunning the preprocessing.
+        2. self is passed to train_model as the debug_budget keyword argument,
+        if train_model declares a debug_budget parameter (not via **kwargs,
+        which may be forwarded to i.e. an estimator), and kwarg_overrides are merged into
+        train_kwargs. train_model should limit itself to self.max_epochs and
+        stop once self.time_exceeded() returns True.
+
+        Args:
+            max_rows (int, optional): Number of rows to keep in each subsample
+            group. Defaults to 1000.
+            max_epochs (int, optional): Maximum number of epochs for
+            train_model to run. Defaults to 1.
+            time_limit_s (float, optional): Seconds train_model should run for
+            at most. Defaults to 60.
+            seed (int, optional): Seed of the subsample. Defaults to 0.
+            subsample_groups (Dict[str,List[str]], optional): Attributes to
+            subsample of the form {label_attribute: [attributes]}, where the
+            attributes share rows and are stratified on label_attribute. If
+            None, the debug_subsample_groups attribute of the experiment is
+            used. Defaults to None.
+            kwarg_overrides (dict, optional): Values merged into train_kwargs
+            in debug mode i.e. {"epochs": 1}. Defaults to {}.
+            cache_dir (str, optional): Directory in which to cache the
+            subsample. If None, the preprocessing_cache of the experiment is
+            used if set, otherwise the subsample is not cached. Defaults to
+            None.
+        """
+        self.max_rows = max_rows
+        self.max_epochs = max_epochs
+        self.time_limit_s = time_limit_s
+        self.seed = seed
+        self.subsample_groups = subsample_groups
+        self.kwarg_overrides = kwarg_overrides
+        self.cache = None if cache_dir is None else PreprocessingCache(cache_dir)
+        self._deadline:float = None
+
+    def cache_key_inputs(self) -> tuple:
+        """Values of self which change the subsample, added to the cache key
+        """
+        return (self.max_rows, self.seed, sorted(
+            (label, list(attrs)) for label, attrs in
+            (self.subsample_groups or {}).items()))
+
+    def subsample(self, experiment:Any):
+        """Replaces the attributes of experiment in the subsample groups with
+        a stratified sample of self.max_rows rows. Attributes which are None
+        are skipped.
+
+        Args:
+            experiment (ModelExperimentBase): The preprocessed experiment
+        """
+        groups = self.subsample_groups
+        if groups is None:
+            groups = getattr(experiment, "debug_subsample_groups", {})
+        for label_attr, attrs in groups.items():
+            labels = getattr(experiment, label_attr, None)
+            if labels is None:
+                continue
+            idxs = stratified_sample_indices(labels, self.max_rows,
+                                             seed=self.seed)
+            for attr in attrs:
+                val = getattr(experiment, attr, None)
+                if val is None:
+                    continue
+                if _n_rows(val) != _n_rows(labels):
+                    raise ValueError(
+                        "{} and {} do not have the same number of rows".format(
+                            attr, label_attr))
+                setattr(experiment, attr, _take_rows(val, idxs))
+            logger.info("Subsampled {} to {} rows".format(
+                ", ".join(attrs), len(idxs)))
+
+    def start(self):
+        """Starts the time limit
+        """
+        self._deadline = time.monotonic() + self.time_limit_s
+
+    def time_remaining(self) -> float:
+        if self._deadline is None:
+            return self.time_limit_s
+        return max(0.0, self._deadline - time.monotonic())
+
+    def time_exceeded(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def train_kwargs(self, train_model:Callable, train_kwargs:dict) -> dict:
+        """Returns train_kwargs with self.kwarg_overrides and, if train_model
+        declares a debug_budget parameter, self as debug_budget
+        """
+        train_kwargs = {**train_kwargs, **self.kwarg_overrides}
+        params = inspect.signature(train_model).parameters
+        if "debug_budget" in params and params["debug_budget"].kind not in [
+                inspect.Parameter.VAR_KEYWORD, inspect.Parameter.VAR_POSITIONAL,
+                inspect.Parameter.POSITIONAL_ONLY]:
+            train_kwargs["debug_budget"] = self
+        return train_kwargs
@@ -0,0 +1,334 @@
+import concurrent.futures
+import logging
+import os
+import traceback
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Union
+
+from .ModelExperimentBase import ModelExperimentBase
+from .ModelTracker import ModelTracker
+from .MTFSupporting import ExperimentOption, TrackerType
+from .StageCheckpoint import remove_checkpoint
+
+logger = logging.getLogger("mtf_logger")
+
+
+class ExperimentResult:
+
+    def __init__(self, model_name:str, succeeded:bool, row:dict=None,
+                 error:str=None):
+        """The outcome of an experiment run by the ExperimentScheduler
+
+        Args:
+            model_name (str): Name of the experiment
+            succeeded (bool): Whether the experiment ran and was written to
+            the tracker
+            row (dict, optional): The tracker row of the experiment. Defaults
+            to None.
+            error (str, optional): The traceback of the failure if the
+            experiment failed. Defaults to None.
+        """
+        self.model_name = model_name
+        self.succeeded = succeeded
+        self.row = row
+        self.error = error
+
+    def __repr__(self):
+        return "ExperimentResult({}, {})".format(
+            self.model_name, "succeeded" if self.succeeded else "failed")
+
+
+def _run_experiment_stages(experiment:ModelExperimentBase, train_kwargs:dict,
+                           exp_description:str, prev_run_notes:str,
+                           skip_preprocessing:bool=False):
+    """Runs the preprocessing, training and evaluation stages of experiment in
+    a worker process. Exceptions are returned rather than raised such that a
+    failing experiment does not affect the rest of the pool.
+    """
+    try:
+        if skip_preprocessing:
+            train_time_strt = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            train_time_end = experiment._run_train_evaluate(
+                train_kwargs=train_kwargs)
+        else:
+            train_time_strt, train_time_end = experiment._run_stages(
+                train_kwargs=train_kwargs)
+        return True, experiment._build_tracker_line(
+            exp_description=exp_description, prev_run_notes=prev_run_notes,
+            train_time_strt=train_time_strt, train_time_end=train_time_end)
+    except Exception:
+        return False, traceback.format_exc()
+
+
+class ExperimentScheduler:
+
+    def __init__(self, existing_tracker_path:str, parent_sv_dir:str,
+                 tracker_type:TrackerType = TrackerType("json"),
+                 n_workers:int=None, batch_size:int=10,
+                 dupe_model_nms:ExperimentOption = ExperimentOption(None),
+                 force_columns:bool=False, concurrency_safe:bool=False,
+                 updt_kwargs:dict = {}, u_id:str="model_name"):
+        """Runs many experiments in a process pool and writes their results to
+        a single tracker. Experiments are added via self.submit and run via
+        self.run. The output directory of each experiment is created in the
+        calling process before the experiment is dispatched, after which the
+        preprocessing, training and evaluation stages run in a worker process.
+        The calling process is the only writer of the tracker: result rows are
+        collected as experiments complete and written in batches of
+        batch_size. A failing experiment is logged and returned as a failed
+        ExperimentResult without stopping the remaining experiments.
+
+        Args:
+            existing_tracker_path (str): Location of existing tracker to update
+            parent_sv_dir (str): The location of the parent directory in which
+            the output directory of each experiment is made
+            tracker_type (TrackerType, optional): Storage format of the
+            tracker. Defaults to TrackerType("json").
+            n_workers (int, optional): Number of worker processes. If None,
+            the number of CPUs is used. Defaults to None.
+            batch_size (int, optional): Number of completed experiments to
+            collect before writing the tracker. If None, the tracker is
+            written once all experiments have completed. Defaults to 10.
+            dupe_model_nms (ExperimentOption, optional): Defines what action
+            should be taken if an experiment with the same model_name is found
+            in the tracker. See ModelExperimentBase.run_experiment. Defaults to
+            ExperimentOption(None).
+            force_columns (bool, optional): Option to force new columns into
+            the tracker. Defaults to False.
+            concurrency_safe (bool, optional): If True, batches are written via
+            ModelTracker.concurrent_update_existing_tracker such that other
+            processes can write to the same tracker. Defaults to False.
+            updt_kwargs (dict, optional): kwargs relating to the import method
+            for tracker_type. Defaults to {}.
+            u_id (str, optional): Column uniquely identifying each row of the
+            tracker. Must match the u_id of the submitted experiments.
+            Defaults to "model_name".
+        """
+        self.existing_tracker_path = existing_tracker_path
+        self.parent_sv_dir = parent_sv_dir
+        self.tracker_type = tracker_type
+        self.n_workers = n_workers
+        self.batch_size = batch_size
+        self.dupe_model_nms = dupe_model_nms
+        self.force_columns = force_columns
+        self.concurrency_safe = concurrency_safe
+        self.updt_kwargs = updt_kwargs
+        self.tracker = ModelTracker(u_id=u_id)
+        self._jobs:List[Dict[str,Any]] = []
+
+    def submit(self, experiment:Union[ModelExperimentBase,
+                                      Callable[[], ModelExperimentBase]],
+               exp_description:str, prev_run_notes:str="",
+               train_kwargs:dict = {}, skip_preprocessing:bool=False):
+        """Adds an experiment to be run by self.run. The experiment (or the
+        result of the factory) is pickled to a worker process, therefore the
+        class should be importable i.e. not defined inside a function.
+
+        Args:
+            experiment (Union[ModelExperimentBase, Callable[[], ModelExperimentBase]]):
+            The experiment or a callable taking no arguments returning the
+            experiment. Factories are called in the calling process when
+            self.run is called.
+            exp_description (str): A description of the experiment
+            prev_run_notes (str, optional): A description of the differences
+            compared to a previous experiment. Defaults to "".
+            train_kwargs (dict, optional): kwargs relating to the
+            train_model method of the experiment. Defaults to {}.
+            skip_preprocessing (bool, optional): If True, the preprocessing
+            stage is not run i.e. the experiment has already been preprocessed
+            in the calling process. Defaults to False.
+        """
+        self._jobs.append({"experiment": experiment,
+                           "exp_description": exp_description,
+                           "prev_run_notes": prev_run_notes,
+                           "train_kwargs": train_kwargs,
+                           "skip_preprocessing": skip_preprocessing})
+
+    def _import_tracker(self, model_names:List[str]):
+        if self.tracker.check_tracker_exists(self.existing_tracker_path,
+                                             self.tracker_type):
+            self.tracker.import_existing_tracker(
+                self.existing_tracker_path, self.tracker_type,
+                u_ids=model_names, **self.updt_kwargs)
+
+    def _prepare_experiment(self, job:Dict[str,Any],
+                            scheduled_names:set) -> ModelExperimentBase:
+        experiment = job["experiment"]
+        if not isinstance(experiment, ModelExperimentBase):
+            experiment = experiment()
+        if experiment.u_id != self.tracker.u_id:
+            raise ValueError(
+                "Experiment {} has u_id {} but the scheduler has u_id {}".format(
+                    experiment.model_name, experiment.u_id, self.tracker.u_id))
+        if experiment.model_name in scheduled_names:
+            raise ValueError(
+                "Experiment {} has been submitted more than once".format(
+                    experiment.model_name))
+        experiment._setup_output_location(
+            parent_sv_dir=self.parent_sv_dir,
+            dupe_model_nms=self.dupe_model_nms, tracker=self.tracker)
+        scheduled_names.add(experiment.model_name)
+        return experiment
+
+    def _write_batch(self, rows:List[dict],
+                     results:Dict[str,ExperimentResult]):
+        written_rows = []
+        for row in rows:
+            try:
+                # Merged with any existing row, as by run_experiment
+                self.tracker.update_tracker_w_dict(
+                    row, force_columns=self.force_columns)
+                merged = dict(self.tracker.rows[
+                    self.tracker.get_cur_row_index(row[self.tracker.u_id])])
+                results[row["model_name"]].row = merged
+                row = merged
+                written_rows.append(row)
+            except AssertionError:
+                results[row["model_name"]] = ExperimentResult(
+                    row["model_name"], succeeded=False, row=row,
+                    error=traceback.format_exc())
+                logger.error("Could not add {} to the tracker".format(
+                    row["model_name"]))
+        if len(written_rows) == 0:
+            return
+        logger.info("Writing {} experiments to tracker".format(
+            len(written_rows)))
+        if self.concurrency_safe:
+            self.tracker.concurrent_update_existing_tracker(
+                self.existing_tracker_path, self.tracker_type,
+                rows=written_rows, **self.updt_kwargs)
+        else:
+            self.tracker.write_tracker(self.existing_tracker_path,
+                                       self.tracker_type,
+                                       new_rows=written_rows)
+        for row in written_rows:
+            if row.get("output_save_location") is not None:
+                remove_checkpoint(row["output_save_location"])
+
+    @staticmethod
+    def _remove_unused_output_dir(experiment:ModelExperimentBase):
+        # Only removed if empty i.e. the experiment never ran
+        try:
+            os.rmdir(experiment.model_sv_loc)
+        except (OSError, TypeError):
+            pass
+
+    def _collect_results(self, futures:Dict[concurrent.futures.Future,
+                                            ModelExperimentBase],
+                         results:Dict[str,ExperimentResult],
+                         pending_rows:List[dict],
+                         stop_when:Callable[[dict], bool]) -> List[dict]:
+        """Records the outcome of each experiment as it completes and writes
+        batches of successful rows. pending_rows is appended to in place such
+        that the rows not yet written are available if an exception is raised.
+
+        Returns:
+            List[dict]: The rows not yet written
+        """
+        stopped = False
+        for future in concurrent.futures.as_completed(futures):
+            nm = futures[future].model_name
+            if future.cancelled():
+                results[nm] = ExperimentResult(
+                    nm, succeeded=False, error="Cancelled by stop_when")
+                self._remove_unused_output_dir(futures[future])
+                continue
+            try:
+                succeeded, output = future.result()
+            except Exception:
+                succeeded, output = False, traceback.format_exc()
+            if succeeded:
+                logger.info("Experiment {} completed".format(nm))
+                results[nm] = ExperimentResult(nm, succeeded=True, row=output)
+                pending_rows.append(output)
+                if (stop_when is not None and not stopped and
+                        stop_when(output)):
+                    logger.info("Stop condition met by {}, cancelling "
+                                "remaining experiments".format(nm))
+                    stopped = True
+                    for pending in futures:
+                        pending.cancel()
+            else:
+                logger.error("Experiment {} failed:\n{}".format(nm, output))
+                results[nm] = ExperimentResult(nm, succeeded=False,
+                                               error=output)
+            if (self.batch_size is not None and
+                    len(pending_rows) >= self.batch_size):
+                batch = list(pending_rows)
+                del pending_rows[:]
+                self._write_batch(batch, results)
+        return pending_rows
+
+    def run(self, stop_when:Callable[[dict], bool]=None) -> List[ExperimentResult]:
+        """Runs every submitted experiment and writes the successful
+        experiments to the tracker
+
+        Args:
+            stop_when (Callable[[dict], bool], optional): Called with the
+            tracker row of each successful experiment. Once it returns True,
+            experiments which have not started are cancelled and returned as
+            failed ExperimentResults, whilst running experiments complete and
+            are written. If stop_when raises, the experiments which have
+            completed are written before the exception is raised. Defaults to
+            None i.e. every experiment is run.
+
+        Returns:
+            List[ExperimentResult]: The outcome of each experiment in the order
+            submitted
+        """
+        jobs, self._jobs = self._jobs, []
+        results:Dict[str,ExperimentResult] = {}
+        # Keyed by the job index rather than the model_name, such that a
+        # duplicate submission does not replace the result of the original
+        failed_jobs:Dict[int,ExperimentResult] = {}
+        order = []
+        prepared = []
+        scheduled_names = set()
+        model_names = [job["experiment"].model_name for job in jobs
+                       if isinstance(job["experiment"], ModelExperimentBase)]
+        # Factories cannot be queried for their model_name without calling
+        # them therefore the whole tracker is imported if any are provided
+        self._import_tracker(
+            model_names if len(model_names) == len(jobs) else None)
+        for job_idx, job in enumerate(jobs):
+            try:
+                experiment = self._prepare_experiment(job, scheduled_names)
+            except Exception:
+                nm = getattr(job["experiment"], "model_name",
+                             "job_{}".format(job_idx))
+                order.append(nm)
+                failed_jobs[job_idx] = ExperimentResult(
+                    nm, succeeded=False, error=traceback.format_exc())
+                logger.error("Could not prepare experiment {}".format(nm))
+                continue
+            order.append(experiment.model_name)
+            prepared.append((experiment, job))
+
+        pending_rows = []
+        n_workers = self.n_workers or os.cpu_count()
+        try:
+            # Accessed via the package, which imports multiprocessing on first
+            # use
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=n_workers) as executor:
+                futures = {
+                    executor.submit(_run_experiment_stages, experiment,
+                                    job["train_kwargs"], job["exp_description"],
+                                    job["prev_run_notes"],
+                                    job["skip_preprocessing"]): experiment
+                    for experiment, job in prepared}
+                try:
+                    pending_rows = self._collect_results(
+                        futures, results, pending_rows, stop_when)
+                except BaseException:
+                    # Experiments which have not started are not run if i.e.
+                    # stop_when raises
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            # Rows of completed experiments are written even if an exception
+            # is raised
+            self._write_batch(pending_rows, results)
+        return [failed_jobs[job_idx] if job_idx in failed_jobs else results[nm]
+                for job_idx, nm in enumerate(order)]
@@ -0,0 +1,144 @@
+import copy
+import itertools
+import logging
+import random
+from typing import Any, Callable, Dict, List
+
+from .ExperimentScheduler import ExperimentScheduler, ExperimentResult
+from .ModelExperimentBase import ModelExperimentBase
+from .MTFSupporting import ExperimentOption, SearchType, TrackerType
+
+logger = logging.getLogger("mtf_logger")
+
+
+class HyperparameterSweep:
+
+    def __init__(self, experiment:ModelExperimentBase, space:Dict[str,Any],
+                 existing_tracker_path:str, parent_sv_dir:str,
+                 search:SearchType = SearchType("grid"), n_trials:int=None,
+                 seed:int=0, stop_when:Callable[[dict], bool]=None,
+                 param_prefix:str="param_",
+                 tracker_type:TrackerType = TrackerType("json"),
+                 n_workers:int=None,
+                 dupe_model_nms:ExperimentOption = ExperimentOption(None),
+                 force_columns:bool=False, concurrency_safe:bool=False,
+                 updt_kwargs:dict = {}):
+        """Runs experiment once for each set of train_kwargs sampled from
+        space. experiment is preprocessed once in the calling process and each
+        trial is a copy of the preprocessed experiment named
+        {experiment.model_name}_trial_{i}, therefore the preprocessing is not
+        repeated per trial. Trials run in parallel via an ExperimentScheduler,
+        which writes the rows of every trial to the tracker with a single
+        update once the sweep has finished. The sampled values are added to
+        each row as {param_prefix}{name} columns.
+
+        Args:
+            experiment (ModelExperimentBase): The experiment to sweep. Trials
+            are pickled to worker processes, therefore the class should be
+            importable i.e. not defined inside a function.
+            space (Dict[str,Any]): The search space over the train_kwargs of
+            experiment. Lists and tuples are the values to search, callables
+            taking a random.Random and returning a value are sampled by random
+            search and any other value is passed to every trial unchanged
+            i.e. {"lr": [0.1, 0.01], "depth": lambda rng: rng.randint(2, 8)}
+            search (SearchType, optional): SearchType("grid") runs every
+            combination of the values of space and SearchType("random") runs
+            n_trials random samples. Defaults to SearchType("grid").
+            n_trials (int, optional): Number of trials. Required for random
+            search. For grid search, only the first n_trials combinations are
+            run if set. Defaults to None.
+            seed (int, optional): Seed of the random search. Defaults to 0.
+            stop_when (Callable[[dict], bool], optional): Called with the
+            tracker row of each completed trial, which includes its results.
+            Once it returns True, trials which have not started are cancelled
+            i.e. lambda row: row["test_accuracy"] > 0.95. Trials already
+            running are not interrupted; they complete and are written to the
+            tracker along with the trial which met the condition. Defaults to
+            None.
+            param_prefix (str, optional): Prefix of the columns recording the
+            sampled values. Defaults to "param_".
+            The remaining arguments are as for ExperimentScheduler.
+        """
+        if search.search_type == "random" and n_trials is None:
+            raise ValueError("n_trials must be set for random search")
+        self.experiment = experiment
+        self.space = space
+        self.search = search
+        self.n_trials = n_trials
+        self.seed = seed
+        self.stop_when = stop_when
+        self.param_prefix = param_prefix
+        self.scheduler_kwargs = {
+            "existing_tracker_path": existing_tracker_path,
+            "parent_sv_dir": parent_sv_dir, "tracker_type": tracker_type,
+            "n_workers": n_workers, "dupe_model_nms": dupe_model_nms,
+            "force_columns": force_columns,
+            "concurrency_safe": concurrency_safe, "updt_kwargs": updt_kwargs,
+            "u_id": experiment.u_id}
+
+    def trials(self) -> List[Dict[str,Any]]:
+        """Returns the sampled train_kwargs of each trial
+        """
+        if self.search.search_type == "grid":
+            searched = {nm: vals for nm, vals in self.space.items()
+                        if isinstance(vals, (list, tuple))}
+            if any(callable(vals) for vals in self.space.values()):
+                raise ValueError("Callables in space require random search")
+            fixed = {nm: val for nm, val in self.space.items()
+                     if nm not in searched}
+            trials = [{**fixed, **dict(zip(searched.keys(), vals))}
+                      for vals in itertools.product(*searched.values())]
+            return trials if self.n_trials is None else trials[:self.n_trials]
+        rng = random.Random(self.seed)
+        trials = []
+        for _ in range(self.n_trials):
+            trial = {}
+            for nm, vals in self.space.items():
+                if isinstance(vals, (list, tuple)):
+                    trial[nm] = rng.choice(vals)
+                elif callable(vals):
+                    trial[nm] = vals(rng)
+                else:
+                    trial[nm] = vals
+            trials.append(trial)
+        return trials
+
+    def _make_trial(self, idx:int, params:Dict[str,Any]) -> ModelExperimentBase:
+        trial = copy.copy(self.experiment)
+        trial.model_name = "{}_trial_{}".format(self.experiment.model_name, idx)
+        trial.model_sv_loc = None
+        trial.results = {**self.experiment.results,
+                         **{"{}{}".format(self.param_prefix, nm): val
+                            for nm, val in params.items()}}
+        return trial
+
+    def run(self, exp_description:str, prev_run_notes:str="",
+            train_kwargs:dict = {}) -> List[ExperimentResult]:
+        """Preprocesses self.experiment, runs every trial and writes the
+        successful trials to the tracker
+
+        Args:
+            exp_description (str): A description of the sweep, recorded for
+            every trial
+            prev_run_notes (str, optional): A description of the differences
+            compared to a previous experiment. Defaults to "".
+            train_kwargs (dict, optional): kwargs passed to every trial,
+            overridden by the sampled values. Defaults to {}.
+
+        Returns:
+            List[ExperimentResult]: The outcome of each trial in the order of
+            self.trials
+        """
+        trials = self.trials()
+        logger.info(" ***** Preprocessing sweep of {} trials ***** ".format(
+            len(trials)))
+        self.experiment._run_preprocessing()
+        scheduler = ExperimentScheduler(batch_size=None,
+                                        **self.scheduler_kwargs)
+        for idx, params in enumerate(trials):
+            scheduler.submit(self._make_trial(idx, params),
+                             exp_description=exp_description,
+                             prev_run_notes=prev_run_notes,
+                             train_kwargs={**train_kwargs, **params},
+                             skip_preprocessing=True)
+        return scheduler.run(stop_when=self.stop_when)
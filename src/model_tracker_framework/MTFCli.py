@@ -0,0 +1,291 @@
+"""Command line interface for inspecting trackers, installed as the mtf
+console script. Json, json lines, csv and sqlite trackers are read using only
+the standard library such that the command starts quickly. Parquet trackers
+are read via pandas and require pyarrow.
+
+Usage:
+    mtf list tracker.json --where "test_accuracy>0.9" --sort test_accuracy --desc --limit 10
+    mtf list tracker.db --columns model_name test_accuracy --format csv
+    mtf show tracker.jsonl my_model
+    mtf columns tracker.csv
+    mtf serve tracker.jsonl --address unix:/tmp/mtf.sock
+"""
+import argparse
+import csv
+import json
+import logging
+import re
+import signal
+import sys
+from typing import Any, Dict, List, Tuple
+
+from . import enable_console_logging
+from .ModelTracker import ModelTracker
+from .MTFSupporting import TrackerType
+from .TrackerServer import TrackerServer
+
+logger = logging.getLogger("mtf_logger")
+
+# Maps file extensions to tracker types where the extension is not the name
+# of the tracker type
+EXTENSION_TYPES = {"db": "sqlite", "sqlite3": "sqlite"}
+_WHERE_PATTERN = re.compile(r"^\s*(.+?)\s*(==|!=|>=|<=|>|<)\s*(.*?)\s*$")
+_MAX_CELL_WIDTH = 40
+
+
+def infer_tracker_type(existing_tracker_path:str) -> TrackerType:
+    ext = existing_tracker_path.rsplit(".", 1)[-1].lower()
+    ext = EXTENSION_TYPES.get(ext, ext)
+    if ext not in TrackerType.valid_types:
+        raise ValueError(
+            "Cannot infer the tracker type of {}, provide --type".format(
+                existing_tracker_path))
+    return TrackerType(ext)
+
+
+def parse_value(val:str) -> Any:
+    """Converts a value from the command line or a csv cell to the python
+    type pandas would infer for it
+    """
+    if val == "":
+        return None
+    if val in ["True", "true"]:
+        return True
+    if val in ["False", "false"]:
+        return False
+    for conv in [int, float]:
+        try:
+            return conv(val)
+        except ValueError:
+            pass
+    return val
+
+
+def read_json_rows(existing_tracker_path:str) -> List[Dict[str,Any]]:
+    """Reads a tracker written by ModelTracker.tracker_to_json in the default
+    pandas "columns" orient, the "records" or "split" orients or as line
+    delimited records
+    """
+    with open(existing_tracker_path) as f:
+        content = f.read()
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in content.splitlines()
+                if line.strip() != ""]
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and set(data.keys()) >= {"columns", "data"}:
+        return [dict(zip(data["columns"], vals)) for vals in data["data"]]
+    if isinstance(data, dict):
+        # {column: {index: value}}
+        index = list(dict.fromkeys(
+            idx for col_vals in data.values() for idx in col_vals.keys()))
+        return [{col: col_vals.get(idx) for col, col_vals in data.items()}
+                for idx in index]
+    return [data]
+
+
+def read_csv_rows(existing_tracker_path:str) -> Tuple[List[str],List[Dict[str,Any]]]:
+    """Reads a tracker written by ModelTracker.tracker_to_csv, dropping the
+    unnamed index column written by pandas
+    """
+    with open(existing_tracker_path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        drop_index = len(header) > 0 and header[0] == ""
+        if drop_index:
+            header = header[1:]
+        rows = []
+        for vals in reader:
+            if drop_index:
+                vals = vals[1:]
+            rows.append({col: parse_value(val)
+                         for col, val in zip(header, vals)})
+    return header, rows
+
+
+def load_tracker(existing_tracker_path:str, tracker_type:TrackerType=None,
+                 u_id:str="model_name") -> ModelTracker:
+    """Imports the tracker at existing_tracker_path without pandas, except for
+    parquet trackers
+
+    Args:
+        existing_tracker_path (str): Location of the tracker
+        tracker_type (TrackerType, optional): Storage format of the tracker. If
+        None, inferred from the file extension. Defaults to None.
+        u_id (str, optional): Column uniquely identifying each row. Defaults
+        to "model_name".
+
+    Returns:
+        ModelTracker: The imported tracker
+    """
+    if tracker_type is None:
+        tracker_type = infer_tracker_type(existing_tracker_path)
+    tracker = ModelTracker(u_id=u_id)
+    if tracker_type.tracker_type == "json":
+        tracker.update_tracker_w_dicts(read_json_rows(existing_tracker_path))
+    elif tracker_type.tracker_type == "csv":
+        col_names, rows = read_csv_rows(existing_tracker_path)
+        tracker.update_tracker_w_dicts(rows, col_names=col_names)
+    else:
+        # json lines and sqlite imports do not use pandas
+        tracker.import_existing_tracker(existing_tracker_path, tracker_type)
+    return tracker
+
+
+def parse_where(expr:str) -> tuple:
+    match = _WHERE_PATTERN.match(expr)
+    if match is None:
+        raise ValueError(
+            "Could not parse filter {}, expected <column><op><value> with op "
+            "one of ==, !=, >=, <=, >, <".format(expr))
+    return (match.group(1), match.group(2), parse_value(match.group(3)))
+
+
+def _format_cell(val:Any) -> str:
+    cell = "" if val is None else str(val)
+    if len(cell) > _MAX_CELL_WIDTH:
+        cell = cell[:_MAX_CELL_WIDTH - 3] + "..."
+    return cell
+
+
+def print_rows(rows:List[Dict[str,Any]], columns:List[str], fmt:str="table"):
+    if fmt == "json":
+        for row in rows:
+            print(json.dumps({col: row.get(col) for col in columns},
+                             default=str))
+    elif fmt == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["" if row.get(col) is None else row.get(col)
+                             for col in columns])
+    else:
+        cells = [[_format_cell(row.get(col)) for col in columns]
+                 for row in rows]
+        widths = [max([len(col)] + [len(rw[i]) for rw in cells])
+                  for i, col in enumerate(columns)]
+        print("  ".join(col.ljust(wd) for col, wd in zip(columns, widths)))
+        print("  ".join("-"*wd for wd in widths))
+        for rw in cells:
+            print("  ".join(cell.ljust(wd) for cell, wd in zip(rw, widths)))
+
+
+def cmd_list(args) -> int:
+    tracker = load_tracker(args.tracker, args.type, u_id=args.u_id)
+    where = [parse_where(expr) for expr in args.where]
+    rows = tracker.query(where=where, order_by=args.sort,
+                         ascending=not args.desc, limit=args.limit)
+    columns = args.columns if args.columns else tracker.column_names
+    print_rows(rows, columns, fmt=args.format)
+    return 0
+
+
+def cmd_show(args) -> int:
+    tracker = load_tracker(args.tracker, args.type, u_id=args.u_id)
+    u_id_val = args.u_id_value
+    if not tracker.check_model_exists(u_id_val):
+        # Values from the command line are strings, the tracker may not be
+        u_id_val = parse_value(u_id_val)
+    if not tracker.check_model_exists(u_id_val):
+        print("{} not found in {}".format(args.u_id_value, args.tracker),
+              file=sys.stderr)
+        return 1
+    row = tracker.rows[tracker.get_cur_row_index(u_id_val)]
+    width = max([len(col) for col in row.keys()] + [0])
+    for col in tracker.column_names:
+        if col in row:
+            print("{}  {}".format(col.ljust(width), row[col]))
+    return 0
+
+
+def cmd_columns(args) -> int:
+    tracker = load_tracker(args.tracker, args.type, u_id=args.u_id)
+    for col in tracker.column_names:
+        print(col)
+    return 0
+
+
+def cmd_serve(args) -> int:
+    tracker_type = args.type
+    if tracker_type is None:
+        tracker_type = infer_tracker_type(args.tracker)
+    # The server logs its flushes
+    logger.setLevel(logging.INFO)
+    server = TrackerServer(args.address, args.tracker, tracker_type,
+                           u_id=args.u_id,
+                           flush_interval_s=args.flush_interval,
+                           flush_size=args.flush_size)
+    print("Serving {} on {}".format(args.tracker, args.address),
+          file=sys.stderr)
+    # Terminating the server flushes the pending rows as for Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    server.serve_forever()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mtf", description="Inspect model trackers")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("tracker", help="Location of the tracker")
+    common.add_argument("--type", type=TrackerType, default=None,
+                        help="Storage format of the tracker, one of {}. "
+                        "Inferred from the file extension if not provided".format(
+                            ", ".join(TrackerType.valid_types)))
+    common.add_argument("--u-id", default="model_name",
+                        help="Column uniquely identifying each experiment")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    list_parser = subparsers.add_parser(
+        "list", parents=[common], help="List experiments")
+    list_parser.add_argument("--where", nargs="*", default=[],
+                             help="Filters of the form <column><op><value>")
+    list_parser.add_argument("--sort", default=None, help="Column to sort by")
+    list_parser.add_argument("--desc", action="store_true",
+                             help="Sort in descending order")
+    list_parser.add_argument("--limit", type=int, default=None)
+    list_parser.add_argument("--columns", nargs="*", default=None,
+                             help="Columns to display, defaults to all")
+    list_parser.add_argument("--format", choices=["table", "csv", "json"],
+                             default="table")
+    list_parser.set_defaults(func=cmd_list)
+
+    show_parser = subparsers.add_parser(
+        "show", parents=[common], help="Show every column of an experiment")
+    show_parser.add_argument("u_id_value", metavar="u_id",
+                             help="u_id of the experiment i.e. its model_name")
+    show_parser.set_defaults(func=cmd_show)
+
+    columns_parser = subparsers.add_parser(
+        "columns", parents=[common], help="List the columns of the tracker")
+    columns_parser.set_defaults(func=cmd_columns)
+
+    serve_parser = subparsers.add_parser(
+        "serve", parents=[common],
+        help="Serve the tracker to experiments via a TrackerServer")
+    serve_parser.add_argument("--address", required=True,
+                              help="unix:<socket path> or <host>:<port>")
+    serve_parser.add_argument("--flush-interval", type=float, default=5.0,
+                              help="Maximum seconds before rows are written")
+    serve_parser.add_argument("--flush-size", type=int, default=100,
+                              help="Pending rows triggering a write")
+    serve_parser.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv:List[str]=None) -> int:
+    args = build_parser().parse_args(argv)
+    # Only warnings are logged such that the output can be piped
+    enable_console_logging(logging.WARNING)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print("mtf: {}".format(e), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import importlib
 
 class ModelExperimentBaseError(Exception):
     pass
@@ -13,3 +14,56 @@ class ExperimentOption:
 
     def __repr__(self):
         return str(self.exp_option)
+
+
+class TrackerType:
+    """An attempt to enforce static typing. Used in the ModelExperimentBase and 
+    ModelTracker to define the storage format of the underlying tracker. 
+    TrackerType("server") refers to a TrackerServer, whose address is used in 
+    place of the tracker file location
+    """
+    valid_types = ["json", "csv", "jsonl", "sqlite", "parquet", "server"]
+
+    def __init__(self, tracker_type):
+        if tracker_type not in self.valid_types:
+            raise TypeError("Values should only be one of {}".format(
+                ", ".join(self.valid_types)))
+        self.tracker_type = tracker_type
+
+    def __repr__(self):
+        return str(self.tracker_type)
+
+
+class SearchType:
+    """An attempt to enforce static typing. Used in the HyperparameterSweep to 
+    define how the search space is sampled
+    """
+    valid_types = ["grid", "random"]
+
+    def __init__(self, search_type):
+        if search_type not in self.valid_types:
+            raise TypeError("Values should only be one of {}".format(
+                ", ".join(self.valid_types)))
+        self.search_type = search_type
+
+    def __repr__(self):
+        return str(self.search_type)
+
+
+class LazyModule:
+    """Stand in for a module which is only imported on first attribute access.
+    Used for heavy dependencies i.e. pandas such that importing the package 
+    remains fast when they are not required. Annotations referring to a lazy 
+    module should be strings such that they do not trigger the import.
+    """
+    def __init__(self, module_name:str):
+        self._module_name = module_name
+        self._module = None
+
+    def __getattr__(self, attr:str):
+        if self._module is None:
+            self._module = importlib.import_module(self._module_name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return "LazyModule({})".format(self._module_name)
@@ -0,0 +1,285 @@
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import sys
+import time
+from array import array
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger("mtf_logger")
+
+# Name of the directory, within the output directory of an experiment, holding
+# the logged metrics
+METRICS_DIR_NM = "metrics"
+_MANIFEST_NM = "metrics.json"
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class _MetricBuffer:
+
+    __slots__ = ["steps", "values", "next_step", "stem", "n_flushed",
+                 "last", "last_step", "max", "max_step", "min", "min_step"]
+
+    def __init__(self, stem:str):
+        self.steps = array("q")
+        self.values = array("d")
+        self.next_step = 0
+        self.stem = stem
+        self.n_flushed = 0
+        # Summary of the flushed values
+        self.last = None
+        self.last_step = None
+        self.max = None
+        self.max_step = None
+        self.min = None
+        self.min_step = None
+
+    def summarise_buffer(self):
+        """Merges the values in the buffer into the summary
+        """
+        if len(self.values) == 0:
+            return
+        values, steps = self.values, self.steps
+        # NaN values i.e. of a diverged loss compare False with every value
+        # therefore are removed before the max and min, only for buffers
+        # containing them
+        if math.isnan(sum(values)):
+            kept = [idx for idx, val in enumerate(values) if val == val]
+            values = array("d", (values[idx] for idx in kept))
+            steps = array("q", (steps[idx] for idx in kept))
+        if len(values) > 0:
+            # max, min and index run in C over the arrays
+            buf_max = max(values)
+            if self.max is None or buf_max > self.max:
+                self.max = buf_max
+                self.max_step = steps[values.index(buf_max)]
+            buf_min = min(values)
+            if self.min is None or buf_min < self.min:
+                self.min = buf_min
+                self.min_step = steps[values.index(buf_min)]
+        self.last = self.values[-1]
+        self.last_step = self.steps[-1]
+
+
+def _write_native(arr:array, f):
+    # Files are little endian regardless of the platform
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    arr.tofile(f)
+
+
+class MetricLogger:
+
+    def __init__(self, sv_dir:str=None, flush_size:int=10000,
+                 flush_interval_s:float=10.0, modes:Dict[str,str]={},
+                 tracker_summary:bool=False, max_buffered:int=1000000):
+        """Buffers the values of metrics logged during training i.e. a loss
+        per epoch, in typed arrays. Once flush_size values are buffered or
+        flush_interval_s has passed, the buffers are appended to the metrics
+        directory of sv_dir, where each metric is stored as a column of int64
+        steps (<metric>.steps) and a column of float64 values
+        (<metric>.values). Logging a value costs appending to two arrays. If
+        sv_dir is None i.e. in debug mode, values are kept in memory only, up
+        to max_buffered values.
+
+        Args:
+            sv_dir (str, optional): Output directory of the experiment. If
+            None, values are not written to disk. Defaults to None.
+            flush_size (int, optional): Number of buffered values, across
+            metrics, which triggers a flush. Defaults to 10000.
+            flush_interval_s (float, optional): Maximum seconds between
+            flushes, checked when a value is logged. Defaults to 10.0.
+            modes (Dict[str,str], optional): Whether the best value of a
+            metric is its "max" or "min" i.e. {"loss": "min"}. Metrics not in
+            modes default to "max". Defaults to {}.
+            tracker_summary (bool, optional): If True, the columns of
+            self.summary are added to the tracker row of the experiment. New
+            metrics add columns to the tracker, therefore force_columns should
+            be set. Defaults to False.
+            max_buffered (int, optional): If sv_dir is None, the maximum
+            number of values, across metrics, kept in memory. Checked every
+            flush_size values, once exceeded the values held are folded into
+            the summary and dropped with a warning, such that self.summary
+            remains exact but self.get only returns values logged since.
+            Defaults to 1000000.
+        """
+        self.sv_dir = sv_dir
+        self.flush_size = flush_size
+        self.flush_interval_s = flush_interval_s
+        self.modes = modes
+        self.tracker_summary = tracker_summary
+        self.max_buffered = max_buffered
+        self._metrics:Dict[str,_MetricBuffer] = {}
+        self._n_buffered = 0
+        self._next_flush = (time.monotonic() + flush_interval_s
+                            if sv_dir is not None else math.inf)
+        self._manifest_changed = False
+
+    @staticmethod
+    def metrics_dir(sv_dir:str) -> str:
+        return os.path.join(sv_dir, METRICS_DIR_NM)
+
+    def new_run(self, sv_dir:str) -> "MetricLogger":
+        """Returns an empty MetricLogger with the settings of self, writing
+        to sv_dir. Metrics previously written to sv_dir are removed.
+        """
+        if sv_dir is not None:
+            shutil.rmtree(self.metrics_dir(sv_dir), ignore_errors=True)
+        return MetricLogger(sv_dir=sv_dir, flush_size=self.flush_size,
+                            flush_interval_s=self.flush_interval_s,
+                            modes=self.modes,
+                            tracker_summary=self.tracker_summary,
+                            max_buffered=self.max_buffered)
+
+    def _add_metric(self, name:str) -> _MetricBuffer:
+        stem = _UNSAFE_CHARS.sub("_", name)
+        used = {metric.stem for metric in self._metrics.values()}
+        idx = 1
+        while stem in used:
+            stem = "{}_{}".format(_UNSAFE_CHARS.sub("_", name), idx)
+            idx += 1
+        self._metrics[name] = _MetricBuffer(stem)
+        self._manifest_changed = True
+        return self._metrics[name]
+
+    def log(self, name:str, value:float, step:int=None):
+        """Buffers value of metric name at step
+
+        Args:
+            name (str): Name of the metric i.e. "train_loss"
+            value (float): Value of the metric
+            step (int, optional): Step of the value i.e. the epoch. If None,
+            one more than the previous step of the metric, starting from 0.
+            Defaults to None.
+        """
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._add_metric(name)
+        if step is None:
+            step = metric.next_step
+        metric.steps.append(step)
+        metric.values.append(value)
+        metric.next_step = step + 1
+        self._n_buffered += 1
+        if (self._n_buffered >= self.flush_size or
+                time.monotonic() >= self._next_flush):
+            self.flush()
+
+    def flush(self):
+        """Appends the buffered values to the metric files. If self.sv_dir is
+        None, values stay buffered unless more than self.max_buffered are held.
+        """
+        if self.sv_dir is None:
+            self._n_buffered = 0
+            n_held = sum(len(metric.values) for metric in self._metrics.values())
+            if n_held > self.max_buffered:
+                logger.warning(
+                    "Dropping {} metric values held in memory as max_buffered of {} was exceeded, summaries are kept".format(
+                        n_held, self.max_buffered))
+                for metric in self._metrics.values():
+                    metric.summarise_buffer()
+                    metric.steps = array("q")
+                    metric.values = array("d")
+            return
+        metrics_dir = self.metrics_dir(self.sv_dir)
+        os.makedirs(metrics_dir, exist_ok=True)
+        for metric in self._metrics.values():
+            if len(metric.values) == 0:
+                continue
+            stem_path = os.path.join(metrics_dir, metric.stem)
+            # Steps are written first, therefore a reader truncates both
+            # columns to the shorter if interrupted mid flush
+            with open("{}.steps".format(stem_path), "ab") as f:
+                _write_native(metric.steps, f)
+            with open("{}.values".format(stem_path), "ab") as f:
+                _write_native(metric.values, f)
+            metric.summarise_buffer()
+            metric.n_flushed += len(metric.values)
+            metric.steps = array("q")
+            metric.values = array("d")
+        if self._manifest_changed:
+            with open(os.path.join(metrics_dir, _MANIFEST_NM), "w") as f:
+                json.dump({name: metric.stem
+                           for name, metric in self._metrics.items()}, f)
+            self._manifest_changed = False
+        self._n_buffered = 0
+        self._next_flush = time.monotonic() + self.flush_interval_s
+
+    def get(self, name:str) -> Tuple[array, array]:
+        """Returns the steps and values of metric name logged so far,
+        including those already flushed but not those dropped via
+        self.max_buffered
+
+        Returns:
+            Tuple[array, array]: The steps and values
+        """
+        metric = self._metrics[name]
+        if metric.n_flushed == 0:
+            return array("q", metric.steps), array("d", metric.values)
+        steps, values = self.read_metric(self.sv_dir, name)
+        return steps + metric.steps, values + metric.values
+
+    def summary(self) -> Dict[str,Any]:
+        """Returns summary columns for the tracker row. For each metric:
+        {metric}_last, {metric}_best (the max or min as given by self.modes)
+        and {metric}_best_step, the step at which the best value was first
+        logged. NaN values are skipped by {metric}_best.
+        """
+        summary = {}
+        for name, metric in self._metrics.items():
+            # Merged into a copy such that the buffer is not summarised twice
+            merged = _MetricBuffer(metric.stem)
+            for attr in ["last", "last_step", "max", "max_step", "min",
+                         "min_step"]:
+                setattr(merged, attr, getattr(metric, attr))
+            merged.steps, merged.values = metric.steps, metric.values
+            merged.summarise_buffer()
+            if merged.last is None:
+                continue
+            mode = self.modes.get(name, "max")
+            summary["{}_last".format(name)] = merged.last
+            summary["{}_best".format(name)] = getattr(merged, mode)
+            summary["{}_best_step".format(name)] = getattr(
+                merged, "{}_step".format(mode))
+        return summary
+
+    @classmethod
+    def read_metric(cls, sv_dir:str, name:str) -> Tuple[array, array]:
+        """Reads the steps and values of metric name written to sv_dir i.e.
+        the output_save_location of a tracker row. Convert with
+        numpy.frombuffer(values, dtype="float64") if required.
+
+        Returns:
+            Tuple[array, array]: The steps and values
+        """
+        metrics_dir = cls.metrics_dir(sv_dir)
+        with open(os.path.join(metrics_dir, _MANIFEST_NM)) as f:
+            stem_path = os.path.join(metrics_dir, json.load(f)[name])
+        cols = []
+        for ext, typecode in [("steps", "q"), ("values", "d")]:
+            col = array(typecode)
+            with open("{}.{}".format(stem_path, ext), "rb") as f:
+                col.frombytes(f.read())
+            if sys.byteorder == "big":
+                col.byteswap()
+            cols.append(col)
+        n_rows = min(len(col) for col in cols)
+        return cols[0][:n_rows], cols[1][:n_rows]
+
+    @classmethod
+    def read_metrics(cls, sv_dir:str) -> Dict[str,Tuple[array, array]]:
+        """Reads every metric written to sv_dir
+
+        Returns:
+            Dict[str,Tuple[array, array]]: The steps and values of each metric
+        """
+        manifest_path = os.path.join(cls.metrics_dir(sv_dir), _MANIFEST_NM)
+        if not os.path.exists(manifest_path):
+            return {}
+        with open(manifest_path) as f:
+            names = list(json.load(f).keys())
+        return {name: cls.read_metric(sv_dir, name) for name in names}
@@ -0,0 +1,278 @@
+import logging
+from typing import Any, Dict, List
+
+from .MTFSupporting import LazyModule
+
+np = LazyModule("numpy")
+
+logger = logging.getLogger("mtf_logger")
+
+
+class _ClassificationAccumulator:
+
+    def __init__(self, labels:List[Any]=None, score_bins:int=None):
+        """Accumulates the confusion matrix of predictions, and the sums
+        required by the score based metrics, one chunk at a time
+        """
+        self.labels = None if labels is None else np.asarray(labels)
+        self.confusion = None if labels is None else np.zeros(
+            (len(labels), len(labels)), dtype=np.int64)
+        self.fixed_labels = labels is not None
+        self.score_bins = score_bins
+        # Histograms of the scores of the negative and positive class over
+        # [0, 1], used for the roc auc when evaluating in chunks
+        self.score_hist = None
+        self.log_loss_sum = 0.0
+        self.n_scores = 0
+        self.scores = []
+
+    def _extend_labels(self, chunk_labels:"np.ndarray"):
+        if self.labels is None:
+            self.labels = chunk_labels
+            self.confusion = np.zeros((len(chunk_labels), len(chunk_labels)),
+                                      dtype=np.int64)
+            return
+        new_labels = np.union1d(self.labels, chunk_labels)
+        if len(new_labels) == len(self.labels):
+            return
+        if self.fixed_labels:
+            raise ValueError("Labels {} are not in the declared labels".format(
+                np.setdiff1d(chunk_labels, self.labels)))
+        old_pos = np.searchsorted(new_labels, self.labels)
+        confusion = np.zeros((len(new_labels), len(new_labels)), dtype=np.int64)
+        confusion[np.ix_(old_pos, old_pos)] = self.confusion
+        self.labels = new_labels
+        self.confusion = confusion
+
+    def update(self, y_true:"np.ndarray", y_pred:"np.ndarray",
+               y_score:"np.ndarray"=None, pos_label:Any=None):
+        self._extend_labels(np.unique(np.concatenate([y_true, y_pred])))
+        n_labels = len(self.labels)
+        true_codes = np.searchsorted(self.labels, y_true)
+        pred_codes = np.searchsorted(self.labels, y_pred)
+        self.confusion += np.bincount(
+            true_codes * n_labels + pred_codes,
+            minlength=n_labels**2).reshape(n_labels, n_labels)
+        if y_score is None:
+            return
+        y_pos = (y_true == pos_label)
+        score = np.clip(y_score.astype(np.float64), 1e-15, 1 - 1e-15)
+        self.log_loss_sum -= (np.log(score[y_pos]).sum() +
+                              np.log(1 - score[~y_pos]).sum())
+        self.n_scores += len(score)
+        if self.score_bins is None:
+            self.scores.append((y_score, y_pos))
+        else:
+            bins = np.minimum((np.clip(y_score, 0, 1) * self.score_bins).astype(
+                np.int64), self.score_bins - 1)
+            hist = np.stack([
+                np.bincount(bins[~y_pos], minlength=self.score_bins),
+                np.bincount(bins[y_pos], minlength=self.score_bins)])
+            self.score_hist = hist if self.score_hist is None else (
+                self.score_hist + hist)
+
+    def roc_auc(self) -> float:
+        if self.score_bins is None:
+            if len(self.scores) == 0:
+                return None
+            score = np.concatenate([sc for sc, _ in self.scores])
+            y_pos = np.concatenate([pos for _, pos in self.scores])
+            # Mann-Whitney U statistic with average ranks for ties
+            _, inverse, counts = np.unique(score, return_inverse=True,
+                                           return_counts=True)
+            avg_ranks = np.cumsum(counts) - (counts - 1) / 2
+            ranks = avg_ranks[inverse]
+            n_pos = y_pos.sum()
+            n_neg = len(y_pos) - n_pos
+            if n_pos == 0 or n_neg == 0:
+                return None
+            return float((ranks[y_pos].sum() - n_pos * (n_pos + 1) / 2) /
+                         (n_pos * n_neg))
+        if self.score_hist is None:
+            return None
+        neg, pos = self.score_hist
+        n_neg, n_pos = neg.sum(), pos.sum()
+        if n_pos == 0 or n_neg == 0:
+            return None
+        # Pairs in the same bin are counted as ties
+        neg_below = np.cumsum(neg) - neg
+        return float(((pos * neg_below).sum() + 0.5 * (pos * neg).sum()) /
+                     (n_pos * n_neg))
+
+
+class _RegressionAccumulator:
+
+    def __init__(self):
+        """Accumulates the sums required by the regression metrics one chunk at
+        a time
+        """
+        self.n = 0
+        self.sum_err = 0.0
+        self.sum_abs_err = 0.0
+        self.sum_sq_err = 0.0
+        self.sum_true = 0.0
+        self.sum_sq_true = 0.0
+
+    def update(self, y_true:"np.ndarray", y_pred:"np.ndarray"):
+        y_true = y_true.astype(np.float64)
+        err = y_pred.astype(np.float64) - y_true
+        self.n += len(err)
+        self.sum_err += err.sum()
+        self.sum_abs_err += np.abs(err).sum()
+        self.sum_sq_err += np.dot(err, err)
+        self.sum_true += y_true.sum()
+        self.sum_sq_true += np.dot(y_true, y_true)
+
+
+def _safe_divide(num:"np.ndarray", den:"np.ndarray") -> "np.ndarray":
+    # Metrics with a zero denominator are 0, as with sklearn's default
+    num = np.asarray(num, dtype=np.float64)
+    den = np.asarray(den, dtype=np.float64)
+    return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+
+class MetricsEngine:
+
+    classification_metrics = ["accuracy", "balanced_accuracy", "precision",
+                              "recall", "f1", "roc_auc", "log_loss"]
+    regression_metrics = ["mse", "rmse", "mae", "r2", "mean_error"]
+
+    def __init__(self, metrics:List[str], average:str=None, pos_label:Any=1,
+                 labels:List[Any]=None, chunk_size:int=None,
+                 score_bins:int=10000):
+        """Computes a declared list of metrics for the true and predicted
+        values of a split in a single pass. Classification metrics are all
+        derived from one confusion matrix and regression metrics from one set
+        of running sums, rather than each metric re-scanning the arrays. When
+        chunk_size is set, the arrays are read chunk_size rows at a time such
+        that memory mapped predictions (see
+        SupervisedModelExperiment.spill_arrays) are never loaded in full.
+        Assign to the metrics_engine attribute of a SupervisedModelExperiment
+        to evaluate its splits.
+
+        Args:
+            metrics (List[str]): Metrics to compute. Classification metrics
+            are accuracy, balanced_accuracy, precision, recall, f1, roc_auc
+            and log_loss (roc_auc and log_loss require the scores of the
+            positive class and are None otherwise). Regression metrics are
+            mse, rmse, mae, r2 and mean_error. Classification and regression
+            metrics cannot be mixed.
+            average (str, optional): How precision, recall and f1 are averaged
+            over the classes, one of binary, micro, macro or weighted. If None,
+            binary is used for two classes and macro otherwise. Defaults to
+            None.
+            pos_label (Any, optional): The positive class for binary averaging
+            and the score based metrics. Defaults to 1.
+            labels (List[Any], optional): The classes. If None, the classes
+            present in the true and predicted values are used. Defaults to
+            None.
+            chunk_size (int, optional): Number of rows evaluated at once. If
+            None, each split is evaluated at once. Defaults to None.
+            score_bins (int, optional): When evaluating in chunks, the roc auc
+            is computed from histograms of the scores over [0, 1] with this
+            many bins, which is approximate where scores of opposite classes
+            share a bin. Defaults to 10000.
+        """
+        unknown = [metric for metric in metrics if metric not in
+                   self.classification_metrics + self.regression_metrics]
+        if len(unknown) > 0:
+            raise ValueError("Unsupported metrics {}".format(unknown))
+        is_regression = [metric in self.regression_metrics for metric in metrics]
+        if any(is_regression) and not all(is_regression):
+            raise ValueError("Classification and regression metrics cannot be mixed")
+        if average not in [None, "binary", "micro", "macro", "weighted"]:
+            raise ValueError("average should only be one of binary, micro, macro, weighted or None")
+        self.metrics = metrics
+        self.is_regression = len(metrics) > 0 and all(is_regression)
+        self.average = average
+        self.pos_label = pos_label
+        self.labels = labels
+        self.chunk_size = chunk_size
+        self.score_bins = score_bins
+
+    def _chunks(self, n_rows:int):
+        chunk_size = self.chunk_size or max(n_rows, 1)
+        for strt in range(0, n_rows, chunk_size):
+            yield slice(strt, strt + chunk_size)
+
+    def evaluate(self, y_true:Any, y_pred:Any, y_score:Any=None) -> Dict[str,float]:
+        """Computes self.metrics for a split
+
+        Args:
+            y_true (Any): True values. Any array like i.e. numpy arrays
+            (including memory maps), pandas series or lists.
+            y_pred (Any): Predicted values
+            y_score (Any, optional): Scores of the positive class, required by
+            roc_auc and log_loss. Defaults to None.
+
+        Returns:
+            Dict[str,float]: The metrics of the form {metric: value}
+        """
+        # Conversion does not copy numpy arrays, including memory maps
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError("y_true and y_pred have different lengths")
+        if y_score is not None:
+            y_score = np.asarray(y_score).ravel()
+        if self.is_regression:
+            acc = _RegressionAccumulator()
+            for chunk in self._chunks(len(y_true)):
+                acc.update(y_true[chunk], y_pred[chunk])
+            return self._regression_metrics(acc)
+        acc = _ClassificationAccumulator(
+            labels=self.labels,
+            score_bins=self.score_bins if self.chunk_size is not None else None)
+        for chunk in self._chunks(len(y_true)):
+            acc.update(y_true[chunk], y_pred[chunk],
+                       None if y_score is None else y_score[chunk],
+                       pos_label=self.pos_label)
+        return self._classification_metrics(acc, has_scores=y_score is not None)
+
+    def _regression_metrics(self, acc:_RegressionAccumulator) -> Dict[str,float]:
+        if acc.n == 0:
+            return {metric: None for metric in self.metrics}
+        mse = acc.sum_sq_err / acc.n
+        total_ss = acc.sum_sq_true - acc.sum_true**2 / acc.n
+        values = {"mse": mse, "rmse": mse**0.5, "mae": acc.sum_abs_err / acc.n,
+                  "r2": 1 - acc.sum_sq_err / total_ss if total_ss > 0 else None,
+                  "mean_error": acc.sum_err / acc.n}
+        return {metric: None if values[metric] is None else float(values[metric])
+                for metric in self.metrics}
+
+    def _classification_metrics(self, acc:_ClassificationAccumulator,
+                                has_scores:bool) -> Dict[str,float]:
+        confusion = acc.confusion
+        if confusion is None or confusion.sum() == 0:
+            return {metric: None for metric in self.metrics}
+        tp = np.diag(confusion)
+        support = confusion.sum(axis=1)
+        predicted = confusion.sum(axis=0)
+        precision = _safe_divide(tp, predicted)
+        recall = _safe_divide(tp, support)
+        f1 = _safe_divide(2 * precision * recall, precision + recall)
+        average = self.average
+        if average is None:
+            average = "binary" if len(acc.labels) <= 2 else "macro"
+        if average == "binary":
+            pos = np.searchsorted(acc.labels, self.pos_label)
+            if pos >= len(acc.labels) or acc.labels[pos] != self.pos_label:
+                raise ValueError("pos_label {} is not a class".format(self.pos_label))
+            averaged = {"precision": precision[pos], "recall": recall[pos],
+                        "f1": f1[pos]}
+        elif average == "micro":
+            micro = tp.sum() / confusion.sum()
+            averaged = {"precision": micro, "recall": micro, "f1": micro}
+        else:
+            weights = support if average == "weighted" else np.ones(len(support))
+            averaged = {nm: float(np.average(vals, weights=weights))
+                        for nm, vals in [("precision", precision),
+                                         ("recall", recall), ("f1", f1)]}
+        values = {"accuracy": tp.sum() / confusion.sum(),
+                  "balanced_accuracy": recall[support > 0].mean(), **averaged}
+        # Score based metrics are None for splits without scores
+        values["roc_auc"] = acc.roc_auc() if has_scores else None
+        values["log_loss"] = (acc.log_loss_sum / acc.n_scores 
+                              if has_scores and acc.n_scores > 0 else None)
+        return {metric: None if values[metric] is None else float(values[metric])
+                for metric in self.metrics}
@@ -1,12 +1,28 @@
 import os
-import shutil
-import time
 
+from concurrent.futures import Executor
+from contextlib import nullcontext
 from datetime import datetime
 import logging
+from typing import Tuple
 
-from .MTFSupporting import ModelExperimentBaseError, ExperimentOption
+from .AsyncTrackerWriter import AsyncTrackerWriter
+from .ConfigFingerprint import FINGERPRINT_COLUMN, config_fingerprint
+from .DebugBudget import DebugBudget
+from .MetricLogger import MetricLogger
+from .MTFSupporting import (
+    LazyModule, ModelExperimentBaseError, ExperimentOption, TrackerType)
 from .ModelTracker import ModelTracker
+from .OutputLocation import make_suffixed_dir, remove_dir_in_background
+from .PreprocessingCache import PreprocessingCache
+from .SQLiteTracker import SQLiteTrackerStore
+from .StageCheckpoint import (
+    CHECKPOINT_STAGES, find_checkpoint_dir, load_checkpoint, remove_checkpoint, 
+    save_checkpoint)
+from .StageProfiler import StageProfiler
+from .TrackerClient import get_client
+
+asyncio = LazyModule("asyncio")
 
 logger = logging.getLogger("mtf_logger")
 
@@ -25,6 +41,25 @@ class ModelExperimentBase(ModelTracker):
         is of the form {metric_names(column title in tracker):metric_value}
         self.model_sv_loc is the location into which self should save physical outputs such as graphs. This is updated by 
         _create_output_sub_loc
+        self.preprocessing_cache can be set to a PreprocessingCache such that the attributes set by self.preprocessing are 
+        reloaded from disk by later experiments sharing the same preprocessing rather than recomputed. Defaults to None 
+        i.e. no caching
+        self.stage_profiler can be set to a StageProfiler such that the duration, CPU time and peak memory of each stage 
+        of self.run_experiment are measured and recorded in the tracker. The tracker_write stage runs after the row 
+        has been built, therefore its measurements are only available via the stats and hooks of the profiler. 
+        self.arun_experiment does not profile the tracker import, which runs at the same time as the preprocessing. 
+        Defaults to None i.e. no profiling
+        self.debug_budget can be set to a DebugBudget such that, in debug mode, the attributes in 
+        self.debug_subsample_groups are cut down to a cached stratified subsample after preprocessing and 
+        self.train_model is passed the budget via train_kwargs. Defaults to None i.e. debug mode only affects the 
+        preprocessing
+        self.checkpoint_stages can be set to True such that the state of self is pickled to self.model_sv_loc after each 
+        of the preprocessing, training and evaluation stages, allowing a failed run to be resumed via the resume 
+        parameter of self.run_experiment. The checkpoint is removed once the tracker has been written. Defaults to False
+        self.metric_logger can be set to a MetricLogger to configure how values passed to self.log_metric are 
+        flushed and summarised. Each run starts an empty logger writing to the metrics directory of 
+        self.model_sv_loc, or holding the values in memory if self.model_sv_loc is None i.e. in debug mode without a 
+        debug_sv_dir. Defaults to None i.e. a MetricLogger with default settings
 
         Args:
             model_name (str): Name of the experiment. If inheriting this class, this variable should not be perminently defined.
@@ -37,6 +72,13 @@ class ModelExperimentBase(ModelTracker):
         self.model_name = model_name
         self.results = {}
         self.model_sv_loc = None
+        self.preprocessing_cache:PreprocessingCache = None
+        self.stage_profiler:StageProfiler = None
+        self.debug_budget:DebugBudget = None
+        # Attributes subsampled by self.debug_budget of the form {label_attribute: [attributes]}
+        self.debug_subsample_groups = {}
+        self.checkpoint_stages = False
+        self.metric_logger:MetricLogger = None
 
 
     def _create_output_sub_loc(self, parent_loc:str, sub_dir_nm: str = None):
@@ -68,54 +110,357 @@ class ModelExperimentBase(ModelTracker):
         # from a dataset generated by preprocessing_steps
         raise NotImplementedError("preprocessing_debug method should be implemented on a experiment type basis or pass if not required.")
 
+    def preprocessing_cache_inputs(self) -> dict:
+        """Returns the inputs to the preprocessing which are not captured by the source code of self.preprocessing_steps 
+        i.e. attributes set in __init__ or data files (see PreprocessingCache.file_input). Used to key 
+        self.preprocessing_cache, which logs a warning if no inputs are returned as changes to the data read by the 
+        preprocessing would then not invalidate the cache. Defaults to no inputs.
+
+        Returns:
+            dict: Values of the form {input_name: value}. Values should be picklable.
+        """
+        return {}
+
+    def fingerprint_inputs(self) -> dict:
+        """Returns the inputs to the experiment which are not captured by the source code of its classes or its 
+        train_kwargs, used to fingerprint the configuration of a run (see ConfigFingerprint.config_fingerprint). 
+        Defaults to self.preprocessing_cache_inputs.
+
+        Returns:
+            dict: Values of the form {input_name: value}. Values should be picklable.
+        """
+        return self.preprocessing_cache_inputs()
+
+    def _find_fingerprint_row(self, existing_tracker_path:str, tracker_type:TrackerType, 
+                              fingerprint:str, updt_kwargs:dict = {}) -> dict:
+        """Returns the latest row of the tracker with fingerprint or None if there is none. Sqlite trackers are 
+        queried via the index on the fingerprint column, created when the column is added to the table, as only the 
+        row of self.model_name is imported, whilst other trackers are searched via a hash index on the imported rows. 
+        The sqlite schema is not changed, therefore None is returned if the table does not have the fingerprint 
+        column. TrackerType("server") trackers are searched by the server.
+        """
+        if tracker_type.tracker_type == "server":
+            rows = get_client(existing_tracker_path).find_rows(FINGERPRINT_COLUMN, fingerprint)
+        elif tracker_type.tracker_type == "sqlite":
+            if not self.check_tracker_exists(existing_tracker_path):
+                return None
+            store = SQLiteTrackerStore(existing_tracker_path, u_id=self.u_id, 
+                                       table_name=updt_kwargs.get("table_name", "model_tracker"))
+            with store.connect() as conn:
+                if FINGERPRINT_COLUMN not in store.get_column_names(conn):
+                    return None
+            _, rows = store.read_rows([fingerprint], column=FINGERPRINT_COLUMN)
+        else:
+            rows = self.find_rows(FINGERPRINT_COLUMN, fingerprint)
+        return dict(rows[-1]) if len(rows) > 0 else None
+
     def preprocessing(self, debug: bool=False):
         """Runs any preprocessing steps implemented in self.preprocessing_steps and/or self.preprocessing_debug when in debug mode.
+        If self.preprocessing_cache is set, the attributes set by a previous run of the same preprocessing are loaded from 
+        the cache instead. In debug mode with self.debug_budget set, the cached attributes are the subsampled ones and 
+        the cache of the budget is used if it has one.
 
         Args:
             debug (bool, optional): Specifies whether the preprocessing should be run in debug mode. Refer to self.run_experiment
             for more information. Defaults to False.
         """
+        cache = self.preprocessing_cache
+        extra_key = None
+        if debug and self.debug_budget is not None:
+            if self.debug_budget.cache is not None:
+                cache = self.debug_budget.cache
+            extra_key = self.debug_budget.cache_key_inputs()
+        if cache is None:
+            self._preprocessing(debug=debug)
+            return
+        cache_key = cache.make_key(self, debug=debug, extra=extra_key)
+        if cache_key is None:
+            self._preprocessing(debug=debug)
+        elif cache.load(cache_key, self):
+            logger.info("Loaded preprocessing outputs from cache")
+        else:
+            snapshot = cache.snapshot(self)
+            self._preprocessing(debug=debug)
+            cache.save(cache_key, self, snapshot)
+
+    def _preprocessing(self, debug: bool=False):
         if debug:
+            # The subsample is taken before self.preprocessing_debug when it post processes 
+            # self.preprocessing_steps, such that it runs on the subsample
             if not self.debug_skips_preprop_steps:
                 self.preprocessing_steps()
+                self._debug_subsample()
             try:
                 self.preprocessing_debug()
             except NotImplementedError:
                 logger.warning("preprocessing_debug not implemented however skipping error.")
+            if self.debug_skips_preprop_steps:
+                self._debug_subsample()
         else:
             self.preprocessing_steps()
 
+    def _debug_subsample(self):
+        if self.debug_budget is not None:
+            self.debug_budget.subsample(self)
+
     def train_model(self):
         raise NotImplementedError("train_model method should be implemented on a per experiment basis")
 
+    def log_metric(self, name:str, value:float, step:int=None):
+        """Records the value of a metric at a step of training i.e. the loss of each epoch. Values are buffered by 
+        self.metric_logger and flushed to the metrics directory of self.model_sv_loc, see MetricLogger.
+
+        Args:
+            name (str): Name of the metric
+            value (float): Value of the metric
+            step (int, optional): Step of the value. If None, one more than the previous step of the metric. 
+            Defaults to None.
+        """
+        if self.metric_logger is None:
+            self.metric_logger = MetricLogger(sv_dir=self.model_sv_loc)
+        self.metric_logger.log(name, value, step)
+
+    def _start_metric_logger(self):
+        """Replaces self.metric_logger with an empty logger for the run, writing to self.model_sv_loc
+        """
+        if self.metric_logger is None:
+            self.metric_logger = MetricLogger()
+        self.metric_logger = self.metric_logger.new_run(self.model_sv_loc)
+
+    def _flush_metric_logger(self):
+        if self.metric_logger is not None:
+            self.metric_logger.flush()
+
+    def _run_debug_train(self, train_kwargs:dict = {}):
+        """Runs self.train_model in debug mode, passing self.debug_budget if set
+        """
+        if self.debug_budget is not None:
+            train_kwargs = self.debug_budget.train_kwargs(self.train_model, train_kwargs)
+            self.debug_budget.start()
+        self._start_metric_logger()
+        with self._profile_stage("train_model"):
+            self.train_model(**train_kwargs)
+        self._flush_metric_logger()
+        if self.debug_budget is not None and self.debug_budget.time_exceeded():
+            logger.warning("train_model exceeded the debug time limit of {}s".format(
+                self.debug_budget.time_limit_s))
+
+    def post_train(self):
+        """Called after self.train_model and before self.evaluate_model when running in 'normal' mode i.e. to persist 
+        or release training outputs before evaluation. Defaults to no action.
+        """
+        pass
+
+    def _profile_stage(self, stage:str):
+        """Returns a context manager measuring stage via self.stage_profiler if set
+        """
+        if self.stage_profiler is None:
+            return nullcontext()
+        return self.stage_profiler.profile(stage, model_name=self.model_name)
+
+    def _setup_output_location(self, parent_sv_dir:str, 
+                               dupe_model_nms:ExperimentOption, 
+                               tracker:ModelTracker=None):
+        """Checks whether self.model_name already exists in tracker, handles 
+        the existing run as specified by dupe_model_nms and creates the output 
+        directory for the run. Refer to self.run_experiment for more 
+        information.
+
+        Args:
+            parent_sv_dir (str): The location of the parent directory where the subdirectory should be made
+            dupe_model_nms (ExperimentOption): Defines what action should be taken if an experiment with the same 
+            self.model_name is found in the tracker
+            tracker (ModelTracker, optional): The tracker to check. If None, self is used. Defaults to None.
+        """
+        if tracker is None:
+            tracker = self
+        logger.info(" ***** Checking whether model exists in tracker ***** ")
+        if tracker.check_model_exists(self.model_name):
+            logger.info("{} run already exists".format(self.model_name))
+            if dupe_model_nms.exp_option == "overwrite":
+                logger.info("Overwriting previous run")
+                # Cannot just use index incase duplicates have already slipped through!
+                tracker.delete_rows(self.model_name)
+                # The previous outputs are moved aside and deleted in the 
+                # background such that the run does not wait on the deletion
+                remove_dir_in_background(os.path.join(parent_sv_dir, self.model_name))
+                self._create_output_sub_loc(parent_sv_dir)
+            elif dupe_model_nms.exp_option == "duplicate":
+                logger.info("Keeping both runs")
+                self.model_sv_loc = make_suffixed_dir(parent_sv_dir, self.model_name)
+            elif dupe_model_nms.exp_option == None:
+                raise ModelExperimentBaseError(
+            "Run with model name {} already exists therefore duplicate or overwrite must be specified in the dupe_model_nms option".format(self.model_name))
+        else:
+            self._create_output_sub_loc(parent_sv_dir)
+
+    def _run_preprocessing(self, debug:bool=False):
+        """Runs self.preprocessing as a profiled stage, skipping it if not implemented
+        """
+        try:
+            with self._profile_stage("preprocessing"):
+                self.preprocessing(debug=debug)
+        except NotImplementedError:
+            logger.warning("preprocessing_steps not implemented however skipping error.")
+
+    # Attributes which are not part of the state of a run and are therefore not checkpointed
+    _checkpoint_exclude = ["model_sv_loc", "preprocessing_cache", "stage_profiler", "debug_budget", 
+                           "checkpoint_stages"]
+
+    def _save_checkpoint(self, stage:str, progress:dict):
+        """Records stage as completed in progress and, if self.checkpoint_stages is set, pickles progress and the 
+        state of self (excluding the rows of the tracker) to self.model_sv_loc
+        """
+        progress["stage"] = stage
+        if not self.checkpoint_stages or self.model_sv_loc is None:
+            return
+        exclude = set(vars(ModelTracker())) | set(self._checkpoint_exclude)
+        state = {nm: val for nm, val in vars(self).items() if nm not in exclude}
+        if save_checkpoint(self.model_sv_loc, {**progress, "state": state}):
+            logger.info("Checkpointed {} stage to {}".format(stage, self.model_sv_loc))
+
+    def _load_checkpoint(self) -> dict:
+        """Restores the state of self from the checkpoint in self.model_sv_loc
+
+        Returns:
+            dict: The progress of the checkpointed run or None if there is no checkpoint
+        """
+        checkpoint = load_checkpoint(self.model_sv_loc)
+        if checkpoint is None:
+            return None
+        for nm, val in checkpoint.pop("state").items():
+            setattr(self, nm, val)
+        logger.info("Resuming {} after {} stage".format(self.model_name, checkpoint["stage"]))
+        return checkpoint
+
+    @staticmethod
+    def _stage_done(stage:str, progress:dict) -> bool:
+        return (progress.get("stage") is not None and 
+                CHECKPOINT_STAGES.index(stage) <= CHECKPOINT_STAGES.index(progress["stage"]))
+
+    def _run_train_evaluate(self, train_kwargs:dict = {}, progress:dict = None) -> str:
+        """Runs the training and evaluation stages of an experiment in 'normal' mode
+
+        Args:
+            train_kwargs (dict, optional): kwargs relating to self.train_model. Defaults to {}.
+            progress (dict, optional): The progress of the run, stages already completed are skipped. Defaults to 
+            None i.e. no stages completed.
+
+        Returns:
+            str: The time at which training ended
+        """
+        if progress is None:
+            progress = {}
+        if self._stage_done("train_model", progress):
+            logger.info("Skipping completed train_model stage")
+        else:
+            self._start_metric_logger()
+            with self._profile_stage("train_model"):
+                self.train_model(**train_kwargs)
+            progress["train_time_end"] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            self._flush_metric_logger()
+            self.post_train()
+            self._save_checkpoint("train_model", progress)
+        if self._stage_done("evaluate_model", progress):
+            logger.info("Skipping completed evaluate_model stage")
+        else:
+            logger.info(" ***** Evaluating model ***** ")
+            with self._profile_stage("evaluate_model"):
+                self.evaluate_model()
+            self._save_checkpoint("evaluate_model", progress)
+        return progress["train_time_end"]
+
+    def _run_stages(self, train_kwargs:dict = {}, progress:dict = None) -> Tuple[str, str]:
+        """Runs the preprocessing, training and evaluation stages of an 
+        experiment in 'normal' mode
+
+        Args:
+            train_kwargs (dict, optional): kwargs relating to self.train_model. Defaults to {}.
+            progress (dict, optional): The progress of the run, stages already completed are skipped. Defaults to 
+            None i.e. no stages completed.
+
+        Returns:
+            Tuple[str, str]: The times at which training started and ended
+        """
+        logger.info(" **** Training model ***** ")
+        if progress is None:
+            progress = {}
+        if self._stage_done("preprocessing", progress):
+            logger.info("Skipping completed preprocessing stage")
+        else:
+            progress["train_time_strt"] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            self._run_preprocessing()
+            self._save_checkpoint("preprocessing", progress)
+        train_time_end = self._run_train_evaluate(train_kwargs=train_kwargs, progress=progress)
+        return progress["train_time_strt"], train_time_end
+
+    def _build_tracker_line(self, exp_description:str, prev_run_notes:str, 
+                            train_time_strt:str, train_time_end:str) -> dict:
+        """Returns the tracker row recording the experiment
+
+        Args:
+            exp_description (str): A description of the experiment
+            prev_run_notes (str): A description of the differences compared to a previous experiment
+            train_time_strt (str): The time at which training started
+            train_time_end (str): The time at which training ended
+
+        Returns:
+            dict: The row of the form {column:value}
+        """
+        profile_columns = {}
+        if self.stage_profiler is not None:
+            profile_columns = self.stage_profiler.tracker_columns()
+        metric_columns = {}
+        if self.metric_logger is not None:
+            self.metric_logger.flush()
+            if self.metric_logger.tracker_summary:
+                metric_columns = self.metric_logger.summary()
+        return {**self.results,
+                **profile_columns,
+                **metric_columns,
+                "model_name": self.model_name,
+                "experiment_description": exp_description,
+                "prev_run_notes": prev_run_notes,
+                "train_time_strt": train_time_strt,
+                "train_time_end": train_time_end,
+                "output_save_location": self.model_sv_loc
+                }
+
     def run_experiment(self, existing_tracker_path:str, exp_description:str, 
                        parent_sv_dir:str, prev_run_notes:str="", 
                        train_kwargs: dict = {}, updt_kwargs: dict = {}, 
                        dupe_model_nms: ExperimentOption = ExperimentOption(None), 
                        debug=False, debug_sv_dir:str=None, 
-                       force_columns:bool=False):
+                       force_columns:bool=False, 
+                       tracker_type:TrackerType = TrackerType("json"), 
+                       concurrency_safe:bool=False, resume:bool=False, 
+                       fingerprint_cache:bool=False) -> dict:
         """Runs an experiment in either 'normal' or debug mode specified by the debug parameter. 
         An experiment in 'normal' mode consists of the following:
-        1. Create or import an existing tracker from json. If the tracker is imported, check whether an entry with the same 
+        1. Create or import an existing tracker of type tracker_type. If the tracker is imported, check whether an entry with the same 
         self.model_name exists. If it does, handle depending on what is specified by dupe_model_nms
         2. If preprocessing steps have been implemented in self.preprocessing_steps run them
         3. Train the model using self.train_model
         4. Evaluate the model outputs using self.evaluate_model 
-        5. Update the tracker and re-save the json
+        5. Update the tracker and re-save it. For TrackerType("jsonl") only the 
+        new row is appended to the file and for TrackerType("sqlite") only the 
+        new row is read and upserted
 
         If run in debug mode. No results will be saved and self.preprocessing will be run in debug mode. Refer to 
-        self.preprocessing_debug for more information on how self.preprocessing is effected by debug mode
+        self.preprocessing_debug for more information on how self.preprocessing is effected by debug mode and 
+        DebugBudget for limiting the data and training of debug runs via self.debug_budget
         
 
         Args:
-            existing_tracker_path (str): Location of existing json tracker to update. 
+            existing_tracker_path (str): Location of existing tracker to update, or the address of a TrackerServer 
+            for TrackerType("server"). 
             exp_description (str): A description of the experiment. 
             parent_sv_dir (str): The location of the parent directory where the subdirectory should be made to store any 
             outputs such as graphs.. 
             prev_run_notes (str, optional): A description of the differences compared to a previous experiment. Defaults to "".
             train_kwargs (dict, optional): kwargs relating to self.train_model. Defaults to {}.
-            updt_kwargs (dict, optional): kwargs relating to self.import_existing_json_tracker. See ModelTracker for more 
-            info. Defaults to {}.
+            updt_kwargs (dict, optional): kwargs relating to the import method for tracker_type i.e. 
+            self.import_existing_json_tracker. See ModelTracker for more info. Defaults to {}.
             dupe_model_nms (ExperimentOption, optional): Defines what action should be taken if an experiment with the same 
             self.model_name is found in the tracker. 
             ExperimentOption('overwrite') will overwrite the previous experiment. 
@@ -125,88 +470,185 @@ class ModelExperimentBase(ModelTracker):
             debug (bool, optional): Defines whether the experiment should be run in debug mode. Defaults to False.
             debug_sv_dir (str): Assigns location to model_save_loc if the debug option is selected
             force_columns (bool): Option to force new columns into the tracker
+            tracker_type (TrackerType, optional): Storage format of the tracker at existing_tracker_path. 
+            Defaults to TrackerType("json").
+            concurrency_safe (bool, optional): If True, the tracker is updated via 
+            self.concurrent_update_existing_tracker such that many processes can run experiments against 
+            the same tracker at once. Defaults to False.
+            resume (bool, optional): If True and a previous run of self.model_name left a checkpoint in its output 
+            directory (see self.checkpoint_stages), the state of self is restored from the checkpoint, the 
+            completed stages are skipped and the output directory is reused rather than deleted or duplicated. 
+            Runs without a checkpoint start as if resume were False. Defaults to False.
+            fingerprint_cache (bool, optional): If True, the configuration of the run is fingerprinted from the 
+            source code of the experiment classes, train_kwargs and self.fingerprint_inputs and recorded in the 
+            config_fingerprint column of the tracker. If the tracker already has a row with the same fingerprint, 
+            that row is returned without running the experiment or touching the output directories. Enabling the 
+            option for an existing tracker adds a column, therefore force_columns should be set for the first run. 
+            Defaults to False.
+
+        Returns:
+            dict: The tracker row of the run, or the existing row if fingerprint_cache found a match. None in debug 
+            mode.
         """
         # TODO: Move parent_sv_dir to an attribute of the class such that it can be set by parent classes
+        if self.stage_profiler is not None:
+            self.stage_profiler.reset()
 
         if debug:
             logger.info(" ***** Running in debug mode ***** ")
             logger.info("""No results will be captured in debug mode. 
             If preprocessing method has been defined with debug facilities, this will also run.""")
             self.model_sv_loc = debug_sv_dir
-            try:
-                self.preprocessing(debug=True)
-            except NotImplementedError:
-                logger.warning("preprocessing_steps not implemented however skipping error.")
-            self.train_model(**train_kwargs)
+            self._run_preprocessing(debug=True)
+            self._run_debug_train(train_kwargs=train_kwargs)
 
         else:
             logger.info(" ***** Importing existing tracker ***** ")
-            if self.check_tracker_exists(existing_tracker_path=existing_tracker_path):
+            if self.check_tracker_exists(existing_tracker_path=existing_tracker_path, 
+                                         tracker_type=tracker_type):
                 logger.info("Tracker identified. Importing...")
-                # TODO: Implement the ability to specify what type of tracker to import i.e. dataframe/csv/json etc
-                self.import_existing_json_tracker(existing_tracker_path, 
-                                                  **updt_kwargs)
+                with self._profile_stage("tracker_import"):
+                    self.import_existing_tracker(existing_tracker_path, 
+                                                 tracker_type, 
+                                                 u_ids=[self.model_name], 
+                                                 **updt_kwargs)
             else:
                 logger.info("Could not find tracker at location, creating new tracker")
 
-            logger.info(" ***** Checking whether model exists in tracker ***** ")
-            curr_model_nms = [rw["model_name"] for rw in self.rows]
-            if self.model_name in curr_model_nms:
-                logger.info("{} run already exists".format(self.model_name))
-                if dupe_model_nms.exp_option == "overwrite":
-                    logger.info("Overwriting previous run")
-                    # Cannot just use index incase duplicates have already slipped through!
-                    dupe_indices = [idx for idx, mdl_nm in enumerate(curr_model_nms) if mdl_nm == self.model_name]
-                    dupe_indices.sort(reverse=True)
-                    for idx in dupe_indices:
-                        del self.rows[idx]
-                    if os.path.exists(os.path.join(parent_sv_dir, self.model_name)):
-                        shutil.rmtree(os.path.join(parent_sv_dir, self.model_name))
-                        dir_not_rmved = True
-                        while(dir_not_rmved):
-                            time.sleep(1)
-                            dir_not_rmved = os.path.exists(os.path.join(
-                                parent_sv_dir, self.model_name))
-                    self._create_output_sub_loc(parent_sv_dir)
-                elif dupe_model_nms.exp_option == "duplicate":
-                    logger.info("Keeping both runs")
-                    avail_loc = False
-                    sup_dir_idx = 1
-                    # Loop through adding 1 to the end each time to find available name to save model 
-                    while avail_loc == False:
-                        sup_dir = "{}_{}".format(self.model_name, sup_dir_idx)
-                        if not os.path.exists(os.path.join(parent_sv_dir, sup_dir)):
-                            avail_loc = True
-                            self._create_output_sub_loc(parent_sv_dir, sup_dir)
-                        sup_dir_idx  =+ 1
-                elif dupe_model_nms.exp_option == None:
-                    raise ModelExperimentBaseError(
-                "Run with model name {} already exists therefore duplicate or overwrite must be specified in the dupe_model_nms option".format(self.model_name))
-            else:
-                self._create_output_sub_loc(parent_sv_dir)
+            fingerprint = None
+            if fingerprint_cache:
+                fingerprint = config_fingerprint(self, train_kwargs)
+            if fingerprint is not None:
+                cached_row = self._find_fingerprint_row(
+                    existing_tracker_path, tracker_type, fingerprint, updt_kwargs=updt_kwargs)
+                if cached_row is not None:
+                    logger.info("Configuration already run as {}, skipping experiment".format(
+                        cached_row.get(self.u_id)))
+                    self.model_sv_loc = cached_row.get("output_save_location")
+                    return cached_row
 
-            logger.info(" **** Training model ***** ")
-            train_time_strt = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-            try:
-                self.preprocessing()
-            except NotImplementedError:
-                logger.warning("preprocessing_steps not implemented however skipping error.")
-            self.train_model(**train_kwargs)
-            train_time_end = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-            logger.info(" ***** Evaluating model ***** ")
-            self.evaluate_model()
-            new_tracker_line = {**self.results,
-                                "model_name": self.model_name,
-                                "experiment_description": exp_description,
-                                "prev_run_notes": prev_run_notes,
-                                "train_time_strt": train_time_strt,
-                                "train_time_end": train_time_end,
-                                "output_save_location": self.model_sv_loc
-                                }
+            progress = None
+            checkpoint_dir = None
+            if resume:
+                checkpoint_dir = find_checkpoint_dir(parent_sv_dir, self.model_name)
+            if checkpoint_dir is None:
+                self._setup_output_location(parent_sv_dir=parent_sv_dir, 
+                                            dupe_model_nms=dupe_model_nms)
+            else:
+                self.model_sv_loc = checkpoint_dir
+                progress = self._load_checkpoint()
+                if (self.check_model_exists(self.model_name) and 
+                    dupe_model_nms.exp_option == "overwrite"):
+                    self.delete_rows(self.model_name)
+            train_time_strt, train_time_end = self._run_stages(
+                train_kwargs=train_kwargs, progress=progress)
+            new_tracker_line = self._build_tracker_line(
+                exp_description=exp_description, prev_run_notes=prev_run_notes, 
+                train_time_strt=train_time_strt, train_time_end=train_time_end)
+            if fingerprint is not None:
+                new_tracker_line[FINGERPRINT_COLUMN] = fingerprint
             logger.info(" ***** Updating tracker ***** ")
             self.update_tracker_w_dict(new_tracker_line, 
                                        force_columns=force_columns)
-            logger.info(" ***** Updating json ***** ")
-            self.tracker_to_json(json_dir=existing_tracker_path)
+            logger.info(" ***** Updating tracker file ***** ")
+            new_row = self.rows[self.get_cur_row_index(self.model_name)]
+            with self._profile_stage("tracker_write"):
+                if concurrency_safe:
+                    self.concurrent_update_existing_tracker(
+                        existing_tracker_path, tracker_type, rows=[new_row], 
+                        **updt_kwargs)
+                else:
+                    self.write_tracker(existing_tracker_path, tracker_type, 
+                                       new_rows=[new_row])
+            remove_checkpoint(self.model_sv_loc)
+            return dict(new_row)
 
+    async def arun_experiment(self, existing_tracker_path:str, exp_description:str, 
+                              parent_sv_dir:str, prev_run_notes:str="", 
+                              train_kwargs: dict = {}, updt_kwargs: dict = {}, 
+                              dupe_model_nms: ExperimentOption = ExperimentOption(None), 
+                              debug=False, debug_sv_dir:str=None, 
+                              force_columns:bool=False, 
+                              tracker_type:TrackerType = TrackerType("json"), 
+                              concurrency_safe:bool=False, 
+                              writer:AsyncTrackerWriter=None, 
+                              executor:Executor=None):
+        """asyncio equivalent of self.run_experiment. The stages run in executor such that the event loop remains free 
+        to run other experiments. Unlike self.run_experiment:
+        1. The tracker is imported into a separate ModelTracker and the output directory set up whilst 
+        self.preprocessing runs. self.model_sv_loc is therefore only guaranteed to be set once preprocessing has 
+        finished and self.rows is not updated
+        2. The new row is checked against the imported tracker and passed to writer. By default, every experiment 
+        of the event loop writing to existing_tracker_path shares one writer (see AsyncTrackerWriter.get_shared), 
+        therefore rows of experiments completing together are written with a single write of the tracker
+        The coroutine completes once the row has been written. All arguments other than writer and executor are as 
+        for self.run_experiment.
+
+        Args:
+            writer (AsyncTrackerWriter, optional): Writer of the tracker. If None, the shared writer of the event 
+            loop is used. Defaults to None.
+            executor (Executor, optional): Executor in which the stages run. Stages run in threads of the default 
+            executor when None, therefore concurrent experiments should release the GIL i.e. when training via 
+            numpy or a deep learning framework, otherwise a ProcessPoolExecutor should be used via 
+            ExperimentScheduler. Defaults to None.
+        """
+        loop = asyncio.get_event_loop()
+        if self.stage_profiler is not None:
+            self.stage_profiler.reset()
+
+        if debug:
+            logger.info(" ***** Running in debug mode ***** ")
+            self.model_sv_loc = debug_sv_dir
+            await loop.run_in_executor(executor, self._run_preprocessing, True)
+            await loop.run_in_executor(
+                executor, lambda: self._run_debug_train(train_kwargs=train_kwargs))
+            return
+
+        tracker = ModelTracker(u_id=self.u_id)
+
+        def import_tracker():
+            logger.info(" ***** Importing existing tracker ***** ")
+            if self.check_tracker_exists(existing_tracker_path=existing_tracker_path, 
+                                         tracker_type=tracker_type):
+                # Not profiled as the import overlaps the profiled 
+                # preprocessing, whose measurements would include it
+                tracker.import_existing_tracker(existing_tracker_path, 
+                                                tracker_type, 
+                                                u_ids=[self.model_name], 
+                                                **updt_kwargs)
+            else:
+                logger.info("Could not find tracker at location, creating new tracker")
+            self._setup_output_location(parent_sv_dir=parent_sv_dir, 
+                                        dupe_model_nms=dupe_model_nms, 
+                                        tracker=tracker)
 
+        logger.info(" **** Training model ***** ")
+        train_time_strt = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        await asyncio.gather(
+            loop.run_in_executor(executor, import_tracker),
+            loop.run_in_executor(executor, self._run_preprocessing))
+        # Checkpointed once self.model_sv_loc has been set by import_tracker
+        progress = {"train_time_strt": train_time_strt}
+        self._save_checkpoint("preprocessing", progress)
+        train_time_end = await loop.run_in_executor(
+            executor, lambda: self._run_train_evaluate(train_kwargs=train_kwargs, 
+                                                       progress=progress))
+        new_tracker_line = self._build_tracker_line(
+            exp_description=exp_description, prev_run_notes=prev_run_notes, 
+            train_time_strt=train_time_strt, train_time_end=train_time_end)
+        logger.info(" ***** Updating tracker ***** ")
+        tracker.update_tracker_w_dict(new_tracker_line, 
+                                      force_columns=force_columns)
+        new_row = dict(tracker.rows[tracker.get_cur_row_index(self.model_name)])
+        if writer is None:
+            writer = AsyncTrackerWriter.get_shared(
+                existing_tracker_path, tracker_type, 
+                concurrency_safe=concurrency_safe, updt_kwargs=updt_kwargs, 
+                u_id=self.u_id)
+        elif writer.tracker.u_id != self.u_id:
+            raise ValueError(
+                "writer has u_id {} but the experiment has u_id {}".format(
+                    writer.tracker.u_id, self.u_id))
+        with self._profile_stage("tracker_write"):
+            await writer.write(new_row)
+        remove_checkpoint(self.model_sv_loc)
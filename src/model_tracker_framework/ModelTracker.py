@@ -1,25 +1,160 @@
+import itertools
+import json
 import logging
 import os
-from typing import Any, Callable, Dict, List
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Union
 
-import pandas as pd
+from .CompactRowStore import CompactRowStore
+from .MTFSupporting import LazyModule, TrackerType
+from .SQLiteTracker import SQLiteTrackerStore
+from .TrackerClient import get_client
+from .TrackerIndexes import (
+    HashIndex, SortedMetricIndex, is_hashable_value, is_indexable_metric)
+from .TrackerLock import (
+    atomic_write_path, list_pending_rows, spool_pending_rows, 
+    tracker_file_lock)
+
+pd = LazyModule("pandas")
 
 logger = logging.getLogger("mtf_logger")
 
 
 class ModelTracker:
     
-    def __init__(self, u_id:str="model_name"):
+    def __init__(self, u_id:str="model_name", row_store:str="list"):
         """Class representing a 'model tracker'. 
         self.rows is a list dictionaries where each dictionary is of the form 
         {column_name: value} and each dictionary represents an individual 
         experiment
         self.column_names is a list of unique column_name value from self.rows
         
+        Args:
+            u_id (str, optional): Column uniquely identifying each row. 
+            Defaults to "model_name".
+            row_store (str, optional): How self.rows is stored. "list" stores 
+            a list of dictionaries. "compact" stores a CompactRowStore which 
+            holds the values by column, with numeric columns in typed arrays, 
+            and returns dictionary like views of the rows. "compact" uses 
+            considerably less memory for large trackers but row access is 
+            slower. Defaults to "list".
         """
-        self.rows:List[Dict[str,Any]] = []
+        if row_store not in ["list", "compact"]:
+            raise TypeError("row_store should only be one of list or compact")
+        self.rows:List[Dict[str,Any]] = (
+            CompactRowStore() if row_store == "compact" else [])
         self.column_names:List[str] = []
         self.u_id:str = u_id
+        # Maps u_id values to their position in self.rows. Where duplicate 
+        # u_id values exist, the first occurrence is indexed
+        self._u_id_idx:Dict[Any,int] = {}
+        self._u_id_idx_rows:List[Dict[str,Any]] = self.rows
+        self._u_id_idx_len:int = 0
+        # Sorted indexes over numeric metric columns, see 
+        # self.create_metric_index
+        self._metric_indexes:Dict[str,SortedMetricIndex] = {}
+        # Hash indexes over columns used for equality lookups, see 
+        # self.create_hash_index
+        self._hash_indexes:Dict[str,HashIndex] = {}
+        # Incremented on every change made via the ModelTracker methods such 
+        # that the dataframe returned by self.tracker_to_pandas_df is only 
+        # rebuilt after a change
+        self._version:int = 0
+        self._df_cache:"pd.DataFrame" = None
+        self._df_cache_key:tuple = None
+
+    def _rebuild_u_id_index(self):
+        """Rebuilds the u_id -> row index mapping from scratch. Called after 
+        operations which shift row positions i.e. deletes, or when self.rows 
+        has been modified outside of the ModelTracker methods. The metric 
+        and hash indexes are marked for rebuilding and the cached dataframe is 
+        invalidated.
+        """
+        u_id_idx = {}
+        if isinstance(self.rows, CompactRowStore):
+            u_id_vals = self.rows.column_values(self.u_id)
+        else:
+            u_id_vals = (rw.get(self.u_id) for rw in self.rows)
+        for idx, val in enumerate(u_id_vals):
+            if val is not None and val not in u_id_idx:
+                u_id_idx[val] = idx
+        self._u_id_idx = u_id_idx
+        self._u_id_idx_rows = self.rows
+        self._u_id_idx_len = len(self.rows)
+        for _, index in self._secondary_indexes():
+            index.stale = True
+        self._version += 1
+
+    def _secondary_indexes(self):
+        """Returns an iterator over the (column, index) pairs of the metric 
+        and hash indexes
+        """
+        return itertools.chain(self._metric_indexes.items(), 
+                               self._hash_indexes.items())
+
+    def _get_u_id_index(self) -> Dict[Any,int]:
+        """Returns the u_id -> row index mapping, rebuilding it if self.rows 
+        has been replaced or resized without going through the ModelTracker 
+        methods
+
+        Returns:
+            Dict[Any,int]: Mapping of u_id values to positions in self.rows
+        """
+        if (self._u_id_idx_rows is not self.rows) or (
+            self._u_id_idx_len != len(self.rows)):
+            self._rebuild_u_id_index()
+        return self._u_id_idx
+
+    def _append_row(self, row_dict:Dict[str,Any]):
+        """Appends row_dict to self.rows whilst keeping the indexes 
+        consistent
+
+        Args:
+            row_dict (Dict[str,Any]): Row to append
+        """
+        u_id_idx = self._get_u_id_index()
+        val = row_dict.get(self.u_id)
+        row_idx = len(self.rows)
+        if val is not None and val not in u_id_idx:
+            u_id_idx[val] = row_idx
+        self.rows.append(row_dict)
+        self._u_id_idx_len = len(self.rows)
+        for col, index in self._secondary_indexes():
+            index.add(row_dict.get(col), row_idx)
+        self._version += 1
+
+    def _update_row(self, row_idx:int, row_dict:Dict[str,Any]):
+        """Updates the row at row_idx with the values in row_dict whilst 
+        keeping the metric indexes consistent
+
+        Args:
+            row_idx (int): Position of the row in self.rows
+            row_dict (Dict[str,Any]): Values to update
+        """
+        row = self.rows[row_idx]
+        for col, index in self._secondary_indexes():
+            if col in row_dict:
+                index.remove(row.get(col), row_idx)
+                index.add(row_dict[col], row_idx)
+        row.update(row_dict)
+        self._version += 1
+
+    def _set_row(self, row_idx:int, row_dict:Dict[str,Any]):
+        """Replaces the row at row_idx with row_dict whilst keeping the metric 
+        indexes consistent. row_dict must have the same u_id as the row it 
+        replaces.
+
+        Args:
+            row_idx (int): Position of the row in self.rows
+            row_dict (Dict[str,Any]): The replacement row
+        """
+        row = self.rows[row_idx]
+        for col, index in self._secondary_indexes():
+            index.remove(row.get(col), row_idx)
+            index.add(row_dict.get(col), row_idx)
+        self.rows[row_idx] = row_dict
+        self._version += 1
 
     def _get_check_consistent_col_names(self, new_row_col_names:list, 
                                         force_columns:bool=False) -> set:
@@ -71,6 +206,7 @@ class ModelTracker:
                     row[self.u_id] = u_id_update(row)    
             except KeyError as e:
                 row[self.u_id] = u_id_update(row)
+        self._rebuild_u_id_index()
 
     def update_tracker_w_dict(self, row_dict:dict, force_columns:bool=False):
         """Updates the self.rows and self.column_names with the new values 
@@ -82,14 +218,16 @@ class ModelTracker:
             force_columns (bool, optional): Option to force new column names in 
             and avoid exception. Defaults to False.
         """
+        row_idx = None
         try:
             row_idx = self.get_cur_row_index(u_id=row_dict[self.u_id])
-            logger.warn(
+            logger.warning(
                 "Model already exists in tracker, overwriting relevant values")
-            old_row = self.rows.pop(row_idx)
-            for i in row_dict:
-                old_row[i] = row_dict[i]
-            row_dict = old_row
+            # The existing row is updated in place rather than popped and 
+            # re-appended such that the update does not shift other rows
+            merged_row = dict(self.rows[row_idx])
+            merged_row.update(row_dict)
+            row_dict = merged_row
         except KeyError as e:
             pass     
         new_row_col_names = [col for col in row_dict.keys()]
@@ -97,32 +235,451 @@ class ModelTracker:
             new_row_col_names=new_row_col_names, force_columns=force_columns)
         if len(nw_col_names) > 0:
             self.column_names += nw_col_names
-        self.rows.append(row_dict)
+        if row_idx is None:
+            self._append_row(row_dict)
+        else:
+            self._update_row(row_idx, row_dict)
+
+    def update_tracker_w_dicts(self, row_dicts:List[Dict[str,Any]], 
+                               force_columns:bool=False, 
+                               col_names:List[str]=None):
+        """Bulk equivalent of self.update_tracker_w_dict. The column names 
+        of the rows are checked against self.column_names once for the whole 
+        batch, after which rows sharing a u_id with an existing row (or an 
+        earlier row in row_dicts) update that row and all other rows are 
+        appended in a single pass. Rows are checked as a batch, as when 
+        importing a dataframe, such that keys missing from individual rows 
+        are treated as missing values.
+
+        Args:
+            row_dicts (List[Dict[str,Any]]): dictionaries containing 
+            {column:values} to be added to the tracker
+            force_columns (bool, optional): Option to force new column names in 
+            and avoid exception. Defaults to False.
+            col_names (List[str], optional): The column names of the batch. If 
+            None, the union of the keys of row_dicts is used. Defaults to None.
+        """
+        if col_names is None:
+            col_names = list(dict.fromkeys(
+                col for rw in row_dicts for col in rw.keys()))
+        nw_col_names = self._get_check_consistent_col_names(
+            new_row_col_names=col_names, force_columns=force_columns)
+        if len(nw_col_names) > 0:
+            self.column_names += [
+                col for col in col_names if col in nw_col_names]
+        u_id_idx = self._get_u_id_index()
+        n_overwritten = 0
+        for row_dict in row_dicts:
+            val = row_dict.get(self.u_id)
+            row_idx = None if val is None else u_id_idx.get(val)
+            if row_idx is None:
+                self._append_row(row_dict)
+            else:
+                self._update_row(row_idx, row_dict)
+                n_overwritten += 1
+        if n_overwritten > 0:
+            logger.warning(
+                "{} models already exist in tracker, overwriting relevant values".format(
+                    n_overwritten))
+
+    def replace_rows(self, row_dicts:List[Dict[str,Any]], 
+                     force_columns:bool=False):
+        """Adds rows to the tracker. Unlike self.update_tracker_w_dicts, a row 
+        sharing a u_id with an existing row replaces the existing row entirely 
+        rather than updating its values.
+
+        Args:
+            row_dicts (List[Dict[str,Any]]): dictionaries containing 
+            {column:values} to be added to the tracker
+            force_columns (bool, optional): Option to force new column names in 
+            and avoid exception. Defaults to False.
+        """
+        col_names = list(dict.fromkeys(
+            col for rw in row_dicts for col in rw.keys()))
+        nw_col_names = self._get_check_consistent_col_names(
+            new_row_col_names=col_names, force_columns=force_columns)
+        if len(nw_col_names) > 0:
+            self.column_names += [
+                col for col in col_names if col in nw_col_names]
+        u_id_idx = self._get_u_id_index()
+        for row_dict in row_dicts:
+            val = row_dict.get(self.u_id)
+            row_idx = None if val is None else u_id_idx.get(val)
+            if row_idx is None:
+                self._append_row(row_dict)
+            else:
+                self._set_row(row_idx, row_dict)
+
+    def delete_rows(self, u_id:Any) -> int:
+        """Deletes every row in self.rows with a self.u_id value equal to u_id.
+        All rows are checked such that duplicates which have previously slipped 
+        into the tracker are also removed.
+
+        Args:
+            u_id (Any): The u_id value of the rows to delete
+
+        Returns:
+            int: The number of rows deleted
+        """
+        if u_id not in self._get_u_id_index():
+            return 0
+        keep_rows = [rw for rw in self.rows if rw.get(self.u_id) != u_id]
+        n_deleted = len(self.rows) - len(keep_rows)
+        # Mutate in place so that references to self.rows remain valid
+        self.rows[:] = keep_rows
+        self._rebuild_u_id_index()
+        return n_deleted
         
-    def check_model_exists(self, u_id:str):
-        curr_model_nms = [rw[u_id] for rw in self.rows]
-        res = u_id in curr_model_nms
-        return res
+    def check_model_exists(self, u_id:Any) -> bool:
+        """Checks whether a row with a self.u_id value equal to u_id exists in 
+        the tracker
+
+        Args:
+            u_id (Any): The u_id value to check
+
+        Returns:
+            bool: True if a row exists else False
+        """
+        return u_id in self._get_u_id_index()
     
-    def get_cur_row_index(self, u_id:str):
-        for idx, rw in enumerate(self.rows):
-            if rw[self.u_id] == u_id:
-                return idx
-        raise KeyError("Model does not exist in tracker")
+    def get_cur_row_index(self, u_id:Any) -> int:
+        """Returns the position in self.rows of the row with a self.u_id value 
+        equal to u_id
+
+        Args:
+            u_id (Any): The u_id value to locate
+
+        Raises:
+            KeyError: If no row exists with the provided u_id
+
+        Returns:
+            int: Position of the row in self.rows
+        """
+        u_id_idx = self._get_u_id_index()
+        try:
+            row_idx = u_id_idx[u_id]
+        except (KeyError, TypeError):
+            raise KeyError("Model does not exist in tracker")
+        if self.rows[row_idx].get(self.u_id) != u_id:
+            # A row has been edited outside of the ModelTracker methods
+            self._rebuild_u_id_index()
+            return self.get_cur_row_index(u_id=u_id)
+        return row_idx
+
+    def invalidate_cache(self):
+        """Rebuilds the u_id and metric indexes and invalidates the cached 
+        dataframe. Only required after values in self.rows have been edited 
+        directly rather than via the ModelTracker methods.
+        """
+        self._rebuild_u_id_index()
+
+    def create_metric_index(self, column:str):
+        """Creates a sorted index over the numeric values of column. The index 
+        is kept up to date as rows are added or updated and is used by 
+        self.query and self.top_k to avoid scanning and sorting every row.
+
+        Args:
+            column (str): The column to index i.e. a metric such as 
+            "test_accuracy"
+        """
+        if column not in self._metric_indexes:
+            self._metric_indexes[column] = SortedMetricIndex(column)
+
+    def drop_metric_index(self, column:str):
+        self._metric_indexes.pop(column, None)
+
+    def create_hash_index(self, column:str):
+        """Creates a hash index over the values of column. The index is kept 
+        up to date as rows are added or updated and is used by self.find_rows 
+        and by self.query for equality predicates.
+
+        Args:
+            column (str): The column to index i.e. an identifier such as 
+            "config_fingerprint"
+        """
+        if column not in self._hash_indexes:
+            self._hash_indexes[column] = HashIndex(column)
+
+    def drop_hash_index(self, column:str):
+        self._hash_indexes.pop(column, None)
+
+    def _get_hash_index(self, column:str) -> HashIndex:
+        """Returns the hash index over column, rebuilding it if it is stale, 
+        or None if column does not have a hash index
+        """
+        self._get_u_id_index()
+        index = self._hash_indexes.get(column)
+        if index is not None and index.stale:
+            index.build(self.rows)
+        return index
 
-    def tracker_to_pandas_df(self)->pd.DataFrame:
+    def find_rows(self, column:str, value:Any) -> List[Dict[str,Any]]:
+        """Returns the rows with a value of column equal to value. A hash index 
+        is created for column if one does not exist, such that repeated 
+        lookups do not scan the rows.
+
+        Args:
+            column (str): Column to match
+            value (Any): Value to match
+
+        Returns:
+            List[Dict[str,Any]]: The matching rows in tracker order
+        """
+        self.create_hash_index(column)
+        return [self.rows[idx] for idx in self._get_hash_index(column).get(value)]
+
+    def _get_metric_index(self, column:str) -> SortedMetricIndex:
+        """Returns the index over column, rebuilding it if it is stale, or 
+        None if column is not indexed
+        """
+        self._get_u_id_index()
+        index = self._metric_indexes.get(column)
+        if index is not None and index.stale:
+            index.build(self.rows)
+        return index
+
+    @staticmethod
+    def _match(val:Any, op:str, target:Any) -> bool:
+        try:
+            if op == "==":
+                return val == target
+            if op == "!=":
+                return val != target
+            if op == "in":
+                return val in target
+            if op == "not in":
+                return val not in target
+            if val is None:
+                return False
+            if op == ">":
+                return val > target
+            if op == ">=":
+                return val >= target
+            if op == "<":
+                return val < target
+            if op == "<=":
+                return val <= target
+        except TypeError:
+            return False
+        raise ValueError("Unsupported operator {}".format(op))
+
+    def _index_candidates(self, where:List[tuple]) -> List[int]:
+        """Returns the row positions satisfying the first range predicate in 
+        where on an indexed column, or None if no such predicate exists
+        """
+        for pred in where:
+            if callable(pred):
+                continue
+            col, op, target = pred
+            if op == "==" and is_hashable_value(target):
+                hash_index = self._get_hash_index(col)
+                if hash_index is not None:
+                    return hash_index.get(target)
+            if op not in ["==", ">", ">=", "<", "<="]:
+                continue
+            if not is_indexable_metric(target):
+                continue
+            index = self._get_metric_index(col)
+            if index is None:
+                continue
+            if op == "==":
+                return index.range(lower=target, upper=target)
+            if op in [">", ">="]:
+                return index.range(lower=target, lower_inclusive=op == ">=")
+            return index.range(upper=target, upper_inclusive=op == "<=")
+        return None
+
+    def query(self, where:List[Any]=[], order_by:str=None, 
+              ascending:bool=True, limit:int=None, 
+              columns:List[str]=None) -> List[Dict[str,Any]]:
+        """Filters, sorts and limits the rows of the tracker without building 
+        a dataframe. Range predicates on columns with a metric index (see 
+        self.create_metric_index) are answered via the index and ordering by 
+        an indexed column walks the index rather than sorting.
+
+        Args:
+            where (List[Any], optional): Predicates all of which must hold. 
+            Each is either a tuple (column, op, value) with op one of ==, !=, 
+            >, >=, <, <=, in, not in, or a callable taking a row and returning 
+            a bool. Defaults to [].
+            order_by (str, optional): Column to sort by. Rows missing a value 
+            for the column are returned last. Defaults to None.
+            ascending (bool, optional): Sort order. Defaults to True.
+            limit (int, optional): Maximum number of rows returned. Defaults 
+            to None.
+            columns (List[str], optional): Columns to return. If None, all 
+            columns are returned. Defaults to None.
+
+        Returns:
+            List[Dict[str,Any]]: Copies of the matching rows
+        """
+        self._get_u_id_index()
+
+        def matches(row):
+            for pred in where:
+                if callable(pred):
+                    if not pred(row):
+                        return False
+                elif not self._match(row.get(pred[0]), pred[1], pred[2]):
+                    return False
+            return True
+
+        candidates = self._index_candidates(where)
+        if candidates is None:
+            candidates = range(len(self.rows))
+        order_index = None
+        if order_by is not None:
+            order_index = self._get_metric_index(order_by)
+        if order_index is not None:
+            candidate_set = None
+            if not isinstance(candidates, range):
+                candidate_set = set(candidates)
+            res_idxs = []
+            for idx in order_index.ordered(ascending=ascending):
+                if limit is not None and len(res_idxs) >= limit:
+                    break
+                if candidate_set is not None and idx not in candidate_set:
+                    continue
+                if matches(self.rows[idx]):
+                    res_idxs.append(idx)
+            if limit is None or len(res_idxs) < limit:
+                # Rows without a numeric value for order_by are not indexed
+                indexed = set(order_index.row_idxs)
+                for idx in candidates:
+                    if limit is not None and len(res_idxs) >= limit:
+                        break
+                    if idx not in indexed and matches(self.rows[idx]):
+                        res_idxs.append(idx)
+        else:
+            res_idxs = [idx for idx in candidates if matches(self.rows[idx])]
+            if order_by is not None:
+                present = [idx for idx in res_idxs 
+                           if self.rows[idx].get(order_by) is not None]
+                missing = [idx for idx in res_idxs 
+                           if self.rows[idx].get(order_by) is None]
+                present.sort(key=lambda idx: self.rows[idx][order_by], 
+                             reverse=not ascending)
+                res_idxs = present + missing
+            if limit is not None:
+                res_idxs = res_idxs[:limit]
+        if columns is None:
+            return [dict(self.rows[idx]) for idx in res_idxs]
+        return [{col: self.rows[idx].get(col) for col in columns} 
+                for idx in res_idxs]
+
+    def top_k(self, metric:str, k:int=10, largest:bool=True, 
+              where:List[Any]=[], columns:List[str]=None) -> List[Dict[str,Any]]:
+        """Returns the k rows with the largest (or smallest) values of metric. 
+        A metric index is created for metric if one does not exist.
+
+        Args:
+            metric (str): Column to rank by
+            k (int, optional): Number of rows to return. Defaults to 10.
+            largest (bool, optional): If True, the largest values are returned, 
+            otherwise the smallest. Defaults to True.
+            where (List[Any], optional): Predicates, see self.query. Defaults 
+            to [].
+            columns (List[str], optional): Columns to return. Defaults to None.
+
+        Returns:
+            List[Dict[str,Any]]: Copies of the top rows in rank order
+        """
+        self.create_metric_index(metric)
+        where = list(where) + [
+            lambda row: is_indexable_metric(row.get(metric))]
+        return self.query(where=where, order_by=metric, ascending=not largest, 
+                          limit=k, columns=columns)
+
+    def group_by(self, column:str, metric:str=None, 
+                 agg:str="count") -> Dict[Any,Any]:
+        """Aggregates metric over the rows sharing a value of column without 
+        building a dataframe
+
+        Args:
+            column (str): Column to group by
+            metric (str, optional): Column to aggregate. Not required for 
+            "count". Defaults to None.
+            agg (str, optional): One of count, sum, mean, min, max or last. 
+            Missing and non-numeric values of metric are ignored by all but 
+            count and last. Defaults to "count".
+
+        Returns:
+            Dict[Any,Any]: Mapping of {column value: aggregate}
+        """
+        if agg not in ["count", "sum", "mean", "min", "max", "last"]:
+            raise ValueError("Unsupported aggregation {}".format(agg))
+        groups = {}
+        for row in self.rows:
+            key = row.get(column)
+            if agg == "count":
+                groups[key] = groups.get(key, 0) + 1
+                continue
+            val = row.get(metric)
+            if agg == "last":
+                groups[key] = val
+                continue
+            if not is_indexable_metric(val):
+                groups.setdefault(key, None if agg != "mean" else (0, 0))
+                continue
+            cur = groups.get(key)
+            if agg == "mean":
+                total, cnt = cur if cur is not None else (0, 0)
+                groups[key] = (total + val, cnt + 1)
+            elif cur is None:
+                groups[key] = val
+            elif agg == "sum":
+                groups[key] = cur + val
+            elif agg == "min":
+                groups[key] = min(cur, val)
+            else:
+                groups[key] = max(cur, val)
+        if agg == "mean":
+            groups = {key: (total / cnt if cnt > 0 else None) 
+                      for key, (total, cnt) in groups.items()}
+        return groups
+
+    def tracker_to_pandas_df(self)->"pd.DataFrame":
         """Converts the values stored in self.rows and returns in the form of a 
-        dataframe
+        dataframe. The dataframe is cached until self is next changed via the 
+        ModelTracker methods, a copy of the cached dataframe is returned. If 
+        values in self.rows are edited directly, call self.invalidate_cache.
 
         Returns:
             pd.DataFrame: Dataframe containing the values in self.rows
         """
-        dict_df = pd.DataFrame.from_dict(self.rows)
-        return dict_df
+        cache_key = (self._version, id(self.rows), len(self.rows))
+        if self._df_cache is None or self._df_cache_key != cache_key:
+            if isinstance(self.rows, CompactRowStore):
+                self._df_cache = self.rows.to_pandas_df()
+            else:
+                self._df_cache = pd.DataFrame.from_dict(self.rows)
+            self._df_cache_key = cache_key
+        return self._df_cache.copy()
     
     
 
-    def tracker_to_csv(self, csv_dir:str, **kwargs):
+    # Approximate ratio between the in memory size of a row and the length of 
+    # its json serialisation, used to convert memory budgets to chunk sizes
+    _ROW_MEMORY_FACTOR = 4
+    # Rows of a csv read to size the chunks of a streaming import
+    _CSV_SAMPLE_ROWS = 20
+
+    def _rows_per_chunk(self, memory_budget_mb:float, 
+                        sample_size:int=1000) -> int:
+        """Estimates the number of rows of self.rows which can be converted at 
+        once whilst remaining within memory_budget_mb, based on a sample of 
+        rows
+        """
+        sample = self.rows[:sample_size]
+        if len(sample) == 0:
+            return 1
+        sample_bytes = sum(len(json.dumps(rw, default=self._jsonl_default)) 
+                           for rw in sample)
+        bytes_per_row = self._ROW_MEMORY_FACTOR * sample_bytes / len(sample)
+        return max(1, int(memory_budget_mb * 1024**2 // bytes_per_row))
+
+    def tracker_to_csv(self, csv_dir:str, memory_budget_mb:float=None, 
+                       **kwargs):
         """Saves the tracker i.e. values in self.rows as a csv. This is performed 
         via pandas. kwargs should contain options defined in 
         pd.DataFrame.to_csv()
@@ -130,11 +687,30 @@ class ModelTracker:
 
         Args:
             csv_dir (str): File location of where to save the output csv
+            memory_budget_mb (float, optional): If provided, the csv is 
+            written in chunks of rows sized to fit within the budget, with 
+            columns in the order of self.column_names, rather than converting 
+            the whole tracker to a dataframe. Defaults to None.
         """
-        dict_df = self.tracker_to_pandas_df()
-        dict_df.to_csv(csv_dir, **kwargs)
+        if memory_budget_mb is None:
+            dict_df = self.tracker_to_pandas_df()
+            dict_df.to_csv(csv_dir, **kwargs)
+            return
+        chunk_size = self._rows_per_chunk(memory_budget_mb)
+        kwargs = {**kwargs}
+        header = kwargs.pop("header", True)
+        for strt in range(0, max(len(self.rows), 1), chunk_size):
+            chunk_df = pd.DataFrame.from_dict(
+                self.rows[strt:strt+chunk_size]).reindex(
+                    columns=self.column_names)
+            # Continues the index of the previous chunk, as written without a 
+            # budget
+            chunk_df.index = range(strt, strt + len(chunk_df))
+            chunk_df.to_csv(csv_dir, mode="w" if strt == 0 else "a", 
+                            header=header if strt == 0 else False, **kwargs)
 
-    def import_existing_pandas_df_tracker(self, exstng_track_df:pd.DataFrame, **kwargs):
+    def import_existing_pandas_df_tracker(self, exstng_track_df:"pd.DataFrame", 
+                                          bulk:bool=True, **kwargs):
         """Takes as an input a dataframe representing and model tracker and 
         updates self with values from the dataframe. kwargs should refer to 
         updating options defined in self.update_tracker_w_dict
@@ -143,12 +719,22 @@ class ModelTracker:
         Args:
             exstng_track_df (pd.DataFrame): Pandas dataframe representing a 
             model tracker
+            bulk (bool, optional): If True, the column names of the dataframe 
+            are checked once and all rows are added in a single pass via 
+            self.update_tracker_w_dicts. If False, self.update_tracker_w_dict 
+            is called for each row. Defaults to True.
         """
         exstng_track_dict = exstng_track_df.to_dict("records")
-        for row in exstng_track_dict:
-            self.update_tracker_w_dict(row, **kwargs)
+        if bulk:
+            self.update_tracker_w_dicts(
+                exstng_track_dict, col_names=list(exstng_track_df.columns), 
+                **kwargs)
+        else:
+            for row in exstng_track_dict:
+                self.update_tracker_w_dict(row, **kwargs)
 
-    def import_existing_csv_tracker(self, existing_tracker_path:str, imprt_kwargs:dict = {}, rd_csv_kwargs:dict = {}):
+    def import_existing_csv_tracker(self, existing_tracker_path:str, imprt_kwargs:dict = {}, rd_csv_kwargs:dict = {}, 
+                                    memory_budget_mb:float=None):
         """Takes as an input a csv representing and model tracker and updates 
         self with values from the csv. This is performed via pandas. 
 
@@ -158,14 +744,51 @@ class ModelTracker:
             self.import_existing_pandas_df_tracker. Defaults to {}.
             rd_csv_kwargs (dict): kwargs to provide to pd.read_csv. 
             Defaults to {}.
+            memory_budget_mb (float, optional): If provided, the csv is read in 
+            chunks sized, from a sample of its first rows, such that the 
+            memory used by the import (beyond the rows added to self) remains 
+            within the budget. Columns holding strings in the sample are read 
+            as strings in every chunk, as they would be without a budget. A 
+            column which is numeric in the sample but holds strings later in 
+            the file is however only read as strings in the chunks containing 
+            them, whereas the non streaming import reads the whole column as 
+            strings; pass the column's dtype via rd_csv_kwargs if this 
+            matters. Defaults to None.
         """
-        exstng_track_df = pd.read_csv(existing_tracker_path, **rd_csv_kwargs)
-        self.import_existing_pandas_df_tracker(exstng_track_df, **imprt_kwargs)
+        if memory_budget_mb is None:
+            exstng_track_df = pd.read_csv(existing_tracker_path, **rd_csv_kwargs)
+            self.import_existing_pandas_df_tracker(exstng_track_df, **imprt_kwargs)
+            return
+        rd_csv_kwargs = {**rd_csv_kwargs}
+        sample_df = pd.read_csv(existing_tracker_path, 
+                                nrows=self._CSV_SAMPLE_ROWS, **rd_csv_kwargs)
+        if len(sample_df) == 0:
+            self.import_existing_pandas_df_tracker(sample_df, **imprt_kwargs)
+            return
+        # The dataframe and the records created from it are held at once
+        bytes_per_row = self._ROW_MEMORY_FACTOR * max(
+            sample_df.memory_usage(deep=True).sum(), 1) / len(sample_df)
+        chunk_size = max(1, int(memory_budget_mb * 1024**2 // bytes_per_row))
+        # Dtypes are inferred once rather than per chunk, such that a string 
+        # column is not read as numbers in chunks where its values look numeric
+        dtype = {col: col_dtype for col, col_dtype in sample_df.dtypes.items() 
+                 if pd.api.types.is_string_dtype(col_dtype)}
+        if isinstance(rd_csv_kwargs.get("dtype"), dict):
+            dtype.update(rd_csv_kwargs.pop("dtype"))
+        elif "dtype" in rd_csv_kwargs:
+            dtype = rd_csv_kwargs.pop("dtype")
+        del sample_df
+        with pd.read_csv(existing_tracker_path, chunksize=chunk_size, 
+                         dtype=dtype, **rd_csv_kwargs) as reader:
+            for chunk_df in reader:
+                self.import_existing_pandas_df_tracker(chunk_df, **imprt_kwargs)
+                del chunk_df
 
     def update_existing_csv_tracker(self, existing_tracker_path:str, 
                                     imprt_kwargs:dict = {}, 
                                     rd_csv_kwargs:dict = {}, 
-                                    wrt_csv_kwargs:dict = {}):
+                                    wrt_csv_kwargs:dict = {}, 
+                                    concurrency_safe:bool = False):
         """Imports a csv file representing a model tracker, updates it with the 
         observations captured in self and re-writes the csv
 
@@ -177,17 +800,32 @@ class ModelTracker:
             Defaults to {}.
             wrt_csv_kwargs (dict, optional): kwargs to provide to 
             pd.DataFrame.to_csv. Defaults to {}.
+            concurrency_safe (bool, optional): If True, the import and re-write 
+            are performed whilst holding a lock on the tracker (see 
+            TrackerLock.tracker_file_lock) and the csv is written to a 
+            temporary file which then replaces the tracker. Defaults to False.
         """
-        self.import_existing_csv_tracker(
-            existing_tracker_path=existing_tracker_path, 
-            imprt_kwargs=imprt_kwargs, rd_csv_kwargs=rd_csv_kwargs)
-        self.tracker_to_csv(existing_tracker_path, index=False, 
-                            **wrt_csv_kwargs)
+        if concurrency_safe:
+            with tracker_file_lock(existing_tracker_path):
+                self.import_existing_csv_tracker(
+                    existing_tracker_path=existing_tracker_path, 
+                    imprt_kwargs=imprt_kwargs, rd_csv_kwargs=rd_csv_kwargs)
+                with atomic_write_path(existing_tracker_path) as tmp_dir:
+                    self.tracker_to_csv(tmp_dir, index=False, 
+                                        **wrt_csv_kwargs)
+        else:
+            self.import_existing_csv_tracker(
+                existing_tracker_path=existing_tracker_path, 
+                imprt_kwargs=imprt_kwargs, rd_csv_kwargs=rd_csv_kwargs)
+            self.tracker_to_csv(existing_tracker_path, index=False, 
+                                **wrt_csv_kwargs)
 
     def tracker_to_json(self, json_dir:str, **kwargs):
         """Saves the tracker i.e. values in self.rows as a json. This is 
         performed via pandas. kwargs should contain options defined in 
-        pd.DataFrame.to_json()
+        pd.DataFrame.to_json(). Very large trackers should use 
+        TrackerType("jsonl"), which is written and read in chunks, rather 
+        than converting the whole tracker to a dataframe.
 
         Args:
             json_dir (str): File location of where to save the output json
@@ -195,9 +833,71 @@ class ModelTracker:
         dict_df = self.tracker_to_pandas_df()
         dict_df.to_json(json_dir, **kwargs)
 
+    def _write_jsonl_chunks(self, jsonl_dir:str, rows:List[Dict[str,Any]], 
+                            chunk_size:int=10000):
+        with open(jsonl_dir, "w") as f:
+            for strt in range(0, len(rows), chunk_size):
+                f.write(self._rows_to_jsonl(rows[strt:strt+chunk_size]))
+
+    def _iter_jsonl_chunks(self, existing_tracker_path:str, 
+                           chunk_bytes:int) -> Iterator[List[Dict[str,Any]]]:
+        """Yields the rows of a line delimited json file in chunks of at most 
+        roughly chunk_bytes of json
+        """
+        chunk = []
+        n_bytes = 0
+        with open(existing_tracker_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk.append(json.loads(line))
+                n_bytes += len(line)
+                if n_bytes >= chunk_bytes:
+                    yield chunk
+                    chunk = []
+                    n_bytes = 0
+        if len(chunk) > 0:
+            yield chunk
+
+    @staticmethod
+    def _check_line_delimited_json(existing_tracker_path:str, 
+                                   max_line_chars:int):
+        """Raises a ValueError if the first line of existing_tracker_path is 
+        not a single json record of at most max_line_chars characters. 
+        pd.DataFrame.to_json writes the whole tracker as one json value on a 
+        single line unless lines=True, therefore the check is made before 
+        any line is parsed in full.
+        """
+        with open(existing_tracker_path, "r") as f:
+            line = ""
+            while line == "":
+                line = f.readline(max_line_chars + 1)
+                if line == "":
+                    # End of file
+                    return
+                line = line.strip()
+        msg = ("{} is not line delimited json records, which is required "
+               "with memory_budget_mb. Convert it via "
+               "convert_json_tracker_to_jsonl or import it without "
+               "memory_budget_mb").format(existing_tracker_path)
+        if len(line) > max_line_chars:
+            raise ValueError(
+                "{}, or a row exceeds the memory budget".format(msg))
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError(msg)
+        # The orients of pd.DataFrame.to_json other than records hold a 
+        # dict or list per column, index label or key of the split
+        if not isinstance(row, dict) or (len(row) > 0 and all(
+            isinstance(val, (dict, list)) for val in row.values())):
+            raise ValueError(msg)
+
     def import_existing_json_tracker(self, existing_tracker_path:str, 
                                      imprt_kwargs:dict = {}, 
-                                     rd_json_kwargs:dict = {}):
+                                     rd_json_kwargs:dict = {}, 
+                                     memory_budget_mb:float=None):
         """Takes as an input a json representing and model tracker and updates 
         self with values from the json. This is performed via pandas.
 
@@ -207,13 +907,73 @@ class ModelTracker:
             self.import_existing_pandas_df_tracker. Defaults to {}.
             rd_json_kwargs (dict, optional): kwargs to provide to pd.read_json. 
             Defaults to {}.
+            memory_budget_mb (float, optional): If provided, the json must be 
+            line delimited records i.e. a json lines tracker or written by 
+            pd.DataFrame.to_json(orient="records", lines=True) and is read, 
+            without pandas, in chunks sized such that the memory used by the 
+            import (beyond the rows added to self) remains within the budget. 
+            A ValueError is raised if the json is not line delimited i.e. 
+            written by self.tracker_to_json with the default options; convert 
+            it once via self.convert_json_tracker_to_jsonl. rd_json_kwargs is 
+            ignored and imprt_kwargs are provided to 
+            self.update_tracker_w_dicts. Defaults to None.
+        """
+        if memory_budget_mb is None:
+            exstng_track_df = pd.read_json(existing_tracker_path, **rd_json_kwargs)
+            self.import_existing_pandas_df_tracker(exstng_track_df, **imprt_kwargs)
+            return
+        imprt_kwargs = {k: v for k, v in imprt_kwargs.items() if k != "bulk"}
+        chunk_bytes = max(1, int(
+            memory_budget_mb * 1024**2 // self._ROW_MEMORY_FACTOR))
+        self._check_line_delimited_json(existing_tracker_path, chunk_bytes)
+        was_empty = len(self.column_names) == 0
+        seen_cols = []
+        for chunk_idx, chunk in enumerate(self._iter_jsonl_chunks(
+            existing_tracker_path, chunk_bytes)):
+            # Checked against the columns of every chunk read so far, as the 
+            # non streaming import checks the columns of the whole file
+            seen_cols = list(dict.fromkeys(
+                seen_cols + [col for rw in chunk for col in rw.keys()]))
+            if chunk_idx > 0 and was_empty:
+                exstng_cols = set(self.column_names)
+                self.column_names += [
+                    col for col in seen_cols if col not in exstng_cols]
+            self.update_tracker_w_dicts(chunk, col_names=seen_cols, 
+                                        **imprt_kwargs)
+
+    def convert_json_tracker_to_jsonl(self, existing_tracker_path:str, 
+                                      jsonl_dir:str, 
+                                      rd_json_kwargs:dict = {}, 
+                                      chunk_size:int=10000):
+        """Converts a json tracker i.e. written by self.tracker_to_json to a 
+        json lines tracker, which can then be imported in chunks via 
+        TrackerType("jsonl") or memory_budget_mb. The orients written by 
+        pd.DataFrame.to_json, other than line delimited records, store the 
+        values of a row apart from each other therefore the json is read 
+        once in full via pandas. The rows are then written in chunks without 
+        being added to self. The json lines file is written to a temporary 
+        location and then moved into place.
+
+        Args:
+            existing_tracker_path (str): File location of the json tracker
+            jsonl_dir (str): File location of where to save the output json 
+            lines file
+            rd_json_kwargs (dict, optional): kwargs to provide to pd.read_json. 
+            Defaults to {}.
+            chunk_size (int, optional): Number of rows converted from the 
+            dataframe at once. Defaults to 10000.
         """
         exstng_track_df = pd.read_json(existing_tracker_path, **rd_json_kwargs)
-        self.import_existing_pandas_df_tracker(exstng_track_df, **imprt_kwargs)
+        with atomic_write_path(jsonl_dir) as tmp_dir:
+            with open(tmp_dir, "w") as f:
+                for strt in range(0, len(exstng_track_df), chunk_size):
+                    f.write(self._rows_to_jsonl(exstng_track_df.iloc[
+                        strt:strt+chunk_size].to_dict("records")))
 
     def update_existing_json_tracker(self, existing_tracker_path: str, 
                                      imprt_kwargs: dict = {},
-    rd_json_kwargs:dict = {}, wrt_json_kwargs: dict = {}):
+    rd_json_kwargs:dict = {}, wrt_json_kwargs: dict = {}, 
+    concurrency_safe:bool = False):
         """Imports a json file representing a model tracker, updates it with the 
         observations captured in self and re-writes the json
 
@@ -225,21 +985,589 @@ class ModelTracker:
             Defaults to {}.
             wrt_json_kwargs (dict, optional): kwargs to provide to 
             pd.DataFrame.to_json. Defaults to {}.
+            concurrency_safe (bool, optional): If True, the import and re-write 
+            are performed whilst holding a lock on the tracker (see 
+            TrackerLock.tracker_file_lock) and the json is written to a 
+            temporary file which then replaces the tracker. Defaults to False.
+        """
+        if concurrency_safe:
+            with tracker_file_lock(existing_tracker_path):
+                self.import_existing_json_tracker(
+                    existing_tracker_path=existing_tracker_path, 
+                    imprt_kwargs=imprt_kwargs, rd_json_kwargs=rd_json_kwargs)
+                with atomic_write_path(existing_tracker_path) as tmp_dir:
+                    self.tracker_to_json(tmp_dir, **wrt_json_kwargs)
+        else:
+            self.import_existing_json_tracker(
+                existing_tracker_path=existing_tracker_path, 
+                imprt_kwargs=imprt_kwargs, rd_json_kwargs=rd_json_kwargs)
+            self.tracker_to_json(existing_tracker_path, **wrt_json_kwargs)
+
+    @staticmethod
+    def _jsonl_default(obj:Any) -> Any:
+        """Fallback serialiser for values json cannot serialise natively i.e. 
+        numpy scalars, timestamps and the row views of a CompactRowStore
+        """
+        if isinstance(obj, Mapping):
+            return dict(obj)
+        if hasattr(obj, "item"):
+            return obj.item()
+        if hasattr(obj, "isoformat"):
+            return obj.isoformat()
+        return str(obj)
+
+    def _read_jsonl_rows(self, existing_tracker_path:str) -> List[Dict[str,Any]]:
+        """Reads the rows of a json lines tracker resolving rows which share a 
+        u_id such that the last line written wins. Rows keep the position of 
+        the first line written for their u_id.
+
+        Args:
+            existing_tracker_path (str): File location of the json lines tracker
+
+        Returns:
+            List[Dict[str,Any]]: The current rows of the tracker
+        """
+        latest_rows = {}
+        unkeyed_rows = []
+        with open(existing_tracker_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                val = row.get(self.u_id)
+                if val is None:
+                    unkeyed_rows.append(row)
+                else:
+                    latest_rows[val] = row
+        return list(latest_rows.values()) + unkeyed_rows
+
+    def _rows_to_jsonl(self, rows:List[Dict[str,Any]]) -> str:
+        return "".join(
+            json.dumps(row, default=self._jsonl_default) + "\n" for row in rows)
+
+    def tracker_to_jsonl(self, jsonl_dir:str):
+        """Saves the tracker i.e. values in self.rows as a json lines file with 
+        one row per line. The file is written to a temporary location and 
+        then moved into place such that readers never observe a partially 
+        written tracker.
+
+        Args:
+            jsonl_dir (str): File location of where to save the output json 
+            lines file
+        """
+        # A unique temporary file per writer, such that concurrent writers 
+        # never replace the tracker with each other's partial file
+        with atomic_write_path(jsonl_dir) as tmp_dir:
+            self._write_jsonl_chunks(tmp_dir, self.rows)
+
+    def append_rows_to_jsonl(self, jsonl_dir:str, 
+                             rows:List[Dict[str,Any]]):
+        """Appends rows to a json lines tracker without reading or rewriting 
+        the existing lines. An updated row should be appended in full as, 
+        when read, the last line written for a u_id supersedes earlier lines.
+
+        Args:
+            jsonl_dir (str): File location of the json lines tracker
+            rows (List[Dict[str,Any]]): Rows to append
+        """
+        with open(jsonl_dir, "a") as f:
+            f.write(self._rows_to_jsonl(rows))
+
+    def import_existing_jsonl_tracker(self, existing_tracker_path:str, 
+                                      imprt_kwargs:dict = {}):
+        """Takes as an input a json lines file representing a model tracker 
+        and updates self with the latest line for each u_id. This is performed 
+        without pandas.
+
+        Args:
+            existing_tracker_path (str): File location of the json lines tracker
+            imprt_kwargs (dict, optional): kwargs to provide to 
+            self.update_tracker_w_dicts. Defaults to {}.
+        """
+        self.update_tracker_w_dicts(
+            self._read_jsonl_rows(existing_tracker_path), **imprt_kwargs)
+
+    def compact_jsonl_tracker(self, existing_tracker_path:str, 
+                              lock_timeout:float=None) -> int:
+        """Rewrites a json lines tracker keeping only the latest line for each 
+        u_id. self is not updated. The lock of the tracker (see 
+        TrackerLock.tracker_file_lock) is held whilst the tracker is read and 
+        replaced, therefore appends made via 
+        self.concurrent_update_existing_tracker wait for the compaction rather 
+        than being lost. Appends which do not take the lock i.e. 
+        self.write_tracker are not protected.
+
+        Args:
+            existing_tracker_path (str): File location of the json lines tracker
+            lock_timeout (float, optional): Seconds to wait for the lock before 
+            raising TrackerLock.TrackerLockTimeout. If None, waits 
+            indefinitely. Defaults to None.
+
+        Returns:
+            int: The number of superseded lines removed
+        """
+        with tracker_file_lock(existing_tracker_path, timeout=lock_timeout):
+            with open(existing_tracker_path, "r") as f:
+                n_lines = sum(1 for line in f if line.strip())
+            rows = self._read_jsonl_rows(existing_tracker_path)
+            with atomic_write_path(existing_tracker_path) as tmp_dir:
+                with open(tmp_dir, "w") as f:
+                    f.write(self._rows_to_jsonl(rows))
+        n_removed = n_lines - len(rows)
+        logger.info("Compacted {}, removed {} superseded rows".format(
+            existing_tracker_path, n_removed))
+        return n_removed
+
+    def tracker_to_parquet(self, parquet_dir:str, **kwargs):
+        """Saves the tracker i.e. values in self.rows as a parquet file with 
+        columns in the order of self.column_names. This is performed via 
+        pandas and requires pyarrow. kwargs should contain options defined in 
+        pd.DataFrame.to_parquet()
+
+        Args:
+            parquet_dir (str): File location of where to save the output parquet
+        """
+        dict_df = self.tracker_to_pandas_df()
+        dict_df = dict_df.reindex(columns=self.column_names)
+        dict_df.to_parquet(parquet_dir, index=False, **kwargs)
+
+    @staticmethod
+    def read_parquet_tracker(existing_tracker_path:str, columns:List[str]=None, 
+                             filters:List[tuple]=None, 
+                             **kwargs) -> "pd.DataFrame":
+        """Reads a parquet tracker into a dataframe without updating a 
+        ModelTracker. Only the columns in columns are read and filters are 
+        pushed down to the parquet reader, such that row groups which cannot 
+        match are skipped i.e. to find the top runs by a metric:
+            df = ModelTracker.read_parquet_tracker(
+                path, columns=["model_name", "test_accuracy"], 
+                filters=[("test_accuracy", ">", 0.9)])
+            df.nlargest(10, "test_accuracy")
+        kwargs should contain options defined in pd.read_parquet()
+
+        Args:
+            existing_tracker_path (str): File location of the parquet tracker
+            columns (List[str], optional): Columns to read. If None, all 
+            columns are read. Defaults to None.
+            filters (List[tuple], optional): Row filters of the form 
+            [(column, op, value)] as accepted by pyarrow. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The rows and columns read
+        """
+        return pd.read_parquet(existing_tracker_path, columns=columns, 
+                               filters=filters, **kwargs)
+
+    def import_existing_parquet_tracker(self, existing_tracker_path:str, 
+                                        columns:List[str]=None, 
+                                        filters:List[tuple]=None, 
+                                        imprt_kwargs:dict = {}, 
+                                        rd_parquet_kwargs:dict = {}):
+        """Takes as an input a parquet file representing a model tracker and 
+        updates self with values from the parquet. See 
+        self.read_parquet_tracker for the columns and filters options. If 
+        columns is provided, self.u_id is always read. Note that self will 
+        only contain the columns and rows read, therefore a projected or 
+        filtered import should not be written back over the full tracker.
+
+        Args:
+            existing_tracker_path (str): File location of the parquet tracker
+            columns (List[str], optional): Columns to read. If None, all 
+            columns are read. Defaults to None.
+            filters (List[tuple], optional): Row filters of the form 
+            [(column, op, value)]. Defaults to None.
+            imprt_kwargs (dict, optional): kwargs to provide to 
+            self.import_existing_pandas_df_tracker. Defaults to {}.
+            rd_parquet_kwargs (dict, optional): kwargs to provide to 
+            pd.read_parquet. Defaults to {}.
         """
-        self.import_existing_json_tracker(
+        if columns is not None and self.u_id not in columns:
+            columns = [self.u_id] + list(columns)
+        exstng_track_df = self.read_parquet_tracker(
+            existing_tracker_path, columns=columns, filters=filters, 
+            **rd_parquet_kwargs)
+        self.import_existing_pandas_df_tracker(exstng_track_df, **imprt_kwargs)
+
+    def update_existing_parquet_tracker(self, existing_tracker_path:str, 
+                                        imprt_kwargs:dict = {}, 
+                                        rd_parquet_kwargs:dict = {}, 
+                                        wrt_parquet_kwargs:dict = {}):
+        """Imports a parquet file representing a model tracker, updates it 
+        with the observations captured in self and re-writes the parquet
+
+        Args:
+            existing_tracker_path (str): File location of the parquet tracker
+            imprt_kwargs (dict, optional): kwargs to provide to 
+            self.import_existing_pandas_df_tracker. Defaults to {}.
+            rd_parquet_kwargs (dict, optional): kwargs to provide to 
+            pd.read_parquet. Defaults to {}.
+            wrt_parquet_kwargs (dict, optional): kwargs to provide to 
+            pd.DataFrame.to_parquet. Defaults to {}.
+        """
+        self.import_existing_parquet_tracker(
             existing_tracker_path=existing_tracker_path, 
-            imprt_kwargs=imprt_kwargs, rd_json_kwargs=rd_json_kwargs)
-        self.tracker_to_json(existing_tracker_path, **wrt_json_kwargs)
+            imprt_kwargs=imprt_kwargs, rd_parquet_kwargs=rd_parquet_kwargs)
+        self.tracker_to_parquet(existing_tracker_path, **wrt_parquet_kwargs)
+
+    def import_existing_sqlite_tracker(self, existing_tracker_path:str, 
+                                       u_ids:List[Any]=None, 
+                                       table_name:str="model_tracker", 
+                                       imprt_kwargs:dict = {}):
+        """Takes as an input a sqlite database holding a model tracker and 
+        updates self with the rows of the tracker table. The column names of 
+        the table are always imported such that new rows can be checked 
+        against them. This is performed without pandas.
+
+        Args:
+            existing_tracker_path (str): File location of the sqlite database
+            u_ids (List[Any], optional): If provided, only the rows with these 
+            u_id values are imported, via the u_id index. Defaults to None.
+            table_name (str, optional): Name of the table holding the tracker. 
+            Defaults to "model_tracker".
+            imprt_kwargs (dict, optional): kwargs to provide to 
+            self.update_tracker_w_dicts. Defaults to {}.
+        """
+        store = SQLiteTrackerStore(existing_tracker_path, u_id=self.u_id, 
+                                   table_name=table_name)
+        col_names, rows = store.read_rows(u_ids=u_ids)
+        self.update_tracker_w_dicts(rows, col_names=col_names, **imprt_kwargs)
+
+    def upsert_rows_to_sqlite(self, sqlite_dir:str, 
+                              rows:List[Dict[str,Any]]=None, 
+                              table_name:str="model_tracker"):
+        """Upserts rows into a sqlite tracker without reading the rest of the 
+        table. Existing rows sharing a u_id are replaced and columns not 
+        already in the table are added, therefore rows should be checked via 
+        self.update_tracker_w_dict (and force_columns) before being written.
+
+        Args:
+            sqlite_dir (str): File location of the sqlite database
+            rows (List[Dict[str,Any]], optional): Rows to upsert. If None, 
+            every row in self.rows is upserted. Defaults to None.
+            table_name (str, optional): Name of the table holding the tracker. 
+            Defaults to "model_tracker".
+        """
+        if rows is None:
+            rows = self.rows
+        store = SQLiteTrackerStore(sqlite_dir, u_id=self.u_id, 
+                                   table_name=table_name)
+        store.upsert_rows(rows, replace=True)
+
+    def tracker_to_sqlite(self, sqlite_dir:str, 
+                          table_name:str="model_tracker"):
+        """Saves the tracker i.e. values in self.rows to a table of a sqlite 
+        database. Rows already in the table which are not in self.rows are 
+        kept.
+
+        Args:
+            sqlite_dir (str): File location of the sqlite database
+            table_name (str, optional): Name of the table holding the tracker. 
+            Defaults to "model_tracker".
+        """
+        self.upsert_rows_to_sqlite(sqlite_dir=sqlite_dir, 
+                                   table_name=table_name)
+
+    def create_sqlite_index(self, sqlite_dir:str, column:str, 
+                            table_name:str="model_tracker"):
+        """Creates an index on column of a sqlite tracker i.e. a metric column 
+        which is used to rank experiments
+
+        Args:
+            sqlite_dir (str): File location of the sqlite database
+            column (str): Column to index
+            table_name (str, optional): Name of the table holding the tracker. 
+            Defaults to "model_tracker".
+        """
+        store = SQLiteTrackerStore(sqlite_dir, u_id=self.u_id, 
+                                   table_name=table_name)
+        store.create_index(column)
+
+    def import_existing_server_tracker(self, existing_tracker_path:str, 
+                                       u_ids:List[Any]=None, 
+                                       imprt_kwargs:dict = {}):
+        """Takes as an input the address of a TrackerServer and updates self 
+        with the rows of its tracker. The column names of the tracker are 
+        always imported such that new rows can be checked against them. 
+        Requests are sent via the pooled TrackerClient of the process.
+
+        Args:
+            existing_tracker_path (str): Address of the server, either 
+            "unix:<socket path>" or "<host>:<port>"
+            u_ids (List[Any], optional): If provided, only the rows with these 
+            u_id values are imported. Defaults to None.
+            imprt_kwargs (dict, optional): kwargs to provide to 
+            self.update_tracker_w_dicts. Defaults to {}.
+        """
+        col_names, rows = get_client(existing_tracker_path).import_rows(
+            u_ids=u_ids, u_id_column=self.u_id)
+        self.update_tracker_w_dicts(rows, col_names=col_names, **imprt_kwargs)
+
+    def upsert_rows_to_server(self, existing_tracker_path:str, 
+                              rows:List[Dict[str,Any]]=None, 
+                              flush:bool=False):
+        """Sends rows to a TrackerServer, which replaces existing rows sharing 
+        a u_id and writes the rows to its tracker file with its next flush. 
+        Rows should be checked via self.update_tracker_w_dict (and 
+        force_columns) before being sent.
+
+        Args:
+            existing_tracker_path (str): Address of the server
+            rows (List[Dict[str,Any]], optional): Rows to upsert. If None, 
+            every row in self.rows is upserted. Defaults to None.
+            flush (bool, optional): If True, waits for the server to write the 
+            rows to its tracker file. Defaults to False.
+        """
+        if rows is None:
+            rows = self.rows
+        get_client(existing_tracker_path).upsert_rows(
+            [dict(rw) for rw in rows], flush=flush, u_id_column=self.u_id)
+
+    def import_existing_tracker(self, existing_tracker_path:str, 
+                                tracker_type:TrackerType, 
+                                u_ids:List[Any]=None, **kwargs):
+        """Imports an existing tracker using the import method relevant to 
+        tracker_type i.e. self.import_existing_json_tracker for 
+        TrackerType("json"). kwargs are passed to the import method.
+
+        Args:
+            existing_tracker_path (str): File location of the tracker
+            tracker_type (TrackerType): Storage format of the tracker
+            u_ids (List[Any], optional): If provided, formats which support 
+            reading individual rows i.e. TrackerType("sqlite") and 
+            TrackerType("server") only import the rows with these u_id values. Other formats import every row. 
+            Defaults to None.
+        """
+        if tracker_type.tracker_type == "json":
+            self.import_existing_json_tracker(existing_tracker_path, **kwargs)
+        elif tracker_type.tracker_type == "csv":
+            self.import_existing_csv_tracker(existing_tracker_path, **kwargs)
+        elif tracker_type.tracker_type == "jsonl":
+            self.import_existing_jsonl_tracker(existing_tracker_path, **kwargs)
+        elif tracker_type.tracker_type == "sqlite":
+            self.import_existing_sqlite_tracker(
+                existing_tracker_path, u_ids=u_ids, **kwargs)
+        elif tracker_type.tracker_type == "parquet":
+            self.import_existing_parquet_tracker(
+                existing_tracker_path, **kwargs)
+        elif tracker_type.tracker_type == "server":
+            self.import_existing_server_tracker(
+                existing_tracker_path, u_ids=u_ids, **kwargs)
+
+    def write_tracker(self, existing_tracker_path:str, 
+                      tracker_type:TrackerType, 
+                      new_rows:List[Dict[str,Any]]=None):
+        """Writes the tracker using the export method relevant to tracker_type. 
+        Formats which support appending or upserting i.e. TrackerType("jsonl"), 
+        TrackerType("sqlite") and TrackerType("server") only write new_rows where provided, all other 
+        formats rewrite every row in self.rows.
+
+        Args:
+            existing_tracker_path (str): File location of the tracker
+            tracker_type (TrackerType): Storage format of the tracker
+            new_rows (List[Dict[str,Any]], optional): The rows which have been 
+            added or updated since the tracker was imported. If None, every row 
+            is written. Defaults to None.
+        """
+        if tracker_type.tracker_type == "json":
+            self.tracker_to_json(json_dir=existing_tracker_path)
+        elif tracker_type.tracker_type == "csv":
+            self.tracker_to_csv(csv_dir=existing_tracker_path, index=False)
+        elif tracker_type.tracker_type == "jsonl":
+            if new_rows is None:
+                self.tracker_to_jsonl(jsonl_dir=existing_tracker_path)
+            else:
+                self.append_rows_to_jsonl(
+                    jsonl_dir=existing_tracker_path, rows=new_rows)
+        elif tracker_type.tracker_type == "sqlite":
+            self.upsert_rows_to_sqlite(
+                sqlite_dir=existing_tracker_path, rows=new_rows)
+        elif tracker_type.tracker_type == "parquet":
+            self.tracker_to_parquet(parquet_dir=existing_tracker_path)
+        elif tracker_type.tracker_type == "server":
+            self.upsert_rows_to_server(existing_tracker_path, rows=new_rows)
+
+    @staticmethod
+    def _parse_time(val:Any, time_format:str) -> datetime:
+        """Parses a time recorded in the tracker, treating missing or 
+        unparseable times as the earliest possible time
+        """
+        if isinstance(val, datetime):
+            return val
+        try:
+            return datetime.strptime(val, time_format)
+        except (TypeError, ValueError):
+            return datetime.min
+
+    def merge_tracker_files(self, existing_tracker_paths:List[str], 
+                            tracker_type:TrackerType, 
+                            conflict:Union[str,Callable[[dict, dict], dict]]="latest", 
+                            time_column:str="train_time_end", 
+                            time_format:str="%d/%m/%Y %H:%M:%S", 
+                            **kwargs) -> int:
+        """Merges many trackers i.e. those written by separate worker nodes 
+        into self. Each file is imported in turn and its rows are resolved 
+        against the rows already seen via a mapping keyed on self.u_id, such 
+        that the merge is a single pass over the rows and only one file is 
+        held in memory at once besides the merged rows. The union of the 
+        column names of every file is added to self.column_names once and the 
+        merged rows are added with one call to self.replace_rows. Rows without 
+        a u_id are all kept.
+
+        Args:
+            existing_tracker_paths (List[str]): File locations of the trackers
+            tracker_type (TrackerType): Storage format of the trackers
+            conflict (Union[str,Callable[[dict, dict], dict]], optional): How 
+            rows sharing a u_id are resolved, including with rows already in 
+            self. "latest" keeps the row with the latest time_column, with 
+            rows from later files in existing_tracker_paths winning ties. A 
+            callable is passed the current row and the new row and should 
+            return the row to keep. Defaults to "latest".
+            time_column (str, optional): Column compared by "latest". Defaults 
+            to "train_time_end".
+            time_format (str, optional): Format of time_column as written by 
+            ModelExperimentBase.run_experiment. Rows with missing or 
+            unparseable times lose to any row with a time. Defaults to 
+            "%d/%m/%Y %H:%M:%S".
+            kwargs: Passed to the import method relevant to tracker_type
+
+        Returns:
+            int: Number of rows added to or replaced in self
+        """
+        if conflict == "latest":
+            def resolve(cur_row, cur_time, new_row):
+                new_time = self._parse_time(new_row.get(time_column), time_format)
+                if new_time >= cur_time:
+                    return new_row, new_time
+                return cur_row, cur_time
+        elif callable(conflict):
+            def resolve(cur_row, cur_time, new_row):
+                return conflict(cur_row, new_row), None
+        else:
+            raise ValueError("conflict should only be latest or a callable")
+
+        def parse_time(row):
+            if conflict != "latest":
+                return None
+            return self._parse_time(row.get(time_column), time_format)
+
+        # u_id -> (row, parsed time of the row for "latest")
+        merged:Dict[Any,tuple] = {}
+        # Rows of self which are contenders in a conflict
+        self_rows:Dict[Any,Dict[str,Any]] = {}
+        unkeyed_rows = []
+        col_names = list(self.column_names)
+        u_id_idx = self._get_u_id_index()
+        for existing_tracker_path in existing_tracker_paths:
+            node_tracker = ModelTracker(u_id=self.u_id)
+            node_tracker.import_existing_tracker(existing_tracker_path, 
+                                                 tracker_type, **kwargs)
+            col_names += node_tracker.column_names
+            for row in node_tracker.rows:
+                val = row.get(self.u_id)
+                if val is None:
+                    unkeyed_rows.append(row)
+                    continue
+                if val not in merged:
+                    if val not in u_id_idx:
+                        merged[val] = (row, parse_time(row))
+                        continue
+                    self_rows[val] = self.rows[u_id_idx[val]]
+                    merged[val] = (self_rows[val], parse_time(self_rows[val]))
+                merged[val] = resolve(*merged[val], row)
+        # Rows of self which won every conflict are left as they are
+        new_rows = [row for val, (row, _) in merged.items() 
+                    if self_rows.get(val) is not row]
+        self.column_names = list(dict.fromkeys(col_names))
+        self.replace_rows(new_rows + unkeyed_rows, force_columns=True)
+        logger.info("Merged {} trackers, {} rows added or replaced".format(
+            len(existing_tracker_paths), len(new_rows) + len(unkeyed_rows)))
+        return len(new_rows) + len(unkeyed_rows)
+
+    def concurrent_update_existing_tracker(self, existing_tracker_path:str, 
+                                           tracker_type:TrackerType, 
+                                           rows:List[Dict[str,Any]]=None, 
+                                           lock_timeout:float=None, **kwargs):
+        """Writes rows to a tracker which may be updated by many processes at 
+        once. For json and csv trackers:
+        1. rows are spooled to the "<existing_tracker_path>.pending" directory
+        2. a lock is taken on the tracker (see TrackerLock.tracker_file_lock)
+        3. if another process has already written the spooled rows whilst this 
+        process waited for the lock, nothing further is done. Otherwise, the 
+        tracker is re-imported, every spooled row (from any process) replaces 
+        the row with the same u_id, and the tracker is written to a temporary 
+        file which then replaces the tracker.
+        Rows spooled by several processes are therefore written with a single 
+        re-write. Column names of spooled rows are forced into the tracker. 
+        Json lines trackers are appended to whilst holding the lock and sqlite 
+        trackers are upserted, relying on the locking of sqlite. Rows for 
+        TrackerType("server") are sent to the server, which is the only writer 
+        of its tracker file. self is not updated with the rows of other 
+        processes.
+
+        Args:
+            existing_tracker_path (str): File location of the tracker
+            tracker_type (TrackerType): Storage format of the tracker
+            rows (List[Dict[str,Any]], optional): Rows to write. If None, every 
+            row in self.rows is written. Defaults to None.
+            lock_timeout (float, optional): Seconds to wait for the lock before 
+            raising TrackerLock.TrackerLockTimeout. If None, waits 
+            indefinitely. Defaults to None.
+            kwargs: Passed to the import method relevant to tracker_type
+        """
+        if rows is None:
+            rows = self.rows
+        if tracker_type.tracker_type == "sqlite":
+            self.upsert_rows_to_sqlite(sqlite_dir=existing_tracker_path, 
+                                       rows=rows)
+            return
+        if tracker_type.tracker_type == "server":
+            # The server is the only writer of its tracker file
+            self.upsert_rows_to_server(existing_tracker_path, rows=rows)
+            return
+        if tracker_type.tracker_type == "jsonl":
+            with tracker_file_lock(existing_tracker_path, 
+                                   timeout=lock_timeout):
+                self.append_rows_to_jsonl(jsonl_dir=existing_tracker_path, 
+                                          rows=rows)
+            return
+        spool_path = spool_pending_rows(existing_tracker_path, 
+                                        self._rows_to_jsonl(rows))
+        with tracker_file_lock(existing_tracker_path, timeout=lock_timeout):
+            if not os.path.exists(spool_path):
+                logger.info("Rows already written to tracker by another process")
+                return
+            pending_paths = list_pending_rows(existing_tracker_path)
+            merged = ModelTracker(u_id=self.u_id)
+            if self.check_tracker_exists(existing_tracker_path):
+                merged.import_existing_tracker(existing_tracker_path, 
+                                               tracker_type, **kwargs)
+            pending_rows = []
+            for pending_path in pending_paths:
+                pending_rows += merged._read_jsonl_rows(pending_path)
+            merged.replace_rows(pending_rows, force_columns=True)
+            with atomic_write_path(existing_tracker_path) as tmp_dir:
+                merged.write_tracker(tmp_dir, tracker_type)
+            for pending_path in pending_paths:
+                os.remove(pending_path)
+            logger.info("Wrote {} pending rows to tracker in one re-write".format(
+                len(pending_rows)))
 
     @staticmethod
-    def check_tracker_exists(existing_tracker_path: str) -> bool:
-        """Confirms whether a file exists.
+    def check_tracker_exists(existing_tracker_path: str, 
+                             tracker_type:TrackerType=None) -> bool:
+        """Confirms whether a file exists. For TrackerType("server"), the 
+        tracker always exists as the server creates its file if required.
 
         Args:
             existing_tracker_path (str): Location of file to check
+            tracker_type (TrackerType, optional): Storage format of the 
+            tracker. Defaults to None.
 
         Returns:
             bool: Returns True if file exists else returns False
         """
+        if tracker_type is not None and tracker_type.tracker_type == "server":
+            return True
         return os.path.isfile(existing_tracker_path)
 
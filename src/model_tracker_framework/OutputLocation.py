@@ -0,0 +1,92 @@
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+
+logger = logging.getLogger("mtf_logger")
+
+# Name of the directory, within a parent save directory, into which replaced
+# experiment outputs are moved before being deleted
+TRASH_DIR_NM = ".mtf_trash"
+
+
+def _rmtree_logged(path:str):
+    shutil.rmtree(path, ignore_errors=True)
+    if os.path.exists(path):
+        logger.warning("Could not fully remove {}".format(path))
+    else:
+        logger.debug("Removed {}".format(path))
+
+
+def remove_dir_in_background(dir_path:str) -> threading.Thread:
+    """Removes dir_path without waiting on the deletion. dir_path is
+    atomically renamed into the trash directory of its parent, such that its
+    name can be reused immediately, and the renamed directory is deleted by a
+    background thread. The thread is not a daemon, therefore the interpreter
+    waits for outstanding deletions before exiting. Entries left in the trash
+    directory by an interrupted process are deleted by the next call.
+
+    Args:
+        dir_path (str): The directory to remove
+
+    Returns:
+        threading.Thread: The thread performing the deletion or None if there
+        was nothing to delete
+    """
+    dir_path = os.path.abspath(dir_path)
+    trash_dir = os.path.join(os.path.dirname(dir_path), TRASH_DIR_NM)
+    try:
+        stale = [entry.path for entry in os.scandir(trash_dir)]
+    except FileNotFoundError:
+        stale = []
+    trash_path = None
+    # The trash directory is only created when there is a directory to move
+    # into it
+    if os.path.exists(dir_path):
+        os.makedirs(trash_dir, exist_ok=True)
+        trash_path = os.path.join(trash_dir, "{}.{}".format(
+            os.path.basename(dir_path), uuid.uuid4().hex))
+        try:
+            os.rename(dir_path, trash_path)
+        except FileNotFoundError:
+            trash_path = None
+    to_remove = stale + ([trash_path] if trash_path is not None else [])
+    if len(to_remove) == 0:
+        return None
+    thread = threading.Thread(
+        target=lambda: [_rmtree_logged(path) for path in to_remove],
+        name="mtf-remove-{}".format(os.path.basename(dir_path)))
+    thread.start()
+    return thread
+
+
+def make_suffixed_dir(parent_loc:str, dir_nm:str) -> str:
+    """Creates the directory <dir_nm>_<n> in parent_loc where n is one more
+    than the largest suffix already in use. Existing suffixes are found with
+    a single scan of parent_loc and the directory is created with os.mkdir,
+    which fails atomically if the name has been taken in the meantime i.e. by
+    another process, in which case the next suffix is tried.
+
+    Args:
+        parent_loc (str): Directory in which to create the directory
+        dir_nm (str): Name to suffix
+
+    Returns:
+        str: Location of the created directory
+    """
+    pattern = re.compile(r"^{}_(\d+)$".format(re.escape(dir_nm)))
+    sup_dir_idx = 1
+    for entry in os.scandir(parent_loc):
+        match = pattern.match(entry.name)
+        if match is not None:
+            sup_dir_idx = max(sup_dir_idx, int(match.group(1)) + 1)
+    while True:
+        sub_loc_path = os.path.join(parent_loc, "{}_{}".format(
+            dir_nm, sup_dir_idx))
+        try:
+            os.mkdir(sub_loc_path)
+            return sub_loc_path
+        except FileExistsError:
+            sup_dir_idx += 1
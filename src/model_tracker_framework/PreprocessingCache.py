@@ -0,0 +1,220 @@
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import uuid
+from typing import Any, Dict, List
+
+logger = logging.getLogger("mtf_logger")
+
+
+class PreprocessingCache:
+
+    def __init__(self, cache_dir:str, max_size_bytes:int=10*1024**3,
+                 attributes:List[str]=None,
+                 share_across_subclasses:bool=False):
+        """On disk cache of the attributes set by the preprocessing of an
+        experiment. Entries are keyed on the source code of the experiment
+        classes, the values returned by the preprocessing_cache_inputs method
+        of the experiment and the debug flag. Data read by the preprocessing
+        is only part of the key if it is returned by
+        preprocessing_cache_inputs (see self.file_input), therefore a warning
+        is logged when it returns no inputs. Entries are pickled with the
+        highest available protocol and evicted, least recently used first,
+        once the cache exceeds max_size_bytes.
+
+        Args:
+            cache_dir (str): Directory in which to store entries. Created if it
+            does not exist.
+            max_size_bytes (int, optional): Maximum total size of the entries
+            in cache_dir. Defaults to 10GB.
+            attributes (List[str], optional): The attributes to cache. If None,
+            the preprocessing_cache_attributes attribute of the experiment is
+            used if set, otherwise every attribute added or reassigned by the
+            preprocessing is cached. Defaults to None.
+            share_across_subclasses (bool, optional): If False, the source of
+            every class of the experiment inheriting from ModelExperimentBase
+            is part of the key, such that any change to the experiment, i.e.
+            to a helper called by the preprocessing, invalidates its entries.
+            If True, only the source of the class defining
+            preprocessing_steps and its bases is part of the key, such that
+            sibling experiments inheriting the same preprocessing (i.e. from a
+            "ProjectModelExperiment") share an entry. Changes to helpers
+            overridden by the siblings are then not detected. Defaults to
+            False.
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.attributes = attributes
+        self.share_across_subclasses = share_across_subclasses
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def file_input(file_path:str, hash_contents:bool=False) -> tuple:
+        """Returns a value representing a file for use in
+        preprocessing_cache_inputs, such that the cache is invalidated when
+        the file changes
+
+        Args:
+            file_path (str): Location of the file
+            hash_contents (bool, optional): If True, the contents of the file
+            are hashed, otherwise only the size and modification time are
+            used. Defaults to False.
+
+        Returns:
+            tuple: Value representing the current state of the file
+        """
+        stat = os.stat(file_path)
+        if hash_contents:
+            hsh = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024**2), b""):
+                    hsh.update(chunk)
+            return (os.path.abspath(file_path), hsh.hexdigest())
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+    def make_key(self, experiment:Any, debug:bool, extra:Any=None) -> str:
+        """Returns the cache key of the preprocessing of experiment
+
+        Args:
+            experiment (ModelExperimentBase): The experiment to key
+            debug (bool): Whether the preprocessing is run in debug mode
+            extra (Any, optional): Additional picklable value changing the
+            outputs of the preprocessing i.e. the debug subsample
+            parameters. Defaults to None.
+
+        Returns:
+            str: The key or None if the source of the experiment classes
+            cannot be retrieved
+        """
+        hsh = hashlib.sha256()
+        try:
+            for cls in self._key_classes(experiment):
+                hsh.update(inspect.getsource(cls).encode())
+        except (OSError, TypeError):
+            logger.warning(
+                "Could not retrieve experiment source, skipping cache")
+            return None
+        inputs = experiment.preprocessing_cache_inputs()
+        if len(inputs) == 0:
+            logger.warning(
+                "preprocessing_cache_inputs returned no inputs, changes to the data read by the preprocessing will not invalidate the cache")
+        hsh.update(pickle.dumps(
+            (debug, experiment.debug_skips_preprop_steps,
+             sorted(inputs.items()), extra),
+            protocol=4))
+        return hsh.hexdigest()
+
+    def _key_classes(self, experiment:Any) -> List[type]:
+        """Returns the classes of experiment whose source is part of the key
+        """
+        # Imported here as ModelExperimentBase imports this module
+        from .ModelExperimentBase import ModelExperimentBase
+        classes = []
+        for cls in type(experiment).__mro__:
+            if cls is ModelExperimentBase:
+                break
+            classes.append(cls)
+        if self.share_across_subclasses:
+            for idx, cls in enumerate(classes):
+                if "preprocessing_steps" in vars(cls):
+                    return classes[idx:]
+        return classes
+
+    def _entry_path(self, key:str) -> str:
+        return os.path.join(self.cache_dir, "{}.pkl".format(key))
+
+    def snapshot(self, experiment:Any) -> Dict[str,int]:
+        """Returns the identities of the attributes of experiment such that
+        attributes reassigned by the preprocessing can be identified
+        """
+        return {nm: id(val) for nm, val in vars(experiment).items()}
+
+    def _get_attributes(self, experiment:Any,
+                        snapshot:Dict[str,int]) -> List[str]:
+        if self.attributes is not None:
+            return self.attributes
+        exp_attributes = getattr(experiment, "preprocessing_cache_attributes",
+                                 None)
+        if exp_attributes is not None:
+            return exp_attributes
+        return [nm for nm, val in vars(experiment).items()
+                if snapshot.get(nm) != id(val)]
+
+    def load(self, key:str, experiment:Any) -> bool:
+        """Sets the cached attributes on experiment if key is in the cache
+
+        Args:
+            key (str): Key returned by self.make_key
+            experiment (ModelExperimentBase): Experiment to set the attributes
+            on
+
+        Returns:
+            bool: True if the entry existed and was loaded
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except (pickle.UnpicklingError, EOFError):
+            logger.warning("Removing corrupt preprocessing cache entry {}".format(
+                entry_path))
+            os.remove(entry_path)
+            return False
+        for nm, val in cached.items():
+            setattr(experiment, nm, val)
+        # Modification time records the last use for the LRU eviction
+        os.utime(entry_path)
+        return True
+
+    def save(self, key:str, experiment:Any, snapshot:Dict[str,int]):
+        """Writes the attributes set by the preprocessing of experiment to the
+        cache and evicts the least recently used entries if the cache exceeds
+        self.max_size_bytes
+
+        Args:
+            key (str): Key returned by self.make_key
+            experiment (ModelExperimentBase): Experiment which has been
+            preprocessed
+            snapshot (Dict[str,int]): Result of self.snapshot taken before the
+            preprocessing
+        """
+        cached = {nm: getattr(experiment, nm)
+                  for nm in self._get_attributes(experiment, snapshot)}
+        entry_path = self._entry_path(key)
+        tmp_path = "{}.{}.tmp".format(entry_path, uuid.uuid4().hex)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the total size of the
+        cache is at most self.max_size_bytes
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total_size = sum(entry[1] for entry in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                os.remove(entry_path)
+                logger.info("Evicted preprocessing cache entry {}".format(
+                    entry_path))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """Removes every entry from the cache
+        """
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl"):
+                os.remove(entry.path)
@@ -0,0 +1,186 @@
+import logging
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+from .ConfigFingerprint import FINGERPRINT_COLUMN
+
+logger = logging.getLogger("mtf_logger")
+
+
+# Columns looked up by value rather than u_id, which are indexed when they are
+# added to the table such that the lookups do not write to the database
+LOOKUP_COLUMNS = [FINGERPRINT_COLUMN]
+
+
+def _quote(name:str) -> str:
+    return '"{}"'.format(str(name).replace('"', '""'))
+
+
+def _to_sqlite_value(val:Any) -> Any:
+    """Converts values sqlite3 cannot bind natively i.e. numpy scalars and
+    timestamps
+    """
+    if val is None or isinstance(val, (int, float, str, bytes)):
+        return val
+    if hasattr(val, "item"):
+        return val.item()
+    if hasattr(val, "isoformat"):
+        return val.isoformat()
+    return str(val)
+
+
+class SQLiteTrackerStore:
+
+    def __init__(self, sqlite_dir:str, u_id:str="model_name",
+                 table_name:str="model_tracker", timeout:float=30.0):
+        """Storage backend for a ModelTracker held in a table of a sqlite
+        database. Each tracker column is a column of the table, declared
+        without a type such that values keep their python type. The u_id
+        column has a unique index such that single rows can be read and
+        upserted without loading the table. The database is opened in WAL
+        mode such that many processes can read whilst one writes.
+
+        Args:
+            sqlite_dir (str): File location of the sqlite database
+            u_id (str, optional): Column uniquely identifying rows. Defaults to
+            "model_name".
+            table_name (str, optional): Name of the table holding the tracker.
+            Defaults to "model_tracker".
+            timeout (float, optional): Seconds to wait on a locked database
+            before raising. Defaults to 30.0.
+        """
+        self.sqlite_dir = sqlite_dir
+        self.u_id = u_id
+        self.table_name = table_name
+        self.timeout = timeout
+
+    @contextmanager
+    def connect(self):
+        """Opens a connection to the database, creating the tracker table and
+        u_id index if they do not exist. Changes are committed on exit.
+        """
+        conn = sqlite3.connect(self.sqlite_dir, timeout=self.timeout)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS {} ({})".format(
+                _quote(self.table_name), _quote(self.u_id)))
+            self._create_index(conn, self.u_id, unique=True)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _create_index(self, conn:sqlite3.Connection, column:str,
+                      unique:bool=False):
+        conn.execute("CREATE {}INDEX IF NOT EXISTS {} ON {} ({})".format(
+            "UNIQUE " if unique else "",
+            _quote("idx_{}_{}".format(self.table_name, column)),
+            _quote(self.table_name), _quote(column)))
+
+    def get_column_names(self, conn:sqlite3.Connection) -> List[str]:
+        """Returns the columns of the tracker table in table order
+        """
+        return [rw[1] for rw in conn.execute(
+            "PRAGMA table_info({})".format(_quote(self.table_name)))]
+
+    def add_columns(self, conn:sqlite3.Connection, column_names:List[str]):
+        """Adds any of column_names not already in the tracker table. Existing
+        rows hold NULL for the new columns. Columns in LOOKUP_COLUMNS are
+        indexed when added.
+        """
+        exstng_cols = set(self.get_column_names(conn))
+        for col in column_names:
+            if col not in exstng_cols:
+                logger.info("Adding column {} to sqlite tracker".format(col))
+                conn.execute("ALTER TABLE {} ADD COLUMN {}".format(
+                    _quote(self.table_name), _quote(col)))
+                if col in LOOKUP_COLUMNS:
+                    self._create_index(conn, col)
+                exstng_cols.add(col)
+
+    def create_index(self, column:str):
+        """Creates an index on column i.e. a metric column used to rank
+        experiments. The column is added to the table if required.
+        """
+        with self.connect() as conn:
+            self.add_columns(conn, [column])
+            self._create_index(conn, column)
+
+    def read_rows(self, u_ids:List[Any]=None, column:str=None
+                  ) -> Tuple[List[str], List[Dict[str,Any]]]:
+        """Reads rows from the tracker table
+
+        Args:
+            u_ids (List[Any], optional): If provided, only rows with these u_id
+            values are read, via the u_id index. Defaults to None.
+            column (str, optional): If provided, u_ids are matched against
+            column rather than the u_id column, which should be indexed via
+            self.create_index. Rows are not read if the table does not have
+            column. Defaults to None.
+
+        Returns:
+            Tuple[List[str], List[Dict[str,Any]]]: The column names of the table and
+            the rows read
+        """
+        with self.connect() as conn:
+            col_names = self.get_column_names(conn)
+            sql = "SELECT * FROM {}".format(_quote(self.table_name))
+            if u_ids is None:
+                cursor = conn.execute(sql)
+            else:
+                if column is None:
+                    column = self.u_id
+                u_ids = [_to_sqlite_value(val) for val in u_ids]
+                if len(u_ids) == 0 or column not in col_names:
+                    return col_names, []
+                cursor = conn.execute("{} WHERE {} IN ({})".format(
+                    sql, _quote(column), ",".join("?"*len(u_ids))), u_ids)
+            rows = [dict(zip(col_names, rw)) for rw in cursor]
+        return col_names, rows
+
+    def upsert_rows(self, rows:List[Dict[str,Any]], replace:bool=True):
+        """Inserts rows into the tracker table, updating the existing row where
+        the u_id already exists. Columns missing from the table are added.
+
+        Args:
+            rows (List[Dict[str,Any]]): Rows to upsert. Each row requires a
+            u_id value.
+            replace (bool, optional): If True, an existing row is replaced
+            entirely i.e. columns missing from the new row are set to NULL. If
+            False, only the columns in the new row are updated. Defaults to
+            True.
+        """
+        if len(rows) == 0:
+            return
+        with self.connect() as conn:
+            self.add_columns(conn, list(dict.fromkeys(
+                col for rw in rows for col in rw.keys())))
+            tbl_cols = self.get_column_names(conn)
+            # Group rows by their columns such that each group is a single
+            # executemany
+            groups = {}
+            for rw in rows:
+                cols = tuple(tbl_cols) if replace else tuple(rw.keys())
+                groups.setdefault(cols, []).append(
+                    [_to_sqlite_value(rw.get(col)) for col in cols])
+            for cols, values in groups.items():
+                updt_cols = [col for col in cols if col != self.u_id]
+                sql = "INSERT INTO {} ({}) VALUES ({}) ON CONFLICT({}) DO {}".format(
+                    _quote(self.table_name),
+                    ",".join(_quote(col) for col in cols),
+                    ",".join("?"*len(cols)), _quote(self.u_id),
+                    "UPDATE SET {}".format(",".join(
+                        "{0}=excluded.{0}".format(_quote(col))
+                        for col in updt_cols)) if updt_cols else "NOTHING")
+                conn.executemany(sql, values)
+
+    def delete_rows(self, u_ids:List[Any]):
+        """Deletes the rows with the provided u_id values from the tracker
+        table
+        """
+        with self.connect() as conn:
+            conn.executemany("DELETE FROM {} WHERE {} = ?".format(
+                _quote(self.table_name), _quote(self.u_id)),
+                [(_to_sqlite_value(val),) for val in u_ids])
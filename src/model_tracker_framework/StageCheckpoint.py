@@ -0,0 +1,89 @@
+import logging
+import os
+import pickle
+import re
+import uuid
+from typing import Any, Dict
+
+logger = logging.getLogger("mtf_logger")
+
+# Name of the file, within the output directory of an experiment, holding the
+# state of the experiment after its last completed stage
+CHECKPOINT_FILE_NM = ".mtf_checkpoint.pkl"
+# Stages of an experiment which are checkpointed, in the order they run
+CHECKPOINT_STAGES = ["preprocessing", "train_model", "evaluate_model"]
+
+
+def checkpoint_path(sv_dir:str) -> str:
+    return os.path.join(sv_dir, CHECKPOINT_FILE_NM)
+
+
+def save_checkpoint(sv_dir:str, checkpoint:Dict[str,Any]) -> bool:
+    """Pickles checkpoint to the checkpoint file of sv_dir. The file is
+    written to a temporary location and renamed such that the previous
+    checkpoint survives a failed write.
+
+    Args:
+        sv_dir (str): Output directory of the experiment
+        checkpoint (Dict[str,Any]): The checkpoint
+
+    Returns:
+        bool: True if the checkpoint was written, False if it could not be
+        pickled
+    """
+    tmp_path = "{}.{}.tmp".format(checkpoint_path(sv_dir), uuid.uuid4().hex)
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning("Could not checkpoint {} stage: {}".format(
+            checkpoint.get("stage"), e))
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, checkpoint_path(sv_dir))
+    return True
+
+
+def load_checkpoint(sv_dir:str) -> Dict[str,Any]:
+    """Returns the checkpoint of sv_dir or None if there is none
+    """
+    try:
+        with open(checkpoint_path(sv_dir), "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def remove_checkpoint(sv_dir:str):
+    try:
+        os.remove(checkpoint_path(sv_dir))
+    except FileNotFoundError:
+        pass
+
+
+def find_checkpoint_dir(parent_loc:str, dir_nm:str) -> str:
+    """Returns the output directory with the most recent checkpoint out of
+    <dir_nm> and the <dir_nm>_<n> directories created by make_suffixed_dir
+
+    Args:
+        parent_loc (str): Directory containing the output directories
+        dir_nm (str): Name of the output directory i.e. the model_name
+
+    Returns:
+        str: Location of the directory or None if no directory has a
+        checkpoint
+    """
+    pattern = re.compile(r"^{}(_\d+)?$".format(re.escape(dir_nm)))
+    latest = None
+    if not os.path.isdir(parent_loc):
+        return None
+    for entry in os.scandir(parent_loc):
+        if pattern.match(entry.name) is None or not entry.is_dir():
+            continue
+        try:
+            mtime = os.stat(checkpoint_path(entry.path)).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        if latest is None or mtime > latest[0]:
+            latest = (mtime, entry.path)
+    return None if latest is None else latest[1]
@@ -0,0 +1,153 @@
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger("mtf_logger")
+
+# tracemalloc is global to the process, therefore only one stage, of any
+# StageProfiler, can be measured with it at a time
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_stage = None
+
+
+class ProfilerHook:
+    """Interface for receiving the measurements of a StageProfiler i.e. to
+    forward them to an external profiler. Subclasses should override the
+    methods they require.
+    """
+
+    def on_stage_start(self, model_name:str, stage:str):
+        pass
+
+    def on_stage_end(self, model_name:str, stage:str, stats:Dict[str,float]):
+        pass
+
+
+class StageProfiler:
+
+    def __init__(self, memory:str="rss", hooks:Optional[List[ProfilerHook]]=None):
+        """Measures the wall clock duration, CPU time and peak memory of the
+        stages of an experiment. Assign to the stage_profiler attribute of a
+        ModelExperimentBase to profile the tracker_import, preprocessing,
+        train_model, evaluate_model and tracker_write stages of
+        run_experiment. The measurements of every stage other than
+        tracker_write are added to the tracker row as the columns
+        <stage>_duration_s, <stage>_cpu_s and either <stage>_peak_rss_growth_mb
+        or <stage>_peak_mem_mb (see memory). As the row is written during
+        tracker_write, its measurements are only available via self.stats and
+        the hooks.
+        CPU time and resident set size are measured for the whole process,
+        therefore stages running at the same time as other work i.e. other
+        experiments of arun_experiment in the same process, include the CPU
+        time and memory of that work.
+
+        Args:
+            memory (str, optional): How peak memory is measured. "rss" records
+            peak_rss_growth_mb, the increase in the peak resident set size of
+            the process during the stage (via the resource module, unavailable
+            on Windows). The peak only ever grows, therefore a stage using less
+            memory than an earlier stage records 0. "tracemalloc" records
+            peak_mem_mb, the peak memory allocated by python during the stage,
+            which is precise but slows allocation heavy code. As tracemalloc
+            is global to the process, a ValueError is raised if a stage starts
+            whilst another stage is measured with tracemalloc. None disables
+            memory measurement. Defaults to "rss".
+            hooks (List[ProfilerHook], optional): Hooks called at the start and
+            end of each stage. Defaults to None i.e. no hooks.
+        """
+        if memory not in ["rss", "tracemalloc", None]:
+            raise TypeError("memory should only be one of rss, tracemalloc or None")
+        self.memory = memory
+        self.hooks = [] if hooks is None else hooks
+        self.stats:Dict[str,Dict[str,float]] = {}
+
+    @staticmethod
+    def _peak_rss_mb() -> float:
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        if sys.platform == "darwin":
+            return peak / 1024**2
+        return peak / 1024
+
+    @contextmanager
+    def profile(self, stage:str, model_name:str=None):
+        """Context manager measuring the enclosed code as stage
+
+        Args:
+            stage (str): Name of the stage
+            model_name (str, optional): Name of the experiment, passed to the
+            hooks. Defaults to None.
+        """
+        global _tracemalloc_stage
+        started_tracing = False
+        if self.memory == "tracemalloc":
+            with _tracemalloc_lock:
+                if _tracemalloc_stage is not None:
+                    raise ValueError(
+                        "Cannot measure stage {} with tracemalloc whilst stage {} is measured, use memory=\"rss\"".format(
+                            stage, _tracemalloc_stage))
+                _tracemalloc_stage = stage
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        elif self.memory == "rss":
+            rss_strt = self._peak_rss_mb()
+        wall_strt = time.perf_counter()
+        cpu_strt = time.process_time()
+        try:
+            # Called within the try such that tracemalloc is released if a
+            # hook raises
+            for hook in self.hooks:
+                hook.on_stage_start(model_name, stage)
+            yield
+        finally:
+            stats = {"duration_s": time.perf_counter() - wall_strt,
+                     "cpu_s": time.process_time() - cpu_strt}
+            if self.memory == "rss":
+                rss_end = self._peak_rss_mb()
+                stats["peak_rss_growth_mb"] = (
+                    None if rss_end is None else rss_end - rss_strt)
+            elif self.memory == "tracemalloc":
+                stats["peak_mem_mb"] = tracemalloc.get_traced_memory()[1] / 1024**2
+                if started_tracing:
+                    tracemalloc.stop()
+                with _tracemalloc_lock:
+                    _tracemalloc_stage = None
+            self.stats[stage] = stats
+            logger.debug("Stage {} took {:.3f}s".format(
+                stage, stats["duration_s"]))
+            for hook in self.hooks:
+                hook.on_stage_end(model_name, stage, stats)
+
+    def tracker_columns(self, exclude:List[str]=["tracker_write"]) -> dict:
+        """Returns the measurements of the profiled stages as tracker columns. 
+        tracker_write is excluded by default as ModelExperimentBase builds 
+        the row before writing it, therefore the measurements of the write 
+        only reach self.stats and the hooks.
+
+        Args:
+            exclude (List[str], optional): Stages to exclude. Defaults to
+            ["tracker_write"].
+
+        Returns:
+            dict: Measurements of the form {<stage>_<measurement>: value}
+        """
+        return {"{}_{}".format(stage, nm): val
+                for stage, stats in self.stats.items() if stage not in exclude
+                for nm, val in stats.items()}
+
+    def reset(self):
+        self.stats = {}
@@ -1,16 +1,35 @@
 import logging
+import os
+import uuid
+from typing import Dict, List
 
+from .MetricsEngine import MetricsEngine
 from .ModelExperimentBase import ModelExperimentBase
-from .MTFSupporting import ModelExperimentBaseError, ExperimentOption
+from .MTFSupporting import ModelExperimentBaseError, ExperimentOption, LazyModule
+
+np = LazyModule("numpy")
 
 logger = logging.getLogger("mtf_logger")
 
 
 class SupervisedModelExperiment(ModelExperimentBase):
 
+    # Attributes written to disk by self.spill_arrays
+    spill_attributes = ["X_train", "X_test", "y_true_train", "y_true_test",
+                        "y_pred_train", "y_pred_test", "y_score_train",
+                        "y_score_test"]
+
     def __init__(self, model_name, debug_skips_preprop_steps):
         """Exactly the same as ModelExperimentBase but contains additional attributes that may be helpful in a supervised learning  
         context
+        self.spill_to_disk can be set to True such that, once the model has been trained, the numpy arrays in
+        self.spill_attributes are written to .npy files in self.model_sv_loc and replaced with read only memory mapped
+        views of the files (see self.spill_arrays). This lowers the memory used during self.evaluate_model and
+        persists the data and predictions of the run such that they can be reopened with self.load_spilled_arrays
+        without retraining. Defaults to False.
+        self.metrics_engine can be set to a MetricsEngine such that the metrics it declares are computed for the train 
+        and test splits by self.evaluate_metrics, which is the default implementation of self.evaluate_model. 
+        self.y_score_train and self.y_score_test hold the scores of the positive class for score based metrics.
         Args:
             model_name (str): Name of the experiment. If inheriting this class, this variable should not be perminently defined.
             debug_skips_preprop_steps (bool): Defines whether self.preprocessing_debug replaces self.preprocessing_steps or follows it 
@@ -24,6 +43,114 @@ class SupervisedModelExperiment(ModelExperimentBase):
         self.y_true_test = None
         self.y_pred_test = None
         self.X_test = None
+        self.y_score_train = None
+        self.y_score_test = None
+        # Attributes stored by the PreprocessingCache if self.preprocessing_cache is set
+        self.preprocessing_cache_attributes = [
+            "X_train", "X_test", "y_true_train", "y_true_test"]
+        # Each split is subsampled in debug mode when self.debug_budget is set, stratified on its true values
+        self.debug_subsample_groups = {
+            "y_true_train": ["X_train", "y_true_train"],
+            "y_true_test": ["X_test", "y_true_test"]}
+        self.spill_to_disk = False
+        self.metrics_engine:MetricsEngine = None
+
+    @staticmethod
+    def _spill_path(sv_dir:str, attribute:str) -> str:
+        return os.path.join(sv_dir, "{}.npy".format(attribute))
 
+    def spill_arrays(self, attributes:List[str]=None) -> List[str]:
+        """Writes the numpy arrays held in attributes to .npy files in self.model_sv_loc and replaces the attributes
+        with read only memory mapped views of the files. Attributes which are not numpy arrays, hold python objects or
+        are empty are left in memory. Files are written to a temporary location and renamed such that a partially
+        written file is never read.
+
+        Args:
+            attributes (List[str], optional): Attributes to spill. If None, self.spill_attributes is used.
+            Defaults to None.
 
+        Returns:
+            List[str]: The attributes which were spilled
+        """
+        if self.model_sv_loc is None:
+            logger.warning("model_sv_loc is not set, arrays not spilled to disk")
+            return []
+        if attributes is None:
+            attributes = self.spill_attributes
+        spilled = []
+        for attribute in attributes:
+            arr = getattr(self, attribute, None)
+            if (not isinstance(arr, np.ndarray) or arr.dtype.hasobject or
+                arr.size == 0):
+                continue
+            spill_path = self._spill_path(self.model_sv_loc, attribute)
+            if not (isinstance(arr, np.memmap) and arr.filename is not None and
+                    os.path.abspath(arr.filename) == os.path.abspath(spill_path)):
+                tmp_path = "{}.{}.tmp".format(spill_path, uuid.uuid4().hex)
+                with open(tmp_path, "wb") as f:
+                    np.save(f, arr)
+                os.replace(tmp_path, spill_path)
+            # Replacing the attribute releases the in memory array unless it
+            # is referenced elsewhere
+            setattr(self, attribute, np.load(spill_path, mmap_mode="r"))
+            spilled.append(attribute)
+        logger.info("Spilled {} to {}".format(", ".join(spilled), self.model_sv_loc))
+        return spilled
+
+    @classmethod
+    def load_spilled_arrays(cls, model_sv_loc:str, attributes:List[str]=None,
+                            mmap_mode:str="r") -> Dict[str,"np.ndarray"]:
+        """Opens the arrays written by self.spill_arrays for a previous run without loading them into memory
+
+        Args:
+            model_sv_loc (str): The output directory of the run i.e. the output_save_location column of the tracker
+            attributes (List[str], optional): Attributes to open. If None, every attribute in cls.spill_attributes
+            with a file in model_sv_loc is opened. Defaults to None.
+            mmap_mode (str, optional): Passed to np.load. If None, the arrays are read into memory. Defaults to "r".
+
+        Returns:
+            Dict[str,np.ndarray]: Arrays of the form {attribute: array}
+        """
+        if attributes is None:
+            attributes = [attribute for attribute in cls.spill_attributes
+                          if os.path.exists(cls._spill_path(model_sv_loc, attribute))]
+        return {attribute: np.load(cls._spill_path(model_sv_loc, attribute),
+                                   mmap_mode=mmap_mode)
+                for attribute in attributes}
+
+    def post_train(self):
+        super().post_train()
+        if self.spill_to_disk:
+            self.spill_arrays()
+
+    def evaluate_metrics(self, splits:List[str]=["train", "test"]) -> Dict[str,float]:
+        """Computes the metrics of self.metrics_engine for each split with true and predicted values and adds them to 
+        self.results as {split}_{metric} i.e. test_accuracy
+
+        Args:
+            splits (List[str], optional): Splits to evaluate, read from the y_true_{split}, y_pred_{split} and 
+            y_score_{split} attributes. Defaults to ["train", "test"].
+
+        Returns:
+            Dict[str,float]: The metrics added to self.results
+        """
+        if self.metrics_engine is None:
+            raise ModelExperimentBaseError("metrics_engine must be set to evaluate metrics")
+        split_results = {}
+        for split in splits:
+            y_true = getattr(self, "y_true_{}".format(split), None)
+            y_pred = getattr(self, "y_pred_{}".format(split), None)
+            if y_true is None or y_pred is None:
+                logger.info("Skipping metrics for {} split without predictions".format(split))
+                continue
+            metrics = self.metrics_engine.evaluate(
+                y_true, y_pred, y_score=getattr(self, "y_score_{}".format(split), None))
+            split_results.update({"{}_{}".format(split, metric): val 
+                                  for metric, val in metrics.items()})
+        self.results.update(split_results)
+        return split_results
 
+    def evaluate_model(self):
+        if self.metrics_engine is None:
+            return super().evaluate_model()
+        self.evaluate_metrics()
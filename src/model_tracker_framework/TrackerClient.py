@@ -0,0 +1,207 @@
+import json
+import logging
+import socket
+import threading
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger("mtf_logger")
+
+
+class TrackerServerError(Exception):
+    pass
+
+
+def parse_address(address:str) -> Tuple[int, Any]:
+    """Parses the address of a TrackerServer, either "unix:<socket path>" or
+    "<host>:<port>"
+
+    Returns:
+        Tuple[int, Any]: The socket family and the address in the form
+        expected by socket.connect
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, sep, port = address.rpartition(":")
+    if sep == "" or not port.isdigit():
+        raise ValueError(
+            "Tracker server address should be unix:<path> or <host>:<port>, got {}".format(
+                address))
+    return socket.AF_INET, (host or "localhost", int(port))
+
+
+def encode_message(message:Dict[str,Any]) -> bytes:
+    """Encodes a request or response as a line of json. Values json cannot
+    serialise natively i.e. numpy scalars are converted as for json lines
+    trackers
+    """
+    # Imported here as ModelTracker imports this module
+    from .ModelTracker import ModelTracker
+    return (json.dumps(message, default=ModelTracker._jsonl_default) + "\n"
+            ).encode()
+
+
+class TrackerClient:
+
+    def __init__(self, address:str, pool_size:int=4, timeout:float=60):
+        """Client of a TrackerServer. Requests are sent as lines of json over
+        connections taken from a pool, such that many threads can share a
+        client and a process reuses its connections across experiments (see
+        get_client). Used by ModelTracker for TrackerType("server").
+
+        Args:
+            address (str): Address of the server, either "unix:<socket path>"
+            or "<host>:<port>"
+            pool_size (int, optional): Maximum number of idle connections kept
+            open. Defaults to 4.
+            timeout (float, optional): Seconds to wait for a response before
+            raising socket.timeout. Defaults to 60.
+        """
+        self.address = address
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._family, self._sock_address = parse_address(address)
+        self._idle:List[tuple] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> tuple:
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._sock_address)
+        return sock, sock.makefile("rb")
+
+    def _acquire(self) -> Tuple[tuple, bool]:
+        with self._lock:
+            if len(self._idle) > 0:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _release(self, conn:tuple):
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        self._close_conn(conn)
+
+    @staticmethod
+    def _close_conn(conn:tuple):
+        sock, reader = conn
+        reader.close()
+        sock.close()
+
+    def request(self, op:str, **kwargs) -> Dict[str,Any]:
+        """Sends a request to the server and returns the response
+
+        Args:
+            op (str): The operation i.e. "upsert"
+            kwargs: Arguments of the operation
+
+        Returns:
+            Dict[str,Any]: The response
+        """
+        message = encode_message({"op": op, **kwargs})
+        while True:
+            conn, pooled = self._acquire()
+            try:
+                conn[0].sendall(message)
+                line = conn[1].readline()
+                if line == b"":
+                    raise ConnectionError("Tracker server closed the connection")
+            except (ConnectionError, BrokenPipeError) as e:
+                self._close_conn(conn)
+                if pooled:
+                    # The pooled connection went stale i.e. the server
+                    # restarted, retry with a new connection
+                    continue
+                raise e
+            except BaseException:
+                self._close_conn(conn)
+                raise
+            self._release(conn)
+            break
+        response = json.loads(line)
+        if not response.get("ok", False):
+            raise TrackerServerError(response.get("error"))
+        return response
+
+    def ping(self) -> bool:
+        try:
+            self.request("ping")
+            return True
+        except (OSError, TrackerServerError):
+            return False
+
+    def import_rows(self, u_ids:List[Any]=None, u_id_column:str=None
+                    ) -> Tuple[List[str], List[Dict[str,Any]]]:
+        """Returns the column names of the tracker and its rows, or only the
+        rows with u_id values in u_ids if provided. If u_id_column is
+        provided, the server raises if its u_id differs.
+        """
+        response = self.request("import", u_ids=u_ids, u_id_column=u_id_column)
+        return response["column_names"], response["rows"]
+
+    def upsert_rows(self, rows:List[Dict[str,Any]], flush:bool=False,
+                    u_id_column:str=None):
+        """Replaces or adds rows in the tracker held by the server. The rows
+        are written to the file backend of the server with the next flush.
+
+        Args:
+            rows (List[Dict[str,Any]]): The rows
+            flush (bool, optional): If True, waits for the rows to be written
+            to the file backend. Defaults to False.
+            u_id_column (str, optional): Column uniquely identifying the rows.
+            If provided, the server raises if its u_id differs. Defaults to
+            None.
+        """
+        self.request("upsert", rows=list(rows), flush=flush,
+                     u_id_column=u_id_column)
+
+    def query(self, where:List[Any]=[], order_by:str=None,
+              ascending:bool=True, limit:int=None,
+              columns:List[str]=None) -> List[Dict[str,Any]]:
+        """As for ModelTracker.query, answered by the server. Predicates must
+        be tuples rather than callables.
+        """
+        return self.request("query", where=[list(pred) for pred in where],
+                            order_by=order_by, ascending=ascending,
+                            limit=limit, columns=columns)["rows"]
+
+    def top_k(self, metric:str, k:int=10, largest:bool=True,
+              where:List[Any]=[], columns:List[str]=None) -> List[Dict[str,Any]]:
+        """As for ModelTracker.top_k, answered by the server
+        """
+        return self.request("top_k", metric=metric, k=k, largest=largest,
+                            where=[list(pred) for pred in where],
+                            columns=columns)["rows"]
+
+    def find_rows(self, column:str, value:Any) -> List[Dict[str,Any]]:
+        """As for ModelTracker.find_rows, answered by the server
+        """
+        return self.request("find", column=column, value=value)["rows"]
+
+    def check_model_exists(self, u_id:Any) -> bool:
+        return self.request("exists", u_id=u_id)["exists"]
+
+    def flush(self):
+        """Waits for every pending row to be written to the file backend
+        """
+        self.request("flush")
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close_conn(conn)
+
+
+_clients:Dict[str,TrackerClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(address:str) -> TrackerClient:
+    """Returns the TrackerClient of the process for address, creating it on
+    first use
+    """
+    with _clients_lock:
+        if address not in _clients:
+            _clients[address] = TrackerClient(address)
+        return _clients[address]
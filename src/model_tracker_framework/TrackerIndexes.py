@@ -0,0 +1,160 @@
+import bisect
+import numbers
+from typing import Any, Dict, Iterator, List
+
+
+def is_indexable_metric(val:Any) -> bool:
+    """Returns True for real numbers which are not bools or NaN
+    """
+    return (isinstance(val, numbers.Real) and not isinstance(val, bool)
+            and val == val)
+
+
+class SortedMetricIndex:
+
+    def __init__(self, column:str):
+        """Sorted secondary index over the numeric values of column. Holds the
+        values in ascending order alongside the position of their row in
+        ModelTracker.rows. Values which are missing or not numeric are not
+        indexed.
+
+        Args:
+            column (str): The column to index
+        """
+        self.column = column
+        self.values:List[float] = []
+        self.row_idxs:List[int] = []
+        # Set when row positions have shifted i.e. after a delete. A stale
+        # index ignores updates and is rebuilt on next use
+        self.stale = True
+
+    def build(self, rows:List[Dict[str,Any]]):
+        if hasattr(rows, "column_values"):
+            # CompactRowStore, read the column without creating row views
+            col_vals = rows.column_values(self.column)
+        else:
+            col_vals = [rw.get(self.column) for rw in rows]
+        pairs = sorted(
+            (val, idx) for idx, val in enumerate(col_vals)
+            if is_indexable_metric(val))
+        self.values = [pair[0] for pair in pairs]
+        self.row_idxs = [pair[1] for pair in pairs]
+        self.stale = False
+
+    def add(self, val:Any, row_idx:int):
+        if self.stale or not is_indexable_metric(val):
+            return
+        pos = bisect.bisect_right(self.values, val)
+        self.values.insert(pos, val)
+        self.row_idxs.insert(pos, row_idx)
+
+    def remove(self, val:Any, row_idx:int):
+        if self.stale or not is_indexable_metric(val):
+            return
+        lo = bisect.bisect_left(self.values, val)
+        hi = bisect.bisect_right(self.values, val)
+        for pos in range(lo, hi):
+            if self.row_idxs[pos] == row_idx:
+                del self.values[pos]
+                del self.row_idxs[pos]
+                return
+        # The index no longer matches the rows i.e. a value was edited outside
+        # of the ModelTracker methods
+        self.stale = True
+
+    def range(self, lower:Any=None, upper:Any=None,
+              lower_inclusive:bool=True, upper_inclusive:bool=True) -> List[int]:
+        """Returns the row positions with values between lower and upper in
+        ascending order of value
+
+        Args:
+            lower (Any, optional): Lower bound. If None, unbounded. Defaults to
+            None.
+            upper (Any, optional): Upper bound. If None, unbounded. Defaults to
+            None.
+            lower_inclusive (bool, optional): Whether values equal to lower are
+            included. Defaults to True.
+            upper_inclusive (bool, optional): Whether values equal to upper are
+            included. Defaults to True.
+
+        Returns:
+            List[int]: Positions of the rows in ModelTracker.rows
+        """
+        lo = 0
+        hi = len(self.values)
+        if lower is not None:
+            lo = (bisect.bisect_left if lower_inclusive else
+                  bisect.bisect_right)(self.values, lower)
+        if upper is not None:
+            hi = (bisect.bisect_right if upper_inclusive else
+                  bisect.bisect_left)(self.values, upper)
+        return self.row_idxs[lo:hi]
+
+    def ordered(self, ascending:bool=True) -> Iterator[int]:
+        """Returns an iterator over the row positions in order of value
+        """
+        return iter(self.row_idxs) if ascending else reversed(self.row_idxs)
+
+
+def is_hashable_value(val:Any) -> bool:
+    """Returns True for values which are not missing or NaN and can be hashed
+    """
+    if val is None or val != val:
+        return False
+    try:
+        hash(val)
+    except TypeError:
+        return False
+    return True
+
+
+class HashIndex:
+
+    def __init__(self, column:str):
+        """Hash secondary index over the values of column mapping each value
+        to the positions of its rows in ModelTracker.rows, for equality lookups
+        on non numeric columns i.e. identifiers or fingerprints. Values which
+        are missing, NaN or unhashable are not indexed.
+
+        Args:
+            column (str): The column to index
+        """
+        self.column = column
+        self.row_idxs:Dict[Any,List[int]] = {}
+        # As for SortedMetricIndex.stale
+        self.stale = True
+
+    def build(self, rows:List[Dict[str,Any]]):
+        if hasattr(rows, "column_values"):
+            col_vals = rows.column_values(self.column)
+        else:
+            col_vals = [rw.get(self.column) for rw in rows]
+        self.row_idxs = {}
+        for idx, val in enumerate(col_vals):
+            if is_hashable_value(val):
+                self.row_idxs.setdefault(val, []).append(idx)
+        self.stale = False
+
+    def add(self, val:Any, row_idx:int):
+        if self.stale or not is_hashable_value(val):
+            return
+        self.row_idxs.setdefault(val, []).append(row_idx)
+
+    def remove(self, val:Any, row_idx:int):
+        if self.stale or not is_hashable_value(val):
+            return
+        idxs = self.row_idxs.get(val, [])
+        if row_idx not in idxs:
+            self.stale = True
+            return
+        idxs.remove(row_idx)
+        if len(idxs) == 0:
+            del self.row_idxs[val]
+
+    def get(self, val:Any) -> List[int]:
+        """Returns the row positions with a value equal to val in ascending
+        order
+        """
+        if not is_hashable_value(val):
+            return []
+        return sorted(self.row_idxs.get(val, []))
@@ -0,0 +1,128 @@
+import logging
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger("mtf_logger")
+
+
+class TrackerLockTimeout(Exception):
+    pass
+
+
+@contextmanager
+def tracker_file_lock(tracker_path:str, timeout:float=None,
+                      poll_interval:float=0.05):
+    """Holds an exclusive advisory lock on tracker_path for the duration of
+    the context. The lock is taken on a sidecar file named
+    "<tracker_path>.lock" such that the tracker itself can be atomically
+    replaced whilst the lock is held. The lock is only respected by processes
+    which also take it.
+
+    Args:
+        tracker_path (str): File location of the tracker to lock
+        timeout (float, optional): Seconds to wait for the lock before raising
+        TrackerLockTimeout. If None, waits indefinitely. Defaults to None.
+        poll_interval (float, optional): Seconds between attempts to take the
+        lock when a timeout is set. Defaults to 0.05.
+    """
+    lock_file = open("{}.lock".format(tracker_path), "a+")
+    try:
+        strt = time.monotonic()
+        while True:
+            try:
+                if fcntl is not None:
+                    flags = fcntl.LOCK_EX
+                    if timeout is not None:
+                        flags |= fcntl.LOCK_NB
+                    fcntl.flock(lock_file.fileno(), flags)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if timeout is not None and time.monotonic() - strt > timeout:
+                    raise TrackerLockTimeout(
+                        "Could not lock {} within {} seconds".format(
+                            tracker_path, timeout))
+                time.sleep(poll_interval)
+        yield
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        lock_file.close()
+
+
+@contextmanager
+def atomic_write_path(tracker_path:str):
+    """Yields a temporary file location in the same directory as tracker_path.
+    On leaving the context without error, the temporary file is moved over
+    tracker_path via os.replace, such that readers observe either the old or
+    the new tracker but never a partially written one.
+
+    Args:
+        tracker_path (str): File location the temporary file should replace
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=".{}.".format(os.path.basename(tracker_path)), suffix=".tmp",
+        dir=os.path.dirname(os.path.abspath(tracker_path)))
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, tracker_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def pending_rows_dir(tracker_path:str) -> str:
+    return "{}.pending".format(tracker_path)
+
+
+def spool_pending_rows(tracker_path:str, rows_jsonl:str) -> str:
+    """Atomically writes rows, serialised as json lines, into the pending
+    directory of tracker_path. The file names sort in the order the rows were
+    spooled.
+
+    Args:
+        tracker_path (str): File location of the tracker the rows are pending
+        for
+        rows_jsonl (str): The rows to spool, serialised as json lines
+
+    Returns:
+        str: File location of the spooled rows
+    """
+    spool_dir = pending_rows_dir(tracker_path)
+    os.makedirs(spool_dir, exist_ok=True)
+    spool_path = os.path.join(spool_dir, "{:020d}_{}_{}.jsonl".format(
+        time.time_ns(), os.getpid(), uuid.uuid4().hex))
+    tmp_path = "{}.tmp".format(spool_path)
+    with open(tmp_path, "w") as f:
+        f.write(rows_jsonl)
+    os.replace(tmp_path, spool_path)
+    return spool_path
+
+
+def list_pending_rows(tracker_path:str) -> list:
+    """Returns the file locations of all rows spooled for tracker_path in the
+    order they were spooled
+    """
+    spool_dir = pending_rows_dir(tracker_path)
+    if not os.path.isdir(spool_dir):
+        return []
+    return [os.path.join(spool_dir, nm) for nm in sorted(os.listdir(spool_dir))
+            if nm.endswith(".jsonl")]
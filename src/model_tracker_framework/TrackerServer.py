@@ -0,0 +1,267 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import traceback
+from typing import Any, Dict, List
+
+from .ModelTracker import ModelTracker
+from .MTFSupporting import TrackerType
+from .TrackerClient import encode_message, parse_address
+from .TrackerLock import atomic_write_path
+
+logger = logging.getLogger("mtf_logger")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            if line.strip() == b"":
+                continue
+            try:
+                response = {"ok": True,
+                            **self.server.tracker_server.handle_request(
+                                json.loads(line))}
+            except Exception as e:
+                logger.error("Tracker server request failed:\n{}".format(
+                    traceback.format_exc()))
+                response = {"ok": False, "error": "{}: {}".format(
+                    type(e).__name__, e)}
+            self.wfile.write(encode_message(response))
+            self.wfile.flush()
+
+
+# Connections waiting to be accepted. Unix sockets refuse connections beyond
+# the backlog rather than queueing them
+_REQUEST_QUEUE_SIZE = 128
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = _REQUEST_QUEUE_SIZE
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _ThreadingUnixServer(socketserver.ThreadingMixIn,
+                               socketserver.UnixStreamServer):
+        daemon_threads = True
+        request_queue_size = _REQUEST_QUEUE_SIZE
+
+
+class TrackerServer:
+
+    def __init__(self, address:str, existing_tracker_path:str,
+                 tracker_type:TrackerType = TrackerType("jsonl"),
+                 u_id:str="model_name", flush_interval_s:float=5.0,
+                 flush_size:int=100, updt_kwargs:dict = {}):
+        """Long running process holding a tracker in memory, with its u_id and
+        hash indexes, on behalf of many clients (see TrackerClient). Clients
+        connect via a local unix socket or TCP and send requests as lines of
+        json. Upserted rows are applied to the in memory tracker immediately
+        and written to the tracker file in batches, once flush_interval_s has
+        passed or flush_size rows are pending, such that the file is never
+        parsed by the clients. The server is the only writer of the file
+        whilst it runs. Experiments use the server by passing its address as
+        existing_tracker_path with TrackerType("server").
+
+        Args:
+            address (str): Address to listen on, either "unix:<socket path>"
+            or "<host>:<port>" i.e. "localhost:8765"
+            existing_tracker_path (str): File location of the tracker, which
+            is imported on start if it exists
+            tracker_type (TrackerType, optional): Storage format of the
+            tracker file. Json lines files are appended to and sqlite
+            databases upserted on each flush, other formats are rewritten.
+            Defaults to TrackerType("jsonl").
+            u_id (str, optional): Column uniquely identifying each row.
+            Requests from clients with a different u_id are rejected. Defaults
+            to "model_name".
+            flush_interval_s (float, optional): Maximum seconds rows wait
+            before being written. Defaults to 5.0.
+            flush_size (int, optional): Number of pending rows which triggers
+            an immediate flush. Defaults to 100.
+            updt_kwargs (dict, optional): kwargs relating to the import method
+            for tracker_type. Defaults to {}.
+        """
+        if tracker_type.tracker_type == "server":
+            raise ValueError("The tracker of a TrackerServer must be a file")
+        self.address = address
+        self.existing_tracker_path = existing_tracker_path
+        self.tracker_type = tracker_type
+        self.flush_interval_s = flush_interval_s
+        self.flush_size = flush_size
+        self.tracker = ModelTracker(u_id=u_id)
+        if self.tracker.check_tracker_exists(existing_tracker_path):
+            self.tracker.import_existing_tracker(existing_tracker_path,
+                                                 tracker_type, **updt_kwargs)
+        self._lock = threading.Lock()
+        # Held whilst writing such that flushes are written in order
+        self._flush_lock = threading.Lock()
+        self._pending:Dict[Any,Dict[str,Any]] = {}
+        self._flush_needed = threading.Event()
+        self._stopped = threading.Event()
+        self._server:socketserver.BaseServer = None
+        self._threads:List[threading.Thread] = []
+
+    def handle_request(self, request:Dict[str,Any]) -> Dict[str,Any]:
+        op = request.get("op")
+        # Rows keyed on another column would otherwise be duplicated rather
+        # than replaced
+        u_id_column = request.get("u_id_column")
+        if u_id_column is not None and u_id_column != self.tracker.u_id:
+            raise ValueError(
+                "The tracker server has u_id {} but the client has u_id {}".format(
+                    self.tracker.u_id, u_id_column))
+        if op == "ping":
+            return {}
+        if op == "upsert":
+            with self._lock:
+                self.tracker.replace_rows(request["rows"], force_columns=True)
+                for row in request["rows"]:
+                    self._pending[row.get(self.tracker.u_id)] = row
+                n_pending = len(self._pending)
+            if request.get("flush", False):
+                self.flush()
+            elif n_pending >= self.flush_size:
+                self._flush_needed.set()
+            return {}
+        if op == "flush":
+            self.flush()
+            return {}
+        with self._lock:
+            if op == "import":
+                u_ids = request.get("u_ids")
+                if u_ids is None:
+                    rows = [dict(rw) for rw in self.tracker.rows]
+                else:
+                    u_id_idx = self.tracker._get_u_id_index()
+                    rows = [dict(self.tracker.rows[u_id_idx[val]])
+                            for val in u_ids if val in u_id_idx]
+                return {"column_names": self.tracker.column_names,
+                        "rows": rows}
+            if op == "query":
+                return {"rows": self.tracker.query(
+                    where=[tuple(pred) for pred in request.get("where", [])],
+                    order_by=request.get("order_by"),
+                    ascending=request.get("ascending", True),
+                    limit=request.get("limit"),
+                    columns=request.get("columns"))}
+            if op == "top_k":
+                return {"rows": self.tracker.top_k(
+                    request["metric"], k=request.get("k", 10),
+                    largest=request.get("largest", True),
+                    where=[tuple(pred) for pred in request.get("where", [])],
+                    columns=request.get("columns"))}
+            if op == "find":
+                return {"rows": [dict(rw) for rw in self.tracker.find_rows(
+                    request["column"], request["value"])]}
+            if op == "exists":
+                return {"exists": self.tracker.check_model_exists(
+                    request["u_id"])}
+        raise ValueError("Unsupported operation {}".format(op))
+
+    def flush(self) -> int:
+        """Writes the pending rows to the tracker file
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = list(self._pending.values()), {}
+                if len(rows) == 0:
+                    return 0
+                # Rows are replaced rather than edited in place, therefore a
+                # copy of the row list is a consistent snapshot which can be
+                # written without blocking requests
+                snapshot = ModelTracker(u_id=self.tracker.u_id)
+                snapshot.rows = list(self.tracker.rows)
+                snapshot.column_names = list(self.tracker.column_names)
+            if self.tracker_type.tracker_type in ["jsonl", "sqlite"]:
+                snapshot.write_tracker(self.existing_tracker_path,
+                                       self.tracker_type, new_rows=rows)
+            else:
+                with atomic_write_path(self.existing_tracker_path) as tmp_dir:
+                    snapshot.write_tracker(tmp_dir, self.tracker_type)
+        logger.info("Tracker server wrote {} rows to {}".format(
+            len(rows), self.existing_tracker_path))
+        return len(rows)
+
+    def _flush_loop(self):
+        while not self._stopped.is_set():
+            self._flush_needed.wait(self.flush_interval_s)
+            self._flush_needed.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.error("Tracker server flush failed:\n{}".format(
+                    traceback.format_exc()))
+
+    def _make_server(self) -> socketserver.BaseServer:
+        family, sock_address = parse_address(self.address)
+        if family == socket.AF_INET:
+            server = _ThreadingTCPServer(sock_address, _RequestHandler)
+        else:
+            if os.path.exists(sock_address):
+                # Left by a server which did not shut down cleanly
+                os.remove(sock_address)
+            server = _ThreadingUnixServer(sock_address, _RequestHandler)
+        server.tracker_server = self
+        return server
+
+    def start(self) -> "TrackerServer":
+        """Starts serving in background threads
+
+        Returns:
+            TrackerServer: self
+        """
+        self._server = self._make_server()
+        self._stopped.clear()
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever,
+                             name="mtf-tracker-server", daemon=True),
+            threading.Thread(target=self._flush_loop,
+                             name="mtf-tracker-flush", daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        logger.info("Tracker server listening on {}".format(self.address))
+        return self
+
+    def serve_forever(self):
+        """Serves until interrupted i.e. by Ctrl+C, then flushes the pending
+        rows
+        """
+        self.start()
+        try:
+            self._stopped.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stops serving and writes the pending rows
+        """
+        self._stopped.set()
+        self._flush_needed.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            family, sock_address = parse_address(self.address)
+            if family != socket.AF_INET and os.path.exists(sock_address):
+                os.remove(sock_address)
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.flush()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
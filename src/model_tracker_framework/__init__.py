@@ -1,8 +1,19 @@
 import logging
+import os
 from .ModelExperimentBase import ModelExperimentBase
 from .SupervisedModelExperiment import SupervisedModelExperiment
 from .ModelTracker import ModelTracker
-from .MTFSupporting import ExperimentOption
+from .ExperimentScheduler import ExperimentScheduler, ExperimentResult
+from .HyperparameterSweep import HyperparameterSweep
+from .AsyncTrackerWriter import AsyncTrackerWriter
+from .DebugBudget import DebugBudget
+from .MetricLogger import MetricLogger
+from .PreprocessingCache import PreprocessingCache
+from .MetricsEngine import MetricsEngine
+from .StageProfiler import StageProfiler, ProfilerHook
+from .TrackerClient import TrackerClient
+from .TrackerServer import TrackerServer
+from .MTFSupporting import ExperimentOption, LazyModule, SearchType, TrackerType
 
 class CustomFormatter(logging.Formatter):
 
@@ -27,11 +38,26 @@ class CustomFormatter(logging.Formatter):
         return formatter.format(record)
 
 logger = logging.getLogger("mtf_logger")
-logger.setLevel(logging.INFO)
 
-# create console handler with a higher log level
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
 
-console_handler.setFormatter(CustomFormatter())
-logger.addHandler(console_handler)
\ No newline at end of file
+def enable_console_logging(level:int=logging.INFO):
+    """Attaches a coloured console handler to the "mtf_logger" logger. Importing the package does not attach a 
+    handler, such that applications configure logging themselves, unless the MTF_CONSOLE_LOG environment variable 
+    is set to 1. The mtf command calls this on start up.
+
+    Args:
+        level (int, optional): Level of the "mtf_logger" logger. Defaults to logging.INFO.
+    """
+    logger.setLevel(level)
+    for handler in logger.handlers:
+        if isinstance(handler.formatter, CustomFormatter):
+            return
+    # create console handler with a higher log level
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(CustomFormatter())
+    logger.addHandler(console_handler)
+
+
+if os.environ.get("MTF_CONSOLE_LOG", "0") == "1":
+    enable_console_logging()
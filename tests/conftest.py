@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Allows the tests to run from a checkout without installing the package
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
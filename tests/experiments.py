@@ -0,0 +1,65 @@
+"""Experiments used by the tests. Defined at module level such that they can
+be pickled to the worker processes of ExperimentScheduler.
+"""
+import numpy as np
+
+from model_tracker_framework import (
+    ModelExperimentBase, SupervisedModelExperiment)
+
+
+class SumExperiment(ModelExperimentBase):
+
+    def __init__(self, model_name:str, value:float=1.0, fail:bool=False):
+        super().__init__(model_name, debug_skips_preprop_steps=False)
+        self.value = value
+        self.fail = fail
+        self.n_preprocessed = 0
+
+    def preprocessing_steps(self):
+        self.n_preprocessed += 1
+        self.data = list(range(10))
+
+    def preprocessing_debug(self):
+        self.data = self.data[:2]
+
+    def train_model(self, scale:float=1.0):
+        if self.fail:
+            raise RuntimeError("Training failed")
+        self.model = sum(self.data) * scale
+
+    def evaluate_model(self):
+        self.results["score"] = self.model * self.value
+
+
+class ThresholdExperiment(SupervisedModelExperiment):
+
+    def __init__(self, model_name:str, n_rows:int=1000):
+        super().__init__(model_name, debug_skips_preprop_steps=False)
+        self.n_rows = n_rows
+
+    def preprocessing_cache_inputs(self) -> dict:
+        return {"n_rows": self.n_rows}
+
+    def preprocessing_steps(self):
+        rng = np.random.default_rng(0)
+        for split in ["train", "test"]:
+            X = rng.normal(size=(self.n_rows, 3))
+            setattr(self, "X_{}".format(split), X)
+            setattr(self, "y_true_{}".format(split), (X[:, 0] > 0).astype(int))
+
+    def preprocessing_debug(self):
+        pass
+
+    def train_model(self, threshold:float=0.0):
+        self.threshold = threshold
+        for split in ["train", "test"]:
+            X = getattr(self, "X_{}".format(split))
+            setattr(self, "y_score_{}".format(split), X[:, 0])
+            setattr(self, "y_pred_{}".format(split),
+                    (X[:, 0] > threshold).astype(int))
+
+    def evaluate_model(self):
+        if self.metrics_engine is not None:
+            return super().evaluate_model()
+        self.results["test_accuracy"] = float(
+            np.mean(self.y_pred_test == self.y_true_test))
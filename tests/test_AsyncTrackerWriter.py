@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+import pytest
+
+from model_tracker_framework import (
+    AsyncTrackerWriter, ModelTracker, TrackerType)
+
+from .experiments import SumExperiment
+
+
+class CountingWriter(AsyncTrackerWriter):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.n_writes = 0
+
+    def _write_rows(self, rows):
+        self.n_writes += 1
+        super()._write_rows(rows)
+
+
+def import_names(path:str, backend:str):
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(path, TrackerType(backend))
+    return sorted(rw["model_name"] for rw in tracker.rows)
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl"])
+def test_writer_batches_rows(tmp_path, backend):
+    path = str(tmp_path / "tracker.{}".format(backend))
+    writer = CountingWriter(path, TrackerType(backend))
+
+    async def write_all():
+        await asyncio.gather(*[writer.write(
+            {"model_name": "model_{}".format(i), "score": i * 0.25})
+            for i in range(20)])
+        await writer.flush()
+    asyncio.run(write_all())
+    assert import_names(path, backend) == sorted(
+        "model_{}".format(i) for i in range(20))
+    assert writer.n_writes < 20
+
+
+def test_writer_raises_write_errors(tmp_path):
+    writer = AsyncTrackerWriter(str(tmp_path / "missing" / "tracker.json"))
+    with pytest.raises(OSError):
+        asyncio.run(writer.write({"model_name": "model_0"}))
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl"])
+def test_arun_experiment_concurrent(tmp_path, backend):
+    os.makedirs(str(tmp_path / "outputs"))
+    path = str(tmp_path / "tracker.{}".format(backend))
+
+    async def run_all():
+        experiments = [SumExperiment("exp_{}".format(i), value=i)
+                       for i in range(5)]
+        await asyncio.gather(*[experiment.arun_experiment(
+            existing_tracker_path=path, exp_description="test",
+            parent_sv_dir=str(tmp_path / "outputs"),
+            tracker_type=TrackerType(backend))
+            for experiment in experiments])
+        return experiments
+    experiments = asyncio.run(run_all())
+    assert import_names(path, backend) == [
+        "exp_{}".format(i) for i in range(5)]
+    for experiment in experiments:
+        assert os.path.isdir(experiment.model_sv_loc)
+
+
+def test_shared_writers_are_keyed_on_u_id(tmp_path):
+    path = str(tmp_path / "tracker.jsonl")
+
+    async def get_writers():
+        return (AsyncTrackerWriter.get_shared(path, TrackerType("jsonl")),
+                AsyncTrackerWriter.get_shared(path, TrackerType("jsonl")),
+                AsyncTrackerWriter.get_shared(path, TrackerType("jsonl"),
+                                              u_id="run_id"))
+    default, same, other = asyncio.run(get_writers())
+    assert default is same
+    assert default.tracker.u_id == "model_name"
+    assert other is not default
+    assert other.tracker.u_id == "run_id"
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_tracker_framework import ModelTracker, TrackerType
+from model_tracker_framework.CompactRowStore import CompactRowStore
+
+
+def make_rows():
+    return [{"model_name": "a", "acc": 0.5, "n": 1, "flag": True},
+            {"model_name": "b", "acc": None, "n": 2},
+            {"model_name": "c", "acc": 0.75, "n": 3, "flag": False,
+             "notes": "x"}]
+
+
+def test_behaves_as_list_of_dicts():
+    expected = make_rows()
+    store = CompactRowStore(make_rows())
+    assert [dict(rw) for rw in store] == expected
+    for rows in [expected, store]:
+        rows.insert(1, {"model_name": "d", "n": 4})
+        rows.append({"model_name": "e", "acc": 1.0})
+        del rows[0]
+        rows[0] = {"model_name": "f", "n": 5}
+        rows[1]["acc"] = "not a float"
+        rows[2:4] = [{"model_name": "g"}]
+    assert [dict(rw) for rw in store] == expected
+    assert len(store) == len(expected)
+    assert "flag" not in store[0] and store[0].get("flag") is None
+    assert store[-1]["model_name"] == expected[-1]["model_name"]
+    with pytest.raises(IndexError):
+        store[len(expected)]
+
+
+def test_types_preserved():
+    store = CompactRowStore(make_rows())
+    assert store[0]["flag"] is True
+    assert type(store[0]["n"]) is int
+    store.append({"model_name": "d", "n": np.int64(4)})
+    assert type(store[3]["n"]) is np.int64
+    assert store.column_values("acc") == [0.5, None, 0.75, None]
+    assert store.nbytes() > 0
+
+
+def test_to_pandas_df_matches_from_dict():
+    rows = make_rows() + [{"model_name": "d", "acc": 1.0, "n": 4,
+                           "flag": True, "notes": "y"}]
+    pd.testing.assert_frame_equal(CompactRowStore(rows).to_pandas_df(),
+                                  pd.DataFrame.from_dict(rows))
+
+
+@pytest.mark.parametrize("backend", ["json", "jsonl", "csv"])
+def test_compact_tracker_round_trip(tmp_path, backend):
+    path = str(tmp_path / "tracker.{}".format(backend))
+    rows = [{"model_name": "model_{}".format(i), "acc": i * 0.25, "n": i}
+            for i in range(20)]
+    tracker = ModelTracker(row_store="compact")
+    tracker.update_tracker_w_dicts(rows)
+    assert isinstance(tracker.rows, CompactRowStore)
+    tracker.write_tracker(path, TrackerType(backend))
+    imported = ModelTracker(row_store="compact")
+    imported.import_existing_tracker(path, TrackerType(backend))
+    assert [dict(rw) for rw in imported.rows] == rows
+    assert imported.get_cur_row_index("model_7") == 7
+
+
+def test_invalid_row_store():
+    with pytest.raises(TypeError):
+        ModelTracker(row_store="columnar")
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+
+import pytest
+
+from model_tracker_framework import ModelTracker, TrackerType
+from model_tracker_framework.ConfigFingerprint import (
+    FINGERPRINT_COLUMN, config_fingerprint)
+
+from .experiments import SumExperiment, ThresholdExperiment
+
+
+class CountingExperiment(SumExperiment):
+
+    n_trained = 0
+
+    def train_model(self, scale:float=1.0):
+        CountingExperiment.n_trained += 1
+        super().train_model(scale=scale)
+
+
+def test_fingerprint_inputs():
+    fingerprint = config_fingerprint(SumExperiment("a"), {"scale": 2})
+    assert fingerprint == config_fingerprint(SumExperiment("b"), {"scale": 2})
+    assert fingerprint != config_fingerprint(SumExperiment("a"), {"scale": 3})
+    assert fingerprint != config_fingerprint(CountingExperiment("a"),
+                                             {"scale": 2})
+    assert (config_fingerprint(ThresholdExperiment("a", n_rows=10), {}) !=
+            config_fingerprint(ThresholdExperiment("a", n_rows=20), {}))
+    assert config_fingerprint(SumExperiment("a"),
+                              {"scale": lambda: None}) is None
+
+
+@pytest.mark.parametrize("backend,ext", [("json", "json"), ("sqlite", "db")])
+def test_fingerprint_cache_skips_identical_runs(tmp_path, backend, ext):
+    os.makedirs(str(tmp_path / "outputs"))
+    path = str(tmp_path / "tracker.{}".format(ext))
+    CountingExperiment.n_trained = 0
+
+    def run(model_name:str, scale:float) -> dict:
+        return CountingExperiment(model_name).run_experiment(
+            existing_tracker_path=path, exp_description="test",
+            parent_sv_dir=str(tmp_path / "outputs"),
+            train_kwargs={"scale": scale}, tracker_type=TrackerType(backend),
+            force_columns=True, fingerprint_cache=True)
+    first = run("exp_0", 2)
+    assert run("exp_1", 2)["model_name"] == "exp_0"
+    assert CountingExperiment.n_trained == 1
+    assert run("exp_2", 3)["model_name"] == "exp_2"
+    assert CountingExperiment.n_trained == 2
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(path, TrackerType(backend))
+    assert [rw["model_name"] for rw in tracker.rows] == ["exp_0", "exp_2"]
+    assert tracker.rows[0][FINGERPRINT_COLUMN] == first[FINGERPRINT_COLUMN]
+    assert not os.path.exists(str(tmp_path / "outputs" / "exp_1"))
+
+
+def sqlite_schema(path:str) -> list:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(
+            "SELECT type, name FROM sqlite_master ORDER BY name").fetchall()
+
+
+def test_sqlite_fingerprint_lookup_does_not_change_schema(tmp_path):
+    path = str(tmp_path / "tracker.db")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts([{"model_name": "exp_0", "score": 1}])
+    tracker.write_tracker(path, TrackerType("sqlite"))
+    schema = sqlite_schema(path)
+    assert SumExperiment("exp_1")._find_fingerprint_row(
+        path, TrackerType("sqlite"), "abc") is None
+    assert sqlite_schema(path) == schema
+
+
+def test_sqlite_fingerprint_column_indexed_when_added(tmp_path):
+    path = str(tmp_path / "tracker.db")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(
+        [{"model_name": "exp_0", FINGERPRINT_COLUMN: "abc"}])
+    tracker.write_tracker(path, TrackerType("sqlite"))
+    assert ("index", "idx_model_tracker_{}".format(FINGERPRINT_COLUMN)) in \
+        sqlite_schema(path)
+    row = SumExperiment("exp_1")._find_fingerprint_row(
+        path, TrackerType("sqlite"), "abc")
+    assert row["model_name"] == "exp_0"
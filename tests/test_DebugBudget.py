@@ -0,0 +1,93 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from model_tracker_framework import DebugBudget
+from model_tracker_framework.DebugBudget import stratified_sample_indices
+
+from .experiments import ThresholdExperiment
+
+
+class BudgetExperiment(ThresholdExperiment):
+
+    n_preprocessed = 0
+
+    def preprocessing_steps(self):
+        BudgetExperiment.n_preprocessed += 1
+        super().preprocessing_steps()
+
+    def train_model(self, threshold:float=0.0, debug_budget:DebugBudget=None):
+        self.received_budget = debug_budget
+        self.received_threshold = threshold
+        super().train_model(threshold=threshold)
+
+
+def test_stratified_sample_keeps_proportions():
+    labels = [0] * 900 + [1] * 90 + [2] * 10
+    idxs = stratified_sample_indices(labels, 100, seed=1)
+    assert len(idxs) == 100 and idxs == sorted(set(idxs))
+    assert Counter(labels[idx] for idx in idxs) == {0: 90, 1: 9, 2: 1}
+    # Rare classes keep at least one row
+    assert Counter(labels[idx] for idx in stratified_sample_indices(
+        labels, 10))[2] == 1
+    assert stratified_sample_indices(labels, 2000) == list(range(1000))
+    assert stratified_sample_indices(labels, 100, seed=1) == idxs
+
+
+def test_continuous_labels_sampled_uniformly():
+    idxs = stratified_sample_indices(np.linspace(0, 1, 1000), 50,
+                                     max_classes=100)
+    assert len(idxs) == 50
+
+
+def test_subsample_group_types():
+    experiment = ThresholdExperiment("exp")
+    experiment.preprocessing_steps()
+    experiment.X_test = pd.DataFrame(experiment.X_test)
+    experiment.y_true_test = list(experiment.y_true_test)
+    DebugBudget(max_rows=100).subsample(experiment)
+    assert experiment.X_train.shape == (100, 3)
+    assert len(experiment.y_true_train) == 100
+    assert isinstance(experiment.X_test, pd.DataFrame)
+    assert len(experiment.X_test) == 100
+    assert isinstance(experiment.y_true_test, list)
+    assert list(experiment.X_test[0] > 0) == [
+        bool(val) for val in experiment.y_true_test]
+
+
+def test_train_kwargs_injection():
+    budget = DebugBudget(kwarg_overrides={"threshold": 0.5})
+
+    def declared(threshold=0.0, debug_budget=None):
+        pass
+
+    def var_kwargs(threshold=0.0, **kwargs):
+        pass
+    assert budget.train_kwargs(declared, {"threshold": 0.1}) == {
+        "threshold": 0.5, "debug_budget": budget}
+    assert budget.train_kwargs(var_kwargs, {}) == {"threshold": 0.5}
+
+
+def test_time_limit():
+    budget = DebugBudget(time_limit_s=0)
+    assert not budget.time_exceeded()
+    budget.start()
+    assert budget.time_exceeded() and budget.time_remaining() == 0
+
+
+def test_debug_run_uses_cached_subsample(tmp_path):
+    BudgetExperiment.n_preprocessed = 0
+    for _ in range(2):
+        experiment = BudgetExperiment("exp")
+        experiment.debug_budget = DebugBudget(
+            max_rows=50, kwarg_overrides={"threshold": 0.25},
+            cache_dir=str(tmp_path / "cache"))
+        experiment.run_experiment(
+            existing_tracker_path=str(tmp_path / "tracker.json"),
+            exp_description="test", parent_sv_dir=str(tmp_path),
+            debug=True, debug_sv_dir=str(tmp_path))
+        assert experiment.X_train.shape == (50, 3)
+        assert experiment.received_budget is experiment.debug_budget
+        assert experiment.received_threshold == 0.25
+    assert BudgetExperiment.n_preprocessed == 1
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from model_tracker_framework import (
+    ExperimentResult, ExperimentScheduler, ModelTracker, TrackerType)
+
+from .experiments import SumExperiment
+
+
+def make_scheduler(tmp_path, **kwargs) -> ExperimentScheduler:
+    return ExperimentScheduler(
+        existing_tracker_path=str(tmp_path / "tracker.jsonl"),
+        parent_sv_dir=str(tmp_path / "outputs"),
+        tracker_type=TrackerType("jsonl"), n_workers=2, **kwargs)
+
+
+def test_runs_experiments_and_writes_tracker(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    scheduler = make_scheduler(tmp_path, batch_size=2)
+    for i in range(4):
+        scheduler.submit(SumExperiment("exp_{}".format(i), value=i),
+                         exp_description="test", train_kwargs={"scale": 2})
+    scheduler.submit(lambda: SumExperiment("exp_fail", fail=True),
+                     exp_description="test")
+    results = scheduler.run()
+    assert [res.model_name for res in results] == [
+        "exp_0", "exp_1", "exp_2", "exp_3", "exp_fail"]
+    assert [res.succeeded for res in results] == [True] * 4 + [False]
+    assert "Training failed" in results[-1].error
+    assert results[2].row["score"] == 90 * 2
+
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(str(tmp_path / "tracker.jsonl"),
+                                    TrackerType("jsonl"))
+    assert {rw["model_name"]: rw["score"] for rw in tracker.rows} == {
+        "exp_{}".format(i): 90 * i for i in range(4)}
+    for res in results[:4]:
+        assert os.path.isdir(res.row["output_save_location"])
+
+
+def test_duplicate_submission_fails(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    scheduler = make_scheduler(tmp_path)
+    scheduler.submit(SumExperiment("exp"), exp_description="test")
+    scheduler.submit(SumExperiment("exp"), exp_description="test")
+    results = scheduler.run()
+    assert [res.succeeded for res in results] == [True, False]
+    assert "more than once" in results[1].error
+
+
+def test_rows_are_merged_with_existing_rows(tmp_path):
+    scheduler = make_scheduler(tmp_path, force_columns=True)
+    scheduler.tracker.update_tracker_w_dict(
+        {"model_name": "exp_0", "notes": "kept", "score": -1})
+    results = {"exp_0": ExperimentResult("exp_0", succeeded=True)}
+    scheduler._write_batch([{"model_name": "exp_0", "score": 45}], results)
+    assert results["exp_0"].row == {
+        "model_name": "exp_0", "notes": "kept", "score": 45}
+
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(str(tmp_path / "tracker.jsonl"),
+                                    TrackerType("jsonl"))
+    assert tracker.rows == [{"model_name": "exp_0", "notes": "kept",
+                             "score": 45}]
+
+
+def test_mismatched_u_id_fails(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    scheduler = make_scheduler(tmp_path, u_id="run_id")
+    scheduler.submit(SumExperiment("exp"), exp_description="test")
+    results = scheduler.run()
+    assert not results[0].succeeded
+    assert "u_id" in results[0].error
+
+
+def test_completed_rows_written_when_stop_when_raises(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    scheduler = make_scheduler(tmp_path, batch_size=None)
+    for i in range(2):
+        scheduler.submit(SumExperiment("exp_{}".format(i), value=i),
+                         exp_description="test")
+
+    def stop_when(row):
+        raise RuntimeError("stop_when failed")
+
+    with pytest.raises(RuntimeError, match="stop_when failed"):
+        scheduler.run(stop_when=stop_when)
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(str(tmp_path / "tracker.jsonl"),
+                                    TrackerType("jsonl"))
+    assert len(tracker.rows) >= 1
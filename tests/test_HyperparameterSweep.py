@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from model_tracker_framework import (
+    HyperparameterSweep, ModelTracker, SearchType, TrackerType)
+
+from .experiments import SumExperiment
+
+
+def make_sweep(tmp_path, space:dict, **kwargs) -> HyperparameterSweep:
+    os.makedirs(str(tmp_path / "outputs"), exist_ok=True)
+    return HyperparameterSweep(
+        SumExperiment("sweep"), space,
+        existing_tracker_path=str(tmp_path / "tracker.jsonl"),
+        parent_sv_dir=str(tmp_path / "outputs"),
+        tracker_type=TrackerType("jsonl"), force_columns=True, **kwargs)
+
+
+def test_grid_and_random_trials(tmp_path):
+    sweep = make_sweep(tmp_path, {"a": [1, 2], "b": (3, 4), "c": 5})
+    assert sweep.trials() == [{"c": 5, "a": 1, "b": 3}, {"c": 5, "a": 1, "b": 4},
+                              {"c": 5, "a": 2, "b": 3}, {"c": 5, "a": 2, "b": 4}]
+    space = {"a": [1, 2], "b": lambda rng: rng.uniform(0, 1)}
+    random_sweep = make_sweep(tmp_path, space, search=SearchType("random"),
+                              n_trials=5, seed=3)
+    trials = random_sweep.trials()
+    assert len(trials) == 5 and trials == random_sweep.trials()
+    assert all(trial["a"] in [1, 2] and 0 <= trial["b"] <= 1
+               for trial in trials)
+    with pytest.raises(ValueError):
+        make_sweep(tmp_path, space).trials()
+    with pytest.raises(ValueError):
+        make_sweep(tmp_path, space, search=SearchType("random"))
+
+
+def test_sweep_writes_every_trial(tmp_path):
+    sweep = make_sweep(tmp_path, {"scale": [1, 2, 3]}, n_workers=2)
+    results = sweep.run(exp_description="sweep")
+    assert [res.succeeded for res in results] == [True] * 3
+    # Preprocessed once in the calling process
+    assert sweep.experiment.n_preprocessed == 1
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(str(tmp_path / "tracker.jsonl"),
+                                    TrackerType("jsonl"))
+    assert {rw["model_name"]: (rw["param_scale"], rw["score"])
+            for rw in tracker.rows} == {
+        "sweep_trial_{}".format(i): (i + 1, 45 * (i + 1)) for i in range(3)}
+
+
+def test_stop_when_cancels_pending_trials(tmp_path):
+    sweep = make_sweep(tmp_path, {"scale": list(range(8))}, n_workers=1,
+                       stop_when=lambda row: True)
+    results = sweep.run(exp_description="sweep")
+    succeeded = [res.model_name for res in results if res.succeeded]
+    cancelled = [res for res in results if not res.succeeded]
+    assert len(succeeded) >= 1 and len(cancelled) >= 1
+    assert all(res.error == "Cancelled by stop_when" for res in cancelled)
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(str(tmp_path / "tracker.jsonl"),
+                                    TrackerType("jsonl"))
+    assert sorted(rw["model_name"] for rw in tracker.rows) == sorted(succeeded)
+    assert sorted(os.listdir(str(tmp_path / "outputs"))) == sorted(succeeded)
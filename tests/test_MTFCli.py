@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+from model_tracker_framework import LazyModule, ModelTracker, TrackerType
+from model_tracker_framework.MTFCli import main, parse_value, parse_where
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "src")
+# Backends read by the cli without pandas and the file extension used
+CLI_BACKENDS = {"json": "json", "csv": "csv", "jsonl": "jsonl", "sqlite": "db"}
+
+
+def test_import_does_not_load_heavy_dependencies():
+    code = ("import sys, model_tracker_framework, model_tracker_framework.MTFCli; "
+            "print([nm for nm in ['pandas', 'numpy'] if nm in sys.modules])")
+    env = {**os.environ, "PYTHONPATH": SRC_DIR, "MTF_CONSOLE_LOG": "0"}
+    out = subprocess.check_output([sys.executable, "-c", code], env=env)
+    assert out.decode().strip() == "[]"
+
+
+@pytest.fixture(autouse=True)
+def restore_logger():
+    # main attaches a console handler, which would otherwise outlive the
+    # captured stderr of the test
+    mtf_logger = logging.getLogger("mtf_logger")
+    handlers, level = list(mtf_logger.handlers), mtf_logger.level
+    yield
+    mtf_logger.handlers = handlers
+    mtf_logger.setLevel(level)
+
+
+def test_import_does_not_attach_handlers():
+    code = ("import logging, model_tracker_framework; "
+            "print(len(logging.getLogger('mtf_logger').handlers))")
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    env.pop("MTF_CONSOLE_LOG", None)
+    out = subprocess.check_output([sys.executable, "-c", code], env=env)
+    assert out.decode().strip() == "0"
+    out = subprocess.check_output([sys.executable, "-c", code],
+                                  env={**env, "MTF_CONSOLE_LOG": "1"})
+    assert out.decode().strip() == "1"
+
+
+def test_main_enables_console_logging(tmp_path):
+    path = str(tmp_path / "tracker.jsonl")
+    ModelTracker().write_tracker(path, TrackerType("jsonl"))
+    assert main(["columns", path]) == 0
+    mtf_logger = logging.getLogger("mtf_logger")
+    assert len(mtf_logger.handlers) == 1
+    assert mtf_logger.level == logging.WARNING
+
+
+def test_lazy_module():
+    module = LazyModule("json")
+    assert module._module is None
+    assert module.loads("[1]") == [1]
+    assert module._module is json
+
+
+def test_parse_value_and_where():
+    assert [parse_value(val) for val in ["", "true", "3", "0.5", "abc"]] == [
+        None, True, 3, 0.5, "abc"]
+    assert parse_where("test_accuracy >= 0.5") == ("test_accuracy", ">=", 0.5)
+    with pytest.raises(ValueError):
+        parse_where("test_accuracy")
+
+
+@pytest.fixture(params=list(CLI_BACKENDS))
+def tracker_path(request, tmp_path):
+    path = str(tmp_path / "tracker.{}".format(CLI_BACKENDS[request.param]))
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(
+        [{"model_name": "model_{}".format(i), "test_accuracy": i * 0.25,
+          "n_epochs": i} for i in range(5)])
+    tracker.write_tracker(path, TrackerType(request.param))
+    return path
+
+
+def test_list(tracker_path, capsys):
+    assert main(["list", tracker_path, "--where", "test_accuracy>0.25",
+                 "--sort", "test_accuracy", "--desc", "--limit", "2",
+                 "--columns", "model_name", "test_accuracy",
+                 "--format", "json"]) == 0
+    rows = [json.loads(line) for line in
+            capsys.readouterr().out.strip().splitlines()]
+    assert rows == [{"model_name": "model_4", "test_accuracy": 1.0},
+                    {"model_name": "model_3", "test_accuracy": 0.75}]
+
+
+def test_show_and_columns(tracker_path, capsys):
+    assert main(["show", tracker_path, "model_2"]) == 0
+    out = capsys.readouterr().out
+    assert "test_accuracy" in out and "0.5" in out
+    assert main(["show", tracker_path, "missing"]) == 1
+    capsys.readouterr()
+    assert main(["columns", tracker_path]) == 0
+    assert capsys.readouterr().out.split() == [
+        "model_name", "test_accuracy", "n_epochs"]
+
+
+def test_unknown_extension(tmp_path, capsys):
+    assert main(["list", str(tmp_path / "tracker.txt")]) == 1
+    assert "--type" in capsys.readouterr().err
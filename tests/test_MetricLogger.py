@@ -0,0 +1,107 @@
+import logging
+import os
+
+from model_tracker_framework import MetricLogger, TrackerType
+
+from .experiments import SumExperiment
+
+
+class LoggingExperiment(SumExperiment):
+
+    def train_model(self, scale:float=1.0):
+        super().train_model(scale=scale)
+        for epoch in range(50):
+            self.log_metric("train/loss", 1 / (epoch + 1))
+            self.log_metric("val_acc", (epoch % 10) * 0.125, step=epoch * 2)
+
+
+def test_flush_and_read(tmp_path):
+    metric_logger = MetricLogger(sv_dir=str(tmp_path), flush_size=7,
+                                 modes={"loss": "min"})
+    for step in range(20):
+        metric_logger.log("loss", 10.0 - step, step)
+    metric_logger.log("loss", 0.5)
+    steps, values = metric_logger.get("loss")
+    assert list(steps) == list(range(21))
+    assert list(values) == [10.0 - step for step in range(20)] + [0.5]
+    metric_logger.flush()
+    assert MetricLogger.read_metric(str(tmp_path), "loss") == (steps, values)
+    assert metric_logger.summary() == {"loss_last": 0.5, "loss_best": -9.0,
+                                       "loss_best_step": 19}
+
+
+def test_unsafe_and_colliding_names(tmp_path):
+    metric_logger = MetricLogger(sv_dir=str(tmp_path))
+    metric_logger.log("a/b", 1.0)
+    metric_logger.log("a_b", 2.0)
+    metric_logger.flush()
+    metrics = MetricLogger.read_metrics(str(tmp_path))
+    assert {nm: list(values) for nm, (_, values) in metrics.items()} == {
+        "a/b": [1.0], "a_b": [2.0]}
+    assert MetricLogger.read_metrics(str(tmp_path / "missing")) == {}
+
+
+def test_interrupted_flush_truncated(tmp_path):
+    metric_logger = MetricLogger(sv_dir=str(tmp_path))
+    for step in range(3):
+        metric_logger.log("loss", float(step))
+    metric_logger.flush()
+    # A step written without its value
+    with open(str(tmp_path / "metrics" / "loss.steps"), "ab") as f:
+        f.write((3).to_bytes(8, "little"))
+    steps, values = MetricLogger.read_metric(str(tmp_path), "loss")
+    assert list(steps) == [0, 1, 2] and list(values) == [0.0, 1.0, 2.0]
+
+
+def test_max_buffered_in_memory(caplog):
+    metric_logger = MetricLogger(flush_size=10, max_buffered=25)
+    with caplog.at_level(logging.WARNING, logger="mtf_logger"):
+        for step in range(100):
+            metric_logger.log("acc", float(step % 37), step)
+    assert "max_buffered" in caplog.text
+    steps, _ = metric_logger.get("acc")
+    assert 0 < len(steps) <= 30 and steps[-1] == 99
+    assert metric_logger.summary() == {"acc_last": float(99 % 37),
+                                       "acc_best": 36.0, "acc_best_step": 36}
+
+
+def test_new_run_clears_metrics(tmp_path):
+    metric_logger = MetricLogger(sv_dir=str(tmp_path), flush_size=5)
+    for step in range(10):
+        metric_logger.log("loss", float(step))
+    fresh = metric_logger.new_run(str(tmp_path))
+    assert fresh.flush_size == 5 and fresh.summary() == {}
+    assert MetricLogger.read_metrics(str(tmp_path)) == {}
+
+
+def test_experiment_log_metric(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    experiment = LoggingExperiment("exp")
+    experiment.metric_logger = MetricLogger(
+        flush_size=16, modes={"train/loss": "min"}, tracker_summary=True)
+    row = experiment.run_experiment(
+        existing_tracker_path=str(tmp_path / "tracker.json"),
+        exp_description="test", parent_sv_dir=str(tmp_path / "outputs"),
+        tracker_type=TrackerType("json"), force_columns=True)
+    metrics = MetricLogger.read_metrics(experiment.model_sv_loc)
+    assert list(metrics["train/loss"][0]) == list(range(50))
+    assert list(metrics["val_acc"][0]) == list(range(0, 100, 2))
+    assert row["train/loss_best"] == 1 / 50
+    assert row["val_acc_best"] == 9 * 0.125
+    assert row["val_acc_best_step"] == 18
+
+
+def test_summary_skips_nan(tmp_path):
+    metric_logger = MetricLogger(sv_dir=str(tmp_path), flush_size=3,
+                                 modes={"loss": "min"})
+    for step, val in enumerate([float("nan"), 2.0, 1.0, float("nan"), 3.0,
+                                0.5, 4.0]):
+        metric_logger.log("loss", val, step)
+        metric_logger.log("acc", val, step)
+    assert metric_logger.summary() == {
+        "loss_last": 4.0, "loss_best": 0.5, "loss_best_step": 5,
+        "acc_last": 4.0, "acc_best": 4.0, "acc_best_step": 6}
+    metric_logger.log("nan_only", float("nan"))
+    summary = metric_logger.summary()
+    assert summary["nan_only_best"] is None
+    assert summary["nan_only_best_step"] is None
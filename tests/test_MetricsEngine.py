@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pytest
+
+from model_tracker_framework import MetricsEngine, TrackerType
+
+from .experiments import ThresholdExperiment
+
+metrics = pytest.importorskip("sklearn.metrics")
+
+CLASSIFICATION_METRICS = ["accuracy", "balanced_accuracy", "precision",
+                          "recall", "f1"]
+
+
+def make_binary(n_rows:int=2000):
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, n_rows)
+    y_score = np.clip(y_true * 0.3 + rng.uniform(size=n_rows) * 0.7, 0, 1)
+    return y_true, (y_score > 0.5).astype(int), y_score
+
+
+def sklearn_classification(y_true, y_pred, average:str) -> dict:
+    return {"accuracy": metrics.accuracy_score(y_true, y_pred),
+            "balanced_accuracy": metrics.balanced_accuracy_score(y_true, y_pred),
+            "precision": metrics.precision_score(y_true, y_pred, average=average),
+            "recall": metrics.recall_score(y_true, y_pred, average=average),
+            "f1": metrics.f1_score(y_true, y_pred, average=average)}
+
+
+@pytest.mark.parametrize("chunk_size", [None, 300])
+def test_binary_matches_sklearn(chunk_size):
+    y_true, y_pred, y_score = make_binary()
+    engine = MetricsEngine(CLASSIFICATION_METRICS + ["roc_auc", "log_loss"],
+                           chunk_size=chunk_size)
+    res = engine.evaluate(y_true, y_pred, y_score=y_score)
+    expected = sklearn_classification(y_true, y_pred, "binary")
+    expected["roc_auc"] = metrics.roc_auc_score(y_true, y_score)
+    expected["log_loss"] = metrics.log_loss(y_true, y_score)
+    # The chunked roc auc is computed from histograms of the scores
+    assert res == pytest.approx(expected, abs=1e-3 if chunk_size else 1e-9)
+
+
+@pytest.mark.parametrize("average", ["micro", "macro", "weighted"])
+def test_multiclass_matches_sklearn(average):
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 4, 500)
+    y_pred = np.where(rng.uniform(size=500) > 0.3, y_true,
+                      rng.integers(0, 4, 500))
+    engine = MetricsEngine(CLASSIFICATION_METRICS, average=average,
+                           chunk_size=64)
+    assert engine.evaluate(list(y_true), y_pred) == pytest.approx(
+        sklearn_classification(y_true, y_pred, average))
+    assert engine.evaluate(y_true, y_pred)["accuracy"] == pytest.approx(
+        metrics.accuracy_score(y_true, y_pred))
+
+
+def test_regression_matches_sklearn():
+    rng = np.random.default_rng(2)
+    y_true = rng.normal(size=1000)
+    y_pred = y_true + rng.normal(scale=0.1, size=1000)
+    res = MetricsEngine(["mse", "rmse", "mae", "r2", "mean_error"],
+                        chunk_size=128).evaluate(y_true, y_pred)
+    assert res == pytest.approx({
+        "mse": metrics.mean_squared_error(y_true, y_pred),
+        "rmse": metrics.mean_squared_error(y_true, y_pred) ** 0.5,
+        "mae": metrics.mean_absolute_error(y_true, y_pred),
+        "r2": metrics.r2_score(y_true, y_pred),
+        "mean_error": float(np.mean(y_pred - y_true))})
+
+
+def test_invalid_configurations():
+    with pytest.raises(ValueError):
+        MetricsEngine(["accuracy", "mse"])
+    with pytest.raises(ValueError):
+        MetricsEngine(["auc"])
+    with pytest.raises(ValueError):
+        MetricsEngine(["f1"], average="samples")
+    with pytest.raises(ValueError):
+        MetricsEngine(["accuracy"]).evaluate([0, 1], [0])
+    with pytest.raises(ValueError):
+        MetricsEngine(["accuracy"], labels=[0, 1]).evaluate([0, 2], [0, 1])
+    assert MetricsEngine(["accuracy", "roc_auc"]).evaluate([0, 1], [0, 1]) == {
+        "accuracy": 1.0, "roc_auc": None}
+
+
+def test_experiment_evaluate_metrics(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    experiment = ThresholdExperiment("exp")
+    experiment.metrics_engine = MetricsEngine(["accuracy", "roc_auc"])
+    row = experiment.run_experiment(
+        existing_tracker_path=str(tmp_path / "tracker.json"),
+        exp_description="test", parent_sv_dir=str(tmp_path / "outputs"),
+        tracker_type=TrackerType("json"), force_columns=True,
+        train_kwargs={"threshold": 0.5})
+    assert row["test_accuracy"] == pytest.approx(metrics.accuracy_score(
+        experiment.y_true_test, experiment.y_pred_test))
+    assert row["train_roc_auc"] == pytest.approx(metrics.roc_auc_score(
+        experiment.y_true_train, experiment.y_score_train))
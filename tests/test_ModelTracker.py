@@ -0,0 +1,190 @@
+import pytest
+
+from model_tracker_framework import ModelTracker, TrackerType
+
+
+def make_rows(n_rows:int):
+    return [{"model_name": "model_{}".format(i), "test_accuracy": i / 10}
+            for i in range(n_rows)]
+
+
+@pytest.fixture
+def tracker():
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(5))
+    return tracker
+
+
+def test_u_id_index_lookups(tracker):
+    assert tracker.check_model_exists("model_3")
+    assert not tracker.check_model_exists("model_9")
+    assert tracker.get_cur_row_index("model_3") == 3
+    with pytest.raises(KeyError):
+        tracker.get_cur_row_index("model_9")
+
+
+def test_update_overwrites_in_place(tracker):
+    tracker.update_tracker_w_dict({"model_name": "model_1", "test_accuracy": 1.0})
+    assert len(tracker.rows) == 5
+    assert tracker.get_cur_row_index("model_1") == 1
+    assert tracker.rows[1]["test_accuracy"] == 1.0
+    assert tracker.get_cur_row_index("model_4") == 4
+
+
+def test_delete_rows_reindexes(tracker):
+    assert tracker.delete_rows("model_1") == 1
+    assert tracker.delete_rows("model_1") == 0
+    assert not tracker.check_model_exists("model_1")
+    assert tracker.get_cur_row_index("model_4") == 3
+
+
+def test_index_follows_direct_edits(tracker):
+    tracker.rows.append({"model_name": "model_9", "test_accuracy": 0.0})
+    assert tracker.get_cur_row_index("model_9") == 5
+    tracker.rows[0] = {"model_name": "renamed", "test_accuracy": 0.0}
+    tracker.invalidate_cache()
+    assert tracker.check_model_exists("renamed")
+    assert not tracker.check_model_exists("model_0")
+
+
+def test_inconsistent_columns_raise(tracker):
+    with pytest.raises(AssertionError):
+        tracker.update_tracker_w_dict({"model_name": "model_9", "other": 1})
+    tracker.update_tracker_w_dict({"model_name": "model_9", "other": 1},
+                                  force_columns=True)
+    assert "other" in tracker.column_names
+
+
+def test_write_u_id():
+    tracker = ModelTracker(u_id="run_id")
+    tracker.rows = [{"model_name": "a"}, {"model_name": "b", "run_id": None}]
+    tracker.write_u_id(lambda row: row["model_name"] + "_id")
+    assert tracker.get_cur_row_index("b_id") == 1
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_import_pandas_df(bulk):
+    pd = pytest.importorskip("pandas")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(3))
+    df = pd.DataFrame(make_rows(5))
+    df.loc[0, "test_accuracy"] = 1.0
+    tracker.import_existing_pandas_df_tracker(df, bulk=bulk)
+    assert [rw["model_name"] for rw in tracker.rows] == [
+        "model_{}".format(i) for i in range(5)]
+    assert tracker.rows[0]["test_accuracy"] == 1.0
+    assert tracker.column_names == ["model_name", "test_accuracy"]
+
+
+def test_import_pandas_df_checks_columns_once():
+    pd = pytest.importorskip("pandas")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(3))
+    with pytest.raises(AssertionError):
+        tracker.import_existing_pandas_df_tracker(
+            pd.DataFrame([{"model_name": "a", "other": 1}]))
+    assert len(tracker.rows) == 3
+
+
+def make_query_tracker(indexed:bool) -> ModelTracker:
+    tracker = ModelTracker()
+    rows = [{"model_name": "model_{}".format(i), "group": "g{}".format(i % 3),
+             "test_accuracy": (i * 7 % 20) / 20} for i in range(20)]
+    rows[4]["test_accuracy"] = None
+    tracker.update_tracker_w_dicts(rows)
+    if indexed:
+        tracker.create_metric_index("test_accuracy")
+        tracker.create_hash_index("group")
+    return tracker
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_query_filters_sorts_and_limits(indexed):
+    tracker = make_query_tracker(indexed)
+    res = tracker.query(where=[("test_accuracy", ">=", 0.5),
+                               ("group", "==", "g1")],
+                        order_by="test_accuracy", ascending=False, limit=3,
+                        columns=["model_name", "test_accuracy"])
+    expected = sorted(
+        [{"model_name": rw["model_name"], "test_accuracy": rw["test_accuracy"]}
+         for rw in make_query_tracker(False).rows
+         if rw["test_accuracy"] is not None and rw["test_accuracy"] >= 0.5
+         and rw["group"] == "g1"],
+        key=lambda rw: -rw["test_accuracy"])[:3]
+    assert res == expected
+    # Rows missing the order_by column are returned last
+    assert tracker.query(order_by="test_accuracy")[-1]["model_name"] == "model_4"
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_indexes_follow_updates(indexed):
+    tracker = make_query_tracker(indexed)
+    tracker.update_tracker_w_dict(
+        {"model_name": "model_0", "group": "g9", "test_accuracy": 2.0})
+    assert tracker.top_k("test_accuracy", k=1)[0]["model_name"] == "model_0"
+    assert [rw["model_name"] for rw in tracker.find_rows("group", "g9")] == [
+        "model_0"]
+    assert tracker.query(where=[("test_accuracy", ">", 1.0)],
+                         columns=["model_name"]) == [{"model_name": "model_0"}]
+
+
+def test_top_k_and_group_by():
+    tracker = make_query_tracker(False)
+    accs = sorted(rw["test_accuracy"] for rw in tracker.rows
+                  if rw["test_accuracy"] is not None)
+    assert [rw["test_accuracy"] for rw in tracker.top_k(
+        "test_accuracy", k=3, largest=False)] == accs[:3]
+    assert tracker.group_by("group") == {"g0": 7, "g1": 7, "g2": 6}
+    maxes = tracker.group_by("group", "test_accuracy", agg="max")
+    assert maxes["g0"] == max(rw["test_accuracy"] for rw in tracker.rows
+                              if rw["group"] == "g0")
+    with pytest.raises(ValueError):
+        tracker.group_by("group", "test_accuracy", agg="median")
+
+
+def test_dataframe_cache_invalidated_on_update(tracker):
+    df = tracker.tracker_to_pandas_df()
+    df.loc[0, "test_accuracy"] = 5.0
+    assert tracker.tracker_to_pandas_df().loc[0, "test_accuracy"] == 0.0
+    tracker.update_tracker_w_dict({"model_name": "model_0",
+                                   "test_accuracy": 0.5})
+    assert tracker.tracker_to_pandas_df().loc[0, "test_accuracy"] == 0.5
+
+
+def write_node(tmp_path, name:str, rows:list) -> str:
+    path = str(tmp_path / "{}.json".format(name))
+    node = ModelTracker()
+    node.update_tracker_w_dicts(rows, force_columns=True)
+    node.write_tracker(path, TrackerType("json"))
+    return path
+
+
+def test_merge_tracker_files_keeps_latest(tmp_path):
+    paths = [
+        write_node(tmp_path, "node_0", [
+            {"model_name": "a", "acc": 0.125, "train_time_end": "01/01/2024 10:00:00"},
+            {"model_name": "b", "acc": 0.25, "train_time_end": "02/01/2024 10:00:00"}]),
+        write_node(tmp_path, "node_1", [
+            {"model_name": "a", "acc": 0.375, "train_time_end": "03/01/2024 10:00:00"},
+            {"model_name": "b", "acc": 0.5, "train_time_end": None, "f1": 0.5},
+            {"model_name": "c", "acc": 0.625, "train_time_end": "01/01/2024 10:00:00"}])]
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dict(
+        {"model_name": "c", "acc": 0.75, "train_time_end": "05/01/2024 10:00:00"})
+    assert tracker.merge_tracker_files(paths, TrackerType("json")) == 2
+    assert {rw["model_name"]: rw["acc"] for rw in tracker.rows} == {
+        "c": 0.75, "a": 0.375, "b": 0.25}
+    assert set(tracker.column_names) == {"model_name", "acc", "train_time_end", "f1"}
+
+
+def test_merge_tracker_files_custom_conflict(tmp_path):
+    paths = [write_node(tmp_path, "node_{}".format(i), [
+        {"model_name": "a", "acc": i * 0.25}]) for i in range(3)]
+    tracker = ModelTracker()
+    tracker.merge_tracker_files(
+        paths, TrackerType("json"),
+        conflict=lambda cur, new: cur if cur["acc"] >= new["acc"] else new)
+    assert [dict(rw) for rw in tracker.rows] == [{"model_name": "a", "acc": 0.5}]
+    with pytest.raises(ValueError):
+        tracker.merge_tracker_files(paths, TrackerType("json"),
+                                    conflict="first")
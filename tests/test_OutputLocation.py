@@ -0,0 +1,68 @@
+import os
+
+from model_tracker_framework import ExperimentOption, ModelTracker, TrackerType
+from model_tracker_framework.OutputLocation import (
+    TRASH_DIR_NM, make_suffixed_dir, remove_dir_in_background)
+
+from .experiments import SumExperiment
+
+
+def test_make_suffixed_dir(tmp_path):
+    os.makedirs(str(tmp_path / "exp"))
+    os.makedirs(str(tmp_path / "exp_3"))
+    os.makedirs(str(tmp_path / "exp_other"))
+    assert make_suffixed_dir(str(tmp_path), "exp") == str(tmp_path / "exp_4")
+    assert make_suffixed_dir(str(tmp_path), "exp") == str(tmp_path / "exp_5")
+    assert make_suffixed_dir(str(tmp_path), "new") == str(tmp_path / "new_1")
+
+
+def test_remove_dir_in_background(tmp_path):
+    dir_path = str(tmp_path / "exp")
+    os.makedirs(os.path.join(dir_path, "nested"))
+    thread = remove_dir_in_background(dir_path)
+    # The name can be reused before the deletion completes
+    assert not os.path.exists(dir_path)
+    os.makedirs(dir_path)
+    thread.join()
+    assert os.listdir(str(tmp_path / TRASH_DIR_NM)) == []
+    assert os.path.isdir(dir_path)
+    assert remove_dir_in_background(str(tmp_path / "missing")) is None
+
+
+def test_stale_trash_removed(tmp_path):
+    os.makedirs(str(tmp_path / TRASH_DIR_NM / "exp.stale"))
+    os.makedirs(str(tmp_path / "exp"))
+    remove_dir_in_background(str(tmp_path / "exp")).join()
+    assert os.listdir(str(tmp_path / TRASH_DIR_NM)) == []
+
+
+def test_missing_dir_does_not_create_trash(tmp_path):
+    assert remove_dir_in_background(str(tmp_path / "missing")) is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def run(tmp_path, option:str) -> SumExperiment:
+    experiment = SumExperiment("exp")
+    experiment.run_experiment(
+        existing_tracker_path=str(tmp_path / "tracker.json"),
+        exp_description="test", parent_sv_dir=str(tmp_path / "outputs"),
+        dupe_model_nms=ExperimentOption(option),
+        tracker_type=TrackerType("json"))
+    return experiment
+
+
+def test_run_experiment_overwrite_and_duplicate(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    first = run(tmp_path, None)
+    with open(os.path.join(first.model_sv_loc, "old_output"), "w") as f:
+        f.write("old")
+    overwritten = run(tmp_path, "overwrite")
+    assert overwritten.model_sv_loc == first.model_sv_loc
+    assert not os.path.exists(os.path.join(overwritten.model_sv_loc,
+                                           "old_output"))
+    duplicate = run(tmp_path, "duplicate")
+    assert duplicate.model_sv_loc == str(tmp_path / "outputs" / "exp_1")
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(str(tmp_path / "tracker.json"),
+                                    TrackerType("json"))
+    assert tracker.rows[0]["output_save_location"] == duplicate.model_sv_loc
@@ -0,0 +1,102 @@
+import logging
+import os
+
+from model_tracker_framework import PreprocessingCache
+
+from .experiments import SumExperiment
+
+
+class InputExperiment(SumExperiment):
+
+    def __init__(self, model_name:str, n_values:int=10):
+        super().__init__(model_name)
+        self.n_values = n_values
+        self.n_runs = 0
+
+    def preprocessing_cache_inputs(self) -> dict:
+        return {"n_values": self.n_values}
+
+    def preprocessing_steps(self):
+        self.n_runs += 1
+        self.data = list(range(self.n_values))
+
+
+class SiblingExperiment(InputExperiment):
+
+    def evaluate_model(self):
+        self.results["score"] = -self.model
+
+
+def preprocess(experiment, cache:PreprocessingCache):
+    experiment.preprocessing_cache = cache
+    experiment.preprocessing()
+    return experiment
+
+
+def test_cache_hit_restores_attributes(tmp_path):
+    cache = PreprocessingCache(str(tmp_path / "cache"))
+    first = preprocess(InputExperiment("a"), cache)
+    assert first.n_runs == 1
+    second = preprocess(InputExperiment("b"), cache)
+    # The cached n_runs is loaded rather than the preprocessing being rerun
+    assert second.n_runs == 1
+    assert second.data == list(range(10))
+
+
+def test_inputs_and_debug_change_key(tmp_path):
+    cache = PreprocessingCache(str(tmp_path / "cache"))
+    experiment = InputExperiment("a")
+    key = cache.make_key(experiment, debug=False)
+    assert key == cache.make_key(InputExperiment("b"), debug=False)
+    assert key != cache.make_key(InputExperiment("a", n_values=5), debug=False)
+    assert key != cache.make_key(experiment, debug=True)
+    assert key != cache.make_key(experiment, debug=False, extra=1)
+
+
+def test_share_across_subclasses(tmp_path):
+    cache = PreprocessingCache(str(tmp_path / "cache"))
+    assert (cache.make_key(InputExperiment("a"), debug=False) !=
+            cache.make_key(SiblingExperiment("a"), debug=False))
+    shared = PreprocessingCache(str(tmp_path / "cache"),
+                                share_across_subclasses=True)
+    assert (shared.make_key(InputExperiment("a"), debug=False) ==
+            shared.make_key(SiblingExperiment("a"), debug=False))
+
+
+def test_empty_inputs_warn(tmp_path, caplog):
+    cache = PreprocessingCache(str(tmp_path / "cache"))
+    with caplog.at_level(logging.WARNING, logger="mtf_logger"):
+        cache.make_key(SumExperiment("a"), debug=False)
+    assert "returned no inputs" in caplog.text
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="mtf_logger"):
+        cache.make_key(InputExperiment("a"), debug=False)
+    assert "returned no inputs" not in caplog.text
+
+
+def test_file_input_changes_with_file(tmp_path):
+    file_path = str(tmp_path / "data.csv")
+    with open(file_path, "w") as f:
+        f.write("a")
+    before = PreprocessingCache.file_input(file_path, hash_contents=True)
+    with open(file_path, "w") as f:
+        f.write("b")
+    assert PreprocessingCache.file_input(file_path, hash_contents=True) != before
+
+
+def test_attributes_and_eviction(tmp_path):
+    cache = PreprocessingCache(str(tmp_path / "cache"), attributes=["data"])
+    experiment = InputExperiment("a")
+    snapshot = cache.snapshot(experiment)
+    experiment.preprocessing_steps()
+    cache.save("key_a", experiment, snapshot)
+    loaded = InputExperiment("b")
+    assert cache.load("key_a", loaded)
+    assert loaded.data == list(range(10)) and loaded.n_runs == 0
+    assert not cache.load("missing", loaded)
+
+    entry_size = os.path.getsize(str(tmp_path / "cache" / "key_a.pkl"))
+    cache.max_size_bytes = entry_size
+    os.utime(str(tmp_path / "cache" / "key_a.pkl"), ns=(0, 0))
+    cache.save("key_b", experiment, snapshot)
+    assert sorted(os.listdir(str(tmp_path / "cache"))) == ["key_b.pkl"]
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from model_tracker_framework import ModelTracker, TrackerType
+from model_tracker_framework.StageCheckpoint import (
+    CHECKPOINT_FILE_NM, find_checkpoint_dir, load_checkpoint, save_checkpoint)
+
+from .experiments import SumExperiment
+
+
+class ResumableExperiment(SumExperiment):
+
+    # Class attributes such that they are not restored from the checkpoint
+    fail_evaluate = False
+    calls = []
+
+    def preprocessing_steps(self):
+        ResumableExperiment.calls.append("preprocessing")
+        super().preprocessing_steps()
+
+    def train_model(self, scale:float=1.0):
+        ResumableExperiment.calls.append("train_model")
+        super().train_model(scale=scale)
+
+    def evaluate_model(self):
+        ResumableExperiment.calls.append("evaluate_model")
+        if ResumableExperiment.fail_evaluate:
+            raise RuntimeError("Evaluation failed")
+        super().evaluate_model()
+
+
+def run(tmp_path, resume:bool) -> ResumableExperiment:
+    experiment = ResumableExperiment("exp", value=2)
+    experiment.checkpoint_stages = True
+    experiment.run_experiment(
+        existing_tracker_path=str(tmp_path / "tracker.json"),
+        exp_description="test", parent_sv_dir=str(tmp_path / "outputs"),
+        tracker_type=TrackerType("json"), resume=resume)
+    return experiment
+
+
+def test_resume_skips_completed_stages(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    ResumableExperiment.calls = []
+    ResumableExperiment.fail_evaluate = True
+    with pytest.raises(RuntimeError):
+        run(tmp_path, resume=True)
+    sv_dir = str(tmp_path / "outputs" / "exp")
+    assert load_checkpoint(sv_dir)["stage"] == "train_model"
+    assert find_checkpoint_dir(str(tmp_path / "outputs"), "exp") == sv_dir
+
+    ResumableExperiment.calls = []
+    ResumableExperiment.fail_evaluate = False
+    experiment = run(tmp_path, resume=True)
+    assert ResumableExperiment.calls == ["evaluate_model"]
+    assert experiment.model_sv_loc == sv_dir
+    assert not os.path.exists(os.path.join(sv_dir, CHECKPOINT_FILE_NM))
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(str(tmp_path / "tracker.json"),
+                                    TrackerType("json"))
+    assert tracker.rows[0]["score"] == 90
+
+
+def test_no_checkpoint_without_resume(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    ResumableExperiment.calls = []
+    ResumableExperiment.fail_evaluate = False
+    run(tmp_path, resume=False)
+    assert ResumableExperiment.calls == [
+        "preprocessing", "train_model", "evaluate_model"]
+    assert find_checkpoint_dir(str(tmp_path / "outputs"), "exp") is None
+
+
+def test_unpicklable_checkpoint_keeps_previous(tmp_path):
+    assert save_checkpoint(str(tmp_path), {"stage": "preprocessing"})
+    assert not save_checkpoint(str(tmp_path), {"stage": "train_model",
+                                               "state": lambda: None})
+    assert load_checkpoint(str(tmp_path)) == {"stage": "preprocessing"}
+    assert os.listdir(str(tmp_path)) == [CHECKPOINT_FILE_NM]
@@ -0,0 +1,101 @@
+import os
+import tracemalloc
+
+import pytest
+
+from model_tracker_framework import (
+    ModelTracker, ProfilerHook, StageProfiler, TrackerType)
+
+from .experiments import SumExperiment
+
+
+class RecordingHook(ProfilerHook):
+
+    def __init__(self):
+        self.calls = []
+
+    def on_stage_start(self, model_name, stage):
+        self.calls.append(("start", model_name, stage))
+
+    def on_stage_end(self, model_name, stage, stats):
+        self.calls.append(("end", model_name, stage))
+
+
+def test_profile_records_stats_and_calls_hooks():
+    hook = RecordingHook()
+    profiler = StageProfiler(hooks=[hook])
+    with profiler.profile("train_model", model_name="exp"):
+        _ = [0] * 1000
+    with profiler.profile("tracker_write", model_name="exp"):
+        pass
+    assert hook.calls == [("start", "exp", "train_model"),
+                          ("end", "exp", "train_model"),
+                          ("start", "exp", "tracker_write"),
+                          ("end", "exp", "tracker_write")]
+    columns = profiler.tracker_columns()
+    assert set(columns) == {"train_model_duration_s", "train_model_cpu_s",
+                            "train_model_peak_rss_growth_mb"}
+    if columns["train_model_peak_rss_growth_mb"] is not None:
+        assert columns["train_model_peak_rss_growth_mb"] >= 0
+    assert "tracker_write_duration_s" in profiler.tracker_columns(exclude=[])
+    profiler.reset()
+    assert profiler.stats == {}
+
+
+def test_tracemalloc_rejects_overlapping_stages():
+    outer = StageProfiler(memory="tracemalloc")
+    inner = StageProfiler(memory="tracemalloc")
+    with outer.profile("preprocessing"):
+        _ = [0] * 100000
+        with pytest.raises(ValueError):
+            with inner.profile("train_model"):
+                pass
+    assert outer.stats["preprocessing"]["peak_mem_mb"] > 0
+    # The stage is released once the outer stage ends
+    with inner.profile("train_model"):
+        pass
+    assert "train_model" in inner.stats
+
+
+def test_invalid_memory():
+    with pytest.raises(TypeError):
+        StageProfiler(memory="gpu")
+
+
+def test_run_experiment_adds_columns(tmp_path):
+    os.makedirs(str(tmp_path / "outputs"))
+    experiment = SumExperiment("exp")
+    experiment.stage_profiler = StageProfiler(memory=None)
+    tracker_path = str(tmp_path / "tracker.json")
+    experiment.run_experiment(
+        existing_tracker_path=tracker_path, exp_description="test",
+        parent_sv_dir=str(tmp_path / "outputs"),
+        tracker_type=TrackerType("json"), force_columns=True)
+    assert "tracker_write" in experiment.stage_profiler.stats
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(tracker_path, TrackerType("json"))
+    row = tracker.rows[0]
+    for stage in ["preprocessing", "train_model", "evaluate_model"]:
+        assert "{}_duration_s".format(stage) in row
+    assert "tracker_write_duration_s" not in row
+
+
+class FailingHook(ProfilerHook):
+
+    def on_stage_start(self, model_name, stage):
+        raise RuntimeError("Hook failed")
+
+
+def test_failing_hook_releases_tracemalloc():
+    profiler = StageProfiler(memory="tracemalloc", hooks=[FailingHook()])
+    with pytest.raises(RuntimeError):
+        with profiler.profile("train_model"):
+            pass
+    assert not tracemalloc.is_tracing()
+    # The stage is released therefore later stages can be measured
+    with StageProfiler(memory="tracemalloc").profile("evaluate_model"):
+        pass
+
+
+def test_hooks_are_not_shared():
+    assert StageProfiler().hooks is not StageProfiler().hooks
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+from model_tracker_framework import SupervisedModelExperiment, TrackerType
+
+from .experiments import ThresholdExperiment
+
+
+def run(tmp_path, experiment:ThresholdExperiment) -> ThresholdExperiment:
+    os.makedirs(str(tmp_path / "outputs"), exist_ok=True)
+    experiment.run_experiment(
+        existing_tracker_path=str(tmp_path / "tracker.json"),
+        exp_description="test", parent_sv_dir=str(tmp_path / "outputs"),
+        tracker_type=TrackerType("json"), force_columns=True)
+    return experiment
+
+
+def test_spill_to_disk(tmp_path):
+    expected = ThresholdExperiment("expected")
+    expected.preprocessing_steps()
+    expected.train_model()
+    experiment = ThresholdExperiment("exp")
+    experiment.spill_to_disk = True
+    run(tmp_path, experiment)
+    assert isinstance(experiment.X_train, np.memmap)
+    assert not experiment.X_train.flags.writeable
+    np.testing.assert_array_equal(experiment.y_pred_test, expected.y_pred_test)
+
+    loaded = SupervisedModelExperiment.load_spilled_arrays(
+        experiment.model_sv_loc)
+    assert set(loaded) == set(SupervisedModelExperiment.spill_attributes)
+    for attribute, arr in loaded.items():
+        np.testing.assert_array_equal(arr, getattr(expected, attribute))
+    in_memory = SupervisedModelExperiment.load_spilled_arrays(
+        experiment.model_sv_loc, attributes=["X_test"], mmap_mode=None)
+    assert not isinstance(in_memory["X_test"], np.memmap)
+    assert not any(nm.endswith(".tmp")
+                   for nm in os.listdir(experiment.model_sv_loc))
+
+
+def test_spill_skips_unsupported_arrays(tmp_path):
+    experiment = ThresholdExperiment("exp")
+    experiment.X_train = np.array(["a", None], dtype=object)
+    experiment.X_test = np.array([])
+    experiment.y_true_train = [0, 1]
+    assert experiment.spill_arrays() == []
+    experiment.model_sv_loc = str(tmp_path)
+    experiment.y_true_test = np.arange(4)
+    assert experiment.spill_arrays() == ["y_true_test"]
+    # Spilling again reuses the file of the memory mapped view
+    assert experiment.spill_arrays() == ["y_true_test"]
+    assert sorted(os.listdir(str(tmp_path))) == ["y_true_test.npy"]
+
+
+def test_no_spill_by_default(tmp_path):
+    experiment = run(tmp_path, ThresholdExperiment("exp"))
+    assert not isinstance(experiment.X_train, np.memmap)
+    assert SupervisedModelExperiment.load_spilled_arrays(
+        experiment.model_sv_loc) == {}
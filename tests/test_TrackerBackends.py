@@ -0,0 +1,214 @@
+import os
+
+import pandas as pd
+import pytest
+
+from model_tracker_framework import ModelTracker, TrackerType
+
+# Backends and the file extension used in the tests
+BACKENDS = {"json": "json", "csv": "csv", "jsonl": "jsonl", "sqlite": "db",
+            "parquet": "parquet"}
+# Optional dependencies of the backends
+BACKEND_DEPENDENCIES = {"parquet": "pyarrow"}
+
+
+def make_rows(n_rows:int):
+    return [{"model_name": "model_{}".format(i), "test_accuracy": i * 0.25,
+             "n_epochs": i, "experiment_description": "run {}".format(i)}
+            for i in range(n_rows)]
+
+
+def tracker_path(tmp_path, backend:str) -> str:
+    if backend in BACKEND_DEPENDENCIES:
+        pytest.importorskip(BACKEND_DEPENDENCIES[backend])
+    return str(tmp_path / "tracker.{}".format(BACKENDS[backend]))
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_write_read_round_trip(tmp_path, backend):
+    path = tracker_path(tmp_path, backend)
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(20))
+    tracker.write_tracker(path, TrackerType(backend))
+    assert ModelTracker.check_tracker_exists(path)
+    imported = ModelTracker()
+    imported.import_existing_tracker(path, TrackerType(backend))
+    assert imported.column_names == tracker.column_names
+    assert [dict(rw) for rw in imported.rows] == make_rows(20)
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_write_new_rows(tmp_path, backend):
+    path = tracker_path(tmp_path, backend)
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(3))
+    tracker.write_tracker(path, TrackerType(backend))
+    tracker.update_tracker_w_dict({**make_rows(3)[1], "test_accuracy": 1.0})
+    tracker.write_tracker(path, TrackerType(backend),
+                          new_rows=[tracker.rows[1]])
+    imported = ModelTracker()
+    imported.import_existing_tracker(path, TrackerType(backend))
+    assert len(imported.rows) == 3
+    assert imported.rows[imported.get_cur_row_index("model_1")][
+        "test_accuracy"] == 1.0
+
+
+def test_jsonl_last_line_wins_and_compaction(tmp_path):
+    path = tracker_path(tmp_path, "jsonl")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(3))
+    tracker.write_tracker(path, TrackerType("jsonl"))
+    for acc in [0.5, 0.7]:
+        tracker.append_rows_to_jsonl(
+            path, [{**make_rows(3)[0], "test_accuracy": acc}])
+    with open(path) as f:
+        assert len(f.readlines()) == 5
+    imported = ModelTracker()
+    imported.import_existing_tracker(path, TrackerType("jsonl"))
+    assert imported.rows[0]["test_accuracy"] == 0.7
+    assert ModelTracker().compact_jsonl_tracker(path) == 2
+    with open(path) as f:
+        assert len(f.readlines()) == 3
+    compacted = ModelTracker()
+    compacted.import_existing_tracker(path, TrackerType("jsonl"))
+    assert [dict(rw) for rw in compacted.rows] == [
+        dict(rw) for rw in imported.rows]
+    assert not any(nm.endswith(".tmp") for nm in os.listdir(tmp_path))
+
+
+def test_sqlite_imports_requested_rows_only(tmp_path):
+    path = tracker_path(tmp_path, "sqlite")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(10))
+    tracker.write_tracker(path, TrackerType("sqlite"))
+    imported = ModelTracker()
+    imported.import_existing_tracker(path, TrackerType("sqlite"),
+                                     u_ids=["model_2", "model_7", "missing"])
+    assert [rw["model_name"] for rw in imported.rows] == ["model_2", "model_7"]
+    assert imported.column_names == tracker.column_names
+
+
+def test_sqlite_upsert_adds_columns(tmp_path):
+    path = tracker_path(tmp_path, "sqlite")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(2))
+    tracker.write_tracker(path, TrackerType("sqlite"))
+    tracker.update_tracker_w_dict({"model_name": "model_1", "f1": 0.5},
+                                  force_columns=True)
+    tracker.write_tracker(path, TrackerType("sqlite"),
+                          new_rows=[tracker.rows[1]])
+    imported = ModelTracker()
+    imported.import_existing_tracker(path, TrackerType("sqlite"))
+    assert "f1" in imported.column_names
+    assert imported.rows[1]["f1"] == 0.5
+    assert imported.rows[0]["f1"] is None
+
+
+def test_parquet_projection_and_filters(tmp_path):
+    path = tracker_path(tmp_path, "parquet")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(10))
+    tracker.write_tracker(path, TrackerType("parquet"))
+    df = ModelTracker.read_parquet_tracker(
+        path, columns=["model_name", "test_accuracy"],
+        filters=[("test_accuracy", ">", 1.5)])
+    assert list(df.columns) == ["model_name", "test_accuracy"]
+    assert list(df["model_name"]) == ["model_7", "model_8", "model_9"]
+    imported = ModelTracker()
+    imported.import_existing_parquet_tracker(
+        path, columns=["n_epochs"], filters=[("n_epochs", "<", 2)])
+    assert [dict(rw) for rw in imported.rows] == [
+        {"model_name": "model_0", "n_epochs": 0},
+        {"model_name": "model_1", "n_epochs": 1}]
+
+
+def make_streaming_rows(n_rows:int):
+    rows = make_rows(n_rows)
+    for i, row in enumerate(rows):
+        # Strings which look numeric in later chunks and missing values
+        row["code"] = "c{}".format(i) if i < 10 else str(i)
+        row["f1"] = None if i % 7 == 0 else i * 0.5
+    return rows
+
+
+def test_csv_streaming_import_matches_full_import(tmp_path):
+    path = str(tmp_path / "tracker.csv")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_streaming_rows(3000))
+    tracker.tracker_to_csv(path, index=False)
+    full = ModelTracker()
+    full.import_existing_csv_tracker(path)
+    streamed = ModelTracker()
+    streamed.import_existing_csv_tracker(path, memory_budget_mb=0.05)
+    pd.testing.assert_frame_equal(streamed.tracker_to_pandas_df(),
+                                  full.tracker_to_pandas_df())
+    assert streamed.column_names == full.column_names
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"index": False}])
+def test_csv_streaming_export_matches_full_export(tmp_path, kwargs):
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_streaming_rows(3000))
+    tracker.tracker_to_csv(str(tmp_path / "full.csv"), **kwargs)
+    tracker.tracker_to_csv(str(tmp_path / "streamed.csv"),
+                           memory_budget_mb=0.05, **kwargs)
+    with open(str(tmp_path / "full.csv")) as full_f, \
+            open(str(tmp_path / "streamed.csv")) as streamed_f:
+        assert streamed_f.read() == full_f.read()
+
+
+def test_json_lines_streaming_import_matches_full_import(tmp_path):
+    path = str(tmp_path / "tracker.jsonl")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_streaming_rows(3000))
+    tracker.write_tracker(path, TrackerType("jsonl"))
+    full = ModelTracker()
+    full.import_existing_json_tracker(
+        path, rd_json_kwargs={"lines": True, "dtype": {"code": str}})
+    streamed = ModelTracker()
+    streamed.import_existing_json_tracker(path, memory_budget_mb=0.05)
+    assert streamed.column_names == full.column_names
+    assert [dict(rw) for rw in streamed.rows] == make_streaming_rows(3000)
+    assert len(full.rows) == len(streamed.rows)
+
+
+@pytest.mark.parametrize("orient", [None, "records", "index", "split"])
+def test_json_streaming_import_rejects_other_orients(tmp_path, orient):
+    path = str(tmp_path / "tracker.json")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(3))
+    tracker.tracker_to_json(
+        path, **({} if orient is None else {"orient": orient}))
+    with pytest.raises(ValueError, match="not line delimited"):
+        ModelTracker().import_existing_json_tracker(
+            path, memory_budget_mb=0.05)
+
+
+def test_convert_json_tracker_to_jsonl(tmp_path):
+    json_path = str(tmp_path / "tracker.json")
+    jsonl_path = str(tmp_path / "tracker.jsonl")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(5))
+    tracker.write_tracker(json_path, TrackerType("json"))
+    ModelTracker().convert_json_tracker_to_jsonl(json_path, jsonl_path,
+                                                 chunk_size=2)
+    streamed = ModelTracker()
+    streamed.import_existing_json_tracker(jsonl_path, memory_budget_mb=0.05)
+    assert [dict(rw) for rw in streamed.rows] == make_rows(5)
+
+
+def test_jsonl_write_uses_unique_temporary_file(tmp_path):
+    path = tracker_path(tmp_path, "jsonl")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(3))
+    # A temporary file left by another writer is neither reused nor replaced
+    with open("{}.tmp".format(path), "w") as f:
+        f.write("partial")
+    tracker.write_tracker(path, TrackerType("jsonl"))
+    with open("{}.tmp".format(path)) as f:
+        assert f.read() == "partial"
+    assert sorted(os.listdir(str(tmp_path))) == [
+        "tracker.jsonl", "tracker.jsonl.tmp"]
+    imported = ModelTracker()
+    imported.import_existing_tracker(path, TrackerType("jsonl"))
+    assert [dict(rw) for rw in imported.rows] == make_rows(3)
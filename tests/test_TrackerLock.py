@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+
+import pytest
+
+from model_tracker_framework import ModelTracker, TrackerType
+from model_tracker_framework.TrackerLock import (
+    TrackerLockTimeout, atomic_write_path, list_pending_rows, tracker_file_lock)
+
+N_WORKERS = 4
+ROWS_PER_WORKER = 25
+
+
+def _append_rows(path:str, backend:str, worker:int,
+                 n_rows:int=ROWS_PER_WORKER):
+    tracker = ModelTracker()
+    for i in range(n_rows):
+        tracker.concurrent_update_existing_tracker(
+            path, TrackerType(backend),
+            rows=[{"model_name": "w{}_{}".format(worker, i), "step": i}])
+
+
+def _compact(path:str, n_compactions:int):
+    for _ in range(n_compactions):
+        ModelTracker().compact_jsonl_tracker(path)
+
+
+def _run_processes(targets):
+    processes = [multiprocessing.Process(target=target, args=args)
+                 for target, args in targets]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+
+def _seed_tracker(path:str, backend:str):
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dict({"model_name": "seed", "step": 0})
+    tracker.write_tracker(path, TrackerType(backend))
+
+
+def _imported_names(path:str, backend:str) -> set:
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(path, TrackerType(backend))
+    return {rw["model_name"] for rw in tracker.rows}
+
+
+def _expected_names(n_rows:int=ROWS_PER_WORKER) -> set:
+    return {"seed"} | {"w{}_{}".format(w, i) for w in range(N_WORKERS)
+                       for i in range(n_rows)}
+
+
+@pytest.mark.parametrize("backend,ext", [
+    ("json", "json"), ("csv", "csv"), ("jsonl", "jsonl"), ("sqlite", "db")])
+def test_concurrent_updates_keep_every_row(tmp_path, backend, ext):
+    path = str(tmp_path / "tracker.{}".format(ext))
+    _seed_tracker(path, backend)
+    _run_processes([(_append_rows, (path, backend, w))
+                    for w in range(N_WORKERS)])
+    assert _imported_names(path, backend) == _expected_names()
+    assert list_pending_rows(path) == []
+
+
+def test_concurrent_jsonl_appends_with_compaction(tmp_path):
+    path = str(tmp_path / "tracker.jsonl")
+    _seed_tracker(path, "jsonl")
+    # Enough appends and compactions to interleave
+    _run_processes([(_append_rows, (path, "jsonl", w, 200))
+                    for w in range(N_WORKERS)] + [(_compact, (path, 50))])
+    assert _imported_names(path, "jsonl") == _expected_names(200)
+
+
+def test_lock_timeout(tmp_path):
+    path = str(tmp_path / "tracker.json")
+    with tracker_file_lock(path):
+        with pytest.raises(TrackerLockTimeout):
+            with tracker_file_lock(path, timeout=0.1):
+                pass
+    with tracker_file_lock(path, timeout=0.1):
+        pass
+
+
+def test_atomic_write_path_keeps_original_on_error(tmp_path):
+    path = str(tmp_path / "tracker.json")
+    with open(path, "w") as f:
+        f.write("original")
+    with pytest.raises(RuntimeError):
+        with atomic_write_path(path) as tmp_dir:
+            with open(tmp_dir, "w") as f:
+                f.write("partial")
+            raise RuntimeError()
+    with open(path) as f:
+        assert f.read() == "original"
+    assert os.listdir(tmp_path) == ["tracker.json"]
+    with atomic_write_path(path) as tmp_dir:
+        with open(tmp_dir, "w") as f:
+            f.write("new")
+    with open(path) as f:
+        assert f.read() == "new"
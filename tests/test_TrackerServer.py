@@ -0,0 +1,126 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from model_tracker_framework import (
+    ModelTracker, TrackerClient, TrackerServer, TrackerType)
+from model_tracker_framework.TrackerClient import TrackerServerError
+
+from .experiments import SumExperiment
+
+if not hasattr(socket, "AF_UNIX"):
+    pytest.skip("unix sockets are not available", allow_module_level=True)
+
+
+@pytest.fixture
+def address():
+    # Unix socket paths are limited to ~100 characters, tmp_path may exceed it
+    sock_dir = tempfile.mkdtemp(prefix="mtf")
+    yield "unix:{}".format(os.path.join(sock_dir, "mtf.sock"))
+    shutil.rmtree(sock_dir, ignore_errors=True)
+
+
+def import_rows(path:str):
+    tracker = ModelTracker()
+    tracker.import_existing_tracker(path, TrackerType("jsonl"))
+    return [dict(rw) for rw in tracker.rows]
+
+
+def make_rows(n_rows:int):
+    return [{"model_name": "model_{}".format(i), "test_accuracy": i * 0.25,
+             "group": "g{}".format(i % 2)} for i in range(n_rows)]
+
+
+def test_client_round_trip(tmp_path, address):
+    path = str(tmp_path / "tracker.jsonl")
+    with TrackerServer(address, path, flush_interval_s=60):
+        client = TrackerClient(address)
+        assert client.ping()
+        client.upsert_rows(make_rows(6))
+        assert not os.path.exists(path)
+        assert client.check_model_exists("model_3")
+        assert not client.check_model_exists("missing")
+        column_names, rows = client.import_rows(u_ids=["model_1", "missing"])
+        assert column_names == ["model_name", "test_accuracy", "group"]
+        assert rows == [make_rows(6)[1]]
+        assert client.query(where=[("test_accuracy", ">", 0.5)],
+                            order_by="test_accuracy", ascending=False,
+                            columns=["model_name"]) == [
+            {"model_name": "model_5"}, {"model_name": "model_4"},
+            {"model_name": "model_3"}]
+        assert [rw["model_name"] for rw in client.top_k(
+            "test_accuracy", k=2, where=[("group", "==", "g0")])] == [
+            "model_4", "model_2"]
+        assert len(client.find_rows("group", "g1")) == 3
+        client.flush()
+        assert import_rows(path) == make_rows(6)
+        client.upsert_rows([{**make_rows(6)[0], "test_accuracy": 2.0}])
+        with pytest.raises(TrackerServerError):
+            client.request("unknown")
+        client.close()
+    # Pending rows are written when the server stops
+    assert import_rows(path)[0]["test_accuracy"] == 2.0
+    assert not os.path.exists(address[len("unix:"):])
+
+
+def test_server_imports_existing_tracker(tmp_path, address):
+    path = str(tmp_path / "tracker.jsonl")
+    tracker = ModelTracker()
+    tracker.update_tracker_w_dicts(make_rows(3))
+    tracker.write_tracker(path, TrackerType("jsonl"))
+    with TrackerServer(address, path):
+        client = TrackerClient(address)
+        assert client.import_rows()[1] == make_rows(3)
+        client.close()
+    with pytest.raises(ValueError):
+        TrackerServer(address, path, tracker_type=TrackerType("server"))
+    assert not TrackerClient(address).ping()
+
+
+def test_concurrent_clients_and_experiments(tmp_path, address):
+    os.makedirs(str(tmp_path / "outputs"))
+    path = str(tmp_path / "tracker.jsonl")
+    with TrackerServer(address, path, flush_size=10, flush_interval_s=0.05):
+        client = TrackerClient(address)
+
+        def upsert(worker:int):
+            for i in range(25):
+                client.upsert_rows([{"model_name": "w{}_{}".format(worker, i),
+                                     "test_accuracy": i * 0.25}])
+        threads = [threading.Thread(target=upsert, args=(worker,))
+                   for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        row = SumExperiment("exp").run_experiment(
+            existing_tracker_path=address, exp_description="test",
+            parent_sv_dir=str(tmp_path / "outputs"),
+            tracker_type=TrackerType("server"), force_columns=True)
+        assert client.check_model_exists("exp")
+        client.close()
+    names = sorted(rw["model_name"] for rw in import_rows(path))
+    assert names == sorted(["exp"] + ["w{}_{}".format(worker, i)
+                                      for worker in range(4)
+                                      for i in range(25)])
+    assert row["score"] == 45
+
+
+def test_server_rejects_mismatched_u_id(tmp_path, address):
+    path = str(tmp_path / "tracker.jsonl")
+    with TrackerServer(address, path, u_id="run_id", flush_interval_s=60):
+        tracker = ModelTracker()
+        with pytest.raises(TrackerServerError, match="u_id"):
+            tracker.upsert_rows_to_server(address, make_rows(2))
+        with pytest.raises(TrackerServerError, match="u_id"):
+            tracker.import_existing_tracker(address, TrackerType("server"))
+        matching = ModelTracker(u_id="run_id")
+        matching.upsert_rows_to_server(
+            address, [{"run_id": 1, "test_accuracy": 0.5}])
+        matching.import_existing_tracker(address, TrackerType("server"))
+        assert [dict(rw) for rw in matching.rows] == [
+            {"run_id": 1, "test_accuracy": 0.5}]
@@ -0,0 +1,35 @@
+import importlib.util
+import json
+import os
+
+BENCH_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "benchmarks", "bench_tracker.py")
+
+
+def load_bench():
+    spec = importlib.util.spec_from_file_location("bench_tracker", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_available_backends_are_file_backends():
+    bench = load_bench()
+    backends = bench.available_backends()
+    assert "server" not in backends
+    assert {"json", "csv", "jsonl", "sqlite"} <= set(backends)
+
+
+def test_bench_size_and_compare(tmp_path, capsys):
+    bench = load_bench()
+    results = bench.bench_size(20, 4, bench.available_backends(), repeat=1,
+                               work_dir=str(tmp_path))
+    operations = {(rs["operation"], rs["backend"]) for rs in results}
+    for backend in bench.available_backends():
+        for operation in ["write", "import", "run_experiment_noop"]:
+            assert (operation, backend) in operations
+    base_path = str(tmp_path / "base.json")
+    with open(base_path, "w") as f:
+        json.dump({"metadata": bench.get_metadata(), "results": results}, f)
+    bench.compare(base_path, base_path)
+    assert "time x1.00" in capsys.readouterr().out